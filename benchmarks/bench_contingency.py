@@ -0,0 +1,67 @@
+"""
+Benchmark of the computation of the miscoding of many features
+
+Compares the vectorized contingency engine, that counts the joint
+frequencies of all the features and the target with one bincount per
+block of columns, with the previous implementation, that computes two
+code lengths per feature, each one with its own count.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_contingency.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import _discretize_matrix, _encode_vector, _codes_length, _miscoding_block
+
+
+def _loop_miscoding(X_codes, X_n_codes, y_codes, y_n_codes):
+    """
+    Previous implementation, one feature at a time, kept as a reference
+    """
+
+    miscoding = list()
+
+    ldm_y = _codes_length(y_codes, y_n_codes)
+
+    for i in np.arange(X_codes.shape[1]):
+
+        ldm_X  = _codes_length(X_codes[:,i], X_n_codes[i])
+        ldm_Xy = _codes_length(X_codes[:,i], X_n_codes[i], y_codes, y_n_codes)
+
+        miscoding.append(( ldm_Xy - min(ldm_X, ldm_y) ) / max(ldm_X, ldm_y))
+
+    return np.array(miscoding)
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+
+    print("%10s %10s %10s %12s %8s %8s" % ("samples", "features", "loop (s)", "engine (s)", "speedup", "equal"))
+
+    for n_samples, n_features in ((1000, 5000), (10000, 5000), (100000, 1000)):
+
+        X = rng.normal(size=(n_samples, n_features))
+        y = X[:,0] + rng.normal(size=n_samples)
+
+        X_codes, X_n_codes, X_edges = _discretize_matrix(X, [True] * n_features)
+        y_codes, y_n_codes, y_edges = _encode_vector(y, True)
+
+        start    = time.perf_counter()
+        old      = _loop_miscoding(X_codes, X_n_codes, y_codes, y_n_codes)
+        old_time = time.perf_counter() - start
+
+        start    = time.perf_counter()
+        new      = _miscoding_block(X_codes, X_n_codes, y_codes, y_n_codes)
+        new_time = time.perf_counter() - start
+
+        print("%10d %10d %10.3f %12.3f %8.1f %8s" %
+              (n_samples, n_features, old_time, new_time, old_time / new_time, np.allclose(old, new)))
+
+
+if __name__ == "__main__":
+    main()
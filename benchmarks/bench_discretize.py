@@ -0,0 +1,111 @@
+"""
+Benchmark of the discretization of continuous variables
+
+Compares the closed form uniform binning of _discretize_vector with the
+previous implementation, based on refitting a KBinsDiscretizer until all
+the intervals have data.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_discretize.py
+"""
+
+import time
+import warnings
+
+import numpy as np
+
+from sklearn.preprocessing import KBinsDiscretizer
+
+from fastautoml.fastautoml import _discretize_vector
+
+
+def _kbins_discretize_vector(x):
+    """
+    Previous implementation of _discretize_vector, kept as a reference
+    """
+
+    length = x.shape[0]
+    new_x  = x.copy().reshape(-1, 1)
+
+    optimal_bins = int(np.cbrt(length))
+
+    if optimal_bins <= 1:
+        optimal_bins = 2
+
+    # Recent versions of scikit-learn fit the bins over a subsample
+    params = dict(n_bins=optimal_bins, encode='ordinal', strategy="uniform")
+    if "subsample" in KBinsDiscretizer().get_params():
+        params["subsample"] = None
+
+    total_bins    = optimal_bins
+    previous_bins = 0
+    stop          = False
+
+    while stop == False:
+
+        with warnings.catch_warnings():
+
+            warnings.simplefilter("ignore")
+
+            params["n_bins"] = total_bins
+            est = KBinsDiscretizer(**params)
+            est.fit(new_x)
+            tmp_x = est.transform(new_x)[:,0].astype(dtype=int)
+
+        y = np.bincount(tmp_x)
+        actual_bins = len(np.nonzero(y)[0])
+
+        if previous_bins == actual_bins:
+            stop = True
+
+        if actual_bins < optimal_bins:
+            previous_bins = actual_bins
+            add_bins      = int( np.round( (length * (1 - actual_bins / optimal_bins)) / optimal_bins ) )
+            total_bins    = total_bins + add_bins
+        else:
+            stop = True
+
+    new_x = est.transform(new_x)[:,0].astype(dtype=int)
+
+    return new_x
+
+
+def _timeit(func, x, repeat=3):
+
+    best = np.inf
+    for i in range(repeat):
+        start = time.perf_counter()
+        codes = func(x)
+        best  = min(best, time.perf_counter() - start)
+
+    return best, codes
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+
+    datasets = {
+        "normal":   lambda n: rng.normal(size=n),
+        "exponent": lambda n: rng.exponential(size=n),
+        "discrete": lambda n: rng.integers(0, 20, size=n) ** 3,
+    }
+
+    print("%-10s %10s %12s %12s %8s %6s" % ("data", "n", "kbins (s)", "numpy (s)", "speedup", "equal"))
+
+    for name, generator in datasets.items():
+
+        for n in (10**4, 10**5, 10**6, 10**7):
+
+            x = generator(n).astype(float)
+
+            old_time, old_codes = _timeit(_kbins_discretize_vector, x)
+            new_time, new_codes = _timeit(_discretize_vector, x)
+
+            print("%-10s %10d %12.4f %12.4f %8.1f %6s" %
+                  (name, n, old_time, new_time, old_time / new_time, np.array_equal(old_codes, new_codes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark of the computation of the matrix of miscodings of the features
+
+Compares the pairwise engine used by Miscoding.features_matrix with the
+previous implementation, a double loop over the pairs of features that
+computed the length of the second feature once per pair.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_features_matrix.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import Miscoding, _codes_length
+
+
+def _loop_matrix(codes):
+    """
+    Previous implementation of the regular matrix, kept as a reference
+    """
+
+    n_features = codes.X_codes.shape[1]
+    miscoding  = np.zeros([n_features, n_features])
+
+    for i in np.arange(n_features-1):
+
+        ldm_X1 = _codes_length(codes.X_codes[:,i], codes.X_n_codes[i])
+
+        for j in np.arange(i+1, n_features):
+
+            ldm_X2   = _codes_length(codes.X_codes[:,j], codes.X_n_codes[j])
+            ldm_X1X2 = _codes_length(codes.X_codes[:,i], codes.X_n_codes[i], codes.X_codes[:,j], codes.X_n_codes[j])
+
+            mscd = ( ldm_X1X2 - min(ldm_X1, ldm_X2) ) / max(ldm_X1, ldm_X2)
+
+            miscoding[i, j] = mscd
+            miscoding[j, i] = mscd
+
+    return miscoding
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    n   = 10000
+
+    print("%10s %10s %12s %8s %8s" % ("features", "loop (s)", "engine (s)", "speedup", "equal"))
+
+    for n_features in (100, 250, 500, 2000):
+
+        X = rng.normal(size=(n, n_features))
+        y = X[:,0] + rng.normal(size=n)
+
+        mscd = Miscoding().fit(X, y)
+
+        start    = time.perf_counter()
+        new      = mscd.features_matrix(mode="regular")
+        new_time = time.perf_counter() - start
+
+        # The loop is too slow for the larger matrices
+        if n_features <= 500:
+            start    = time.perf_counter()
+            old      = _loop_matrix(mscd.codes_)
+            old_time = time.perf_counter() - start
+            print("%10d %10.3f %12.3f %8.1f %8s" %
+                  (n_features, old_time, new_time, old_time / new_time, np.allclose(old, new)))
+        else:
+            print("%10d %10s %12.3f %8s %8s" % (n_features, "-", new_time, "-", "-"))
+
+
+if __name__ == "__main__":
+    main()
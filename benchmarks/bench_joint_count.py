@@ -0,0 +1,71 @@
+"""
+Benchmark of the joint count of two coded variables
+
+Compares the joint count engine used by _unique_count with the previous
+implementation, based on a Cantor pairing of the codes and a bincount over
+the paired values, for a high cardinality target (thousands of classes)
+against a high cardinality categorical feature.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_joint_count.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from fastautoml.fastautoml import _joint_count
+
+
+def _cantor_count(x1, x2):
+    """
+    Previous implementation of the joint count, kept as a reference
+    """
+
+    x = (x1 + x2) * (x1 + x2 + 1) / 2 + x2
+    x = x.astype(int)
+
+    y     = np.bincount(x)
+    ii    = np.nonzero(y)[0]
+    count = y[ii]
+
+    return count
+
+
+def _measure(func, *args):
+
+    tracemalloc.start()
+    start  = time.perf_counter()
+    count  = func(*args)
+    total  = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return total, peak / 2**20, count
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    n   = 10**6
+
+    print("%8s %8s %12s %12s %12s %12s %6s" %
+          ("classes", "levels", "cantor (s)", "engine (s)", "cantor (MB)", "engine (MB)", "equal"))
+
+    for n_classes, n_levels in ((100, 100), (1000, 1000), (5000, 5000), (5000, 20000)):
+
+        y = rng.integers(0, n_classes, size=n)
+        x = rng.integers(0, n_levels,  size=n)
+
+        old_time, old_memory, old_count = _measure(_cantor_count, x, y)
+        new_time, new_memory, new_count = _measure(_joint_count, [x, y], [n_levels, n_classes])
+
+        print("%8d %8d %12.4f %12.4f %12.1f %12.1f %6s" %
+              (n_classes, n_levels, old_time, new_time, old_memory, new_memory,
+               np.array_equal(np.sort(old_count), np.sort(new_count))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of the miscoding of mixed-type DataFrames
+
+Compares the time and the peak memory to fit the miscoding of a DataFrame
+with 50 numeric and categorical columns, kept column by column, with the
+cost of converting first the frame into a single object array, as the
+validation of check_X_y used to do.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_mixed.py
+"""
+
+import time
+import tracemalloc
+
+import numpy  as np
+import pandas as pd
+
+from sklearn.utils import check_X_y
+
+from fastautoml.fastautoml import Miscoding
+
+
+def _measure(X, y, convert=False):
+
+    tracemalloc.start()
+    start     = time.perf_counter()
+    if convert:
+        X_object, y_object = check_X_y(X, y, dtype=None)
+    miscoding = Miscoding(X_type="mixed", y_type="numeric").fit(X, y)
+    total     = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return total, peak / 2**20, miscoding.regular_
+
+
+def main():
+
+    rng       = np.random.default_rng(42)
+    n_samples = 200000
+
+    columns = dict()
+    for i in np.arange(50):
+        if i % 2 == 0:
+            columns["x%d" % i] = rng.normal(size=n_samples)
+        else:
+            columns["x%d" % i] = rng.integers(0, 20, size=n_samples).astype(str)
+    X = pd.DataFrame(columns)
+    y = X["x0"].to_numpy() + rng.normal(size=n_samples)
+
+    frame_time, frame_memory, frame_regular    = _measure(X, y)
+    object_time, object_memory, object_regular = _measure(X, y, convert=True)
+
+    print("%8s %10s %12s" % ("", "time (s)", "memory (MB)"))
+    print("%8s %10.3f %12.1f" % ("object", object_time, object_memory))
+    print("%8s %10.3f %12.1f" % ("columns", frame_time, frame_memory))
+    print("speedup: %.1f" % (object_time / frame_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark of the parallel computation of the miscoding of the features
+
+Reports the time spent by Miscoding.fit, that discretizes every feature and
+computes its miscoding, for a wide dataset and an increasing number of jobs,
+and checks that the results are equal to the serial ones.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_parallel.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import Miscoding
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    X   = rng.normal(size=(50000, 2000))
+    y   = X[:,0] + X[:,1] + rng.normal(size=50000)
+
+    n_cpus = os.cpu_count()
+    jobs   = [1]
+    while 2 * jobs[-1] <= n_cpus:
+        jobs.append(2 * jobs[-1])
+
+    print("%6s %10s %8s %6s" % ("jobs", "time (s)", "speedup", "equal"))
+
+    for n_jobs in jobs:
+
+        start = time.perf_counter()
+        mscd  = Miscoding(n_jobs=n_jobs).fit(X, y).miscoding_features(mode='regular')
+        total = time.perf_counter() - start
+
+        if n_jobs == 1:
+            serial_time, serial = total, mscd
+
+        print("%6d %10.3f %8.1f %6s" % (n_jobs, total, serial_time / total, np.array_equal(serial, mscd)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark of the redundancy aware miscoding of the features
+
+Compares Miscoding(redundancy=True) with the previous implementation of the
+joint miscoding, a double loop over the pairs of features that computed
+the joint lengths of each pair and of each pair and the target one by one,
+followed by a greedy selection that recomputed, on every step, the average
+joint miscoding of every candidate with all the features already selected.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_redundancy.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import Miscoding, _codes_length, _count_length, _joint_count
+
+
+def _loop_joint(codes, mscd):
+    """
+    Previous implementation of the joint miscoding, kept as a reference
+    """
+
+    n_features = codes.X_codes.shape[1]
+    red_matrix = np.ones([n_features, n_features])
+    ldm_y      = codes.length_y()
+
+    for i in np.arange(n_features-1):
+
+        for j in np.arange(i+1, n_features):
+
+            ldm_X1X2  = _codes_length(codes.X_codes[:,i], codes.X_n_codes[i], codes.X_codes[:,j], codes.X_n_codes[j])
+            ldm_X1X2Y = _count_length(_joint_count([codes.X_codes[:,i], codes.X_codes[:,j], codes.y_codes],
+                                                   [codes.X_n_codes[i], codes.X_n_codes[j], codes.y_n_codes]))
+
+            tmp = ( ldm_X1X2Y - min(ldm_X1X2, ldm_y) ) / max(ldm_X1X2, ldm_y)
+
+            red_matrix[i, j] = tmp
+            red_matrix[j, i] = tmp
+
+    viu       = np.zeros(n_features, dtype=np.int8)
+    miscoding = np.zeros(n_features)
+
+    np.fill_diagonal(red_matrix, np.inf)
+    loc1, loc2 = np.unravel_index(np.argmin(red_matrix, axis=None), red_matrix.shape)
+    np.fill_diagonal(red_matrix, 1)
+    jmscd1 = jmscd2 = red_matrix[loc1, loc2]
+
+    viu[loc1] = 1
+    viu[loc2] = 1
+
+    if mscd[loc1] < mscd[loc2]:
+        jmscd1 = jmscd1 * mscd[loc1] / mscd[loc2]
+    elif mscd[loc1] > mscd[loc2]:
+        jmscd2 = jmscd2 * mscd[loc2] / mscd[loc1]
+
+    miscoding[loc1] = jmscd1
+    miscoding[loc2] = jmscd2
+
+    tmp = np.ones(n_features) * np.inf
+
+    for i in np.arange(2, n_features):
+
+        for j in np.arange(n_features):
+
+            if viu[j] == 1:
+                continue
+
+            tmp[j] = (1 / np.sum(viu)) * np.sum(red_matrix[np.where(viu == 1), j])
+
+        viu[np.argmin(tmp)] = 1
+        miscoding[np.argmin(tmp)] = np.min(tmp)
+
+        tmp = np.ones(n_features) * np.inf
+
+    return miscoding
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    n   = 2000
+
+    print("%10s %10s %12s %8s %8s" % ("features", "loop (s)", "engine (s)", "speedup", "equal"))
+
+    for n_features in (100, 250, 500, 2000, 5000):
+
+        X = rng.normal(size=(n, n_features))
+        y = X[:,0] + rng.normal(size=n)
+
+        start    = time.perf_counter()
+        mscd     = Miscoding(redundancy=True).fit(X, y)
+        new_time = time.perf_counter() - start
+
+        # The loop is too slow for the larger number of features
+        if n_features <= 500:
+            start    = time.perf_counter()
+            old      = _loop_joint(mscd.codes_, mscd._miscoding_features_single())
+            old_time = time.perf_counter() - start
+            print("%10d %10.3f %12.3f %8.1f %8s" %
+                  (n_features, old_time, new_time, old_time / new_time, np.allclose(old, mscd.regular_)))
+        else:
+            print("%10d %10s %12.3f %8s %8s" % (n_features, "-", new_time, "-", "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the approximate search of redundant pairs of features
+
+Compares Miscoding.redundant_pairs, based on locality sensitive hashing of
+min-hash keys of the discretized features, with the exact search over all
+the pairs of features of Miscoding.features_pairs, reporting the time spent,
+the number of pairs found and the recall of the pairs found.
+
+The datasets contain families of redundant features (a feature plus some
+noise of different levels) and independent features.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_redundant_pairs.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import Miscoding
+
+
+def _dataset(rng, n_samples, n_features):
+
+    n_families = n_features // 10
+    base       = rng.normal(size=(n_samples, n_families))
+
+    columns = list()
+    for i in np.arange(n_features):
+        if i < n_features // 2:
+            noise = rng.uniform(0, 0.2)
+            columns.append(base[:, i % n_families] + noise * rng.normal(size=n_samples))
+        else:
+            columns.append(rng.normal(size=n_samples))
+
+    X = np.column_stack(columns)
+    y = X[:,0] + rng.normal(size=n_samples)
+
+    return X, y
+
+
+def main():
+
+    rng       = np.random.default_rng(42)
+    n_samples = 5000
+    threshold = 0.3
+
+    print("%10s %10s %12s %10s %10s %8s" % ("features", "exact (s)", "approx (s)", "pairs", "found", "recall"))
+
+    for n_features in (250, 500, 1000, 2000, 4000):
+
+        X, y = _dataset(rng, n_samples, n_features)
+
+        mscd = Miscoding(random_state=0).fit(X, y)
+
+        start = time.perf_counter()
+        rows, cols, values = mscd.redundant_pairs(threshold)
+        approx_time = time.perf_counter() - start
+        found = set(zip(rows, cols))
+
+        # The exact search is too slow for the larger datasets
+        if n_features <= 1000:
+            start = time.perf_counter()
+            rows, cols, values = mscd.features_pairs(threshold, mode="regular")
+            exact_time = time.perf_counter() - start
+            exact  = set(zip(rows, cols))
+            recall = len(found & exact) / max(len(exact), 1)
+            print("%10d %10.3f %12.3f %10d %10d %8.3f" %
+                  (n_features, exact_time, approx_time, len(exact) // 2, len(found) // 2, recall))
+        else:
+            print("%10d %10s %12.3f %10s %10d %8s" % (n_features, "-", approx_time, "-", len(found) // 2, "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of the sketch based approximation of code lengths
+
+Compares the exact code length of a high cardinality categorical feature,
+and its joint code length with a categorical target, with the approximation
+computed over a hashing sketch of the feature, reporting the time spent and
+the relative error for several sketch widths.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_sketch.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import _encode_vector, _codes_length
+
+
+def _lengths(x, y, sketch_width=None):
+
+    start = time.perf_counter()
+    x_codes, x_n_codes, _ = _encode_vector(x, numeric=False, sketch_width=sketch_width)
+    y_codes, y_n_codes, _ = _encode_vector(y, numeric=False)
+    len_x  = _codes_length(x_codes, x_n_codes)
+    len_xy = _codes_length(x_codes, x_n_codes, y_codes, y_n_codes)
+    total  = time.perf_counter() - start
+
+    return total, len_x, len_xy
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    n   = 2 * 10**6
+    y   = rng.integers(0, 10, size=n)
+
+    print("%10s %10s %10s %12s %8s %12s %12s" %
+          ("levels", "width", "exact (s)", "sketch (s)", "speedup", "error X (%)", "error XY (%)"))
+
+    for n_levels in (10**4, 10**5, 10**6):
+
+        x = rng.zipf(1.3, size=n) % n_levels
+
+        exact_time, exact_x, exact_xy = _lengths(x, y)
+
+        for width in (2**16, 2**20):
+
+            sketch_time, sketch_x, sketch_xy = _lengths(x, y, sketch_width=width)
+
+            print("%10d %10d %10.3f %12.3f %8.1f %12.4f %12.4f" %
+                  (n_levels, width, exact_time, sketch_time, exact_time / sketch_time,
+                   100 * (exact_x - sketch_x) / exact_x, 100 * (exact_xy - sketch_xy) / exact_xy))
+
+
+if __name__ == "__main__":
+    main()
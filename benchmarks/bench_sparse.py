@@ -0,0 +1,62 @@
+"""
+Benchmark of the miscoding of sparse datasets
+
+Compares the time and the peak memory to fit the miscoding of a sparse
+matrix with the time and memory used for the same dataset as a dense array,
+for text like data (many samples and features, few values stored). The
+largest dataset is only fitted as a sparse matrix, its dense version would
+need tens of gigabytes.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_sparse.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as sp
+
+from fastautoml.fastautoml import Miscoding
+
+
+def _measure(X, y):
+
+    tracemalloc.start()
+    start     = time.perf_counter()
+    miscoding = Miscoding(y_type="categorical").fit(X, y)
+    total     = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return total, peak / 2**20, miscoding.regular_
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+
+    print("%8s %8s %10s %12s %12s %12s %12s %6s" %
+          ("samples", "features", "nnz", "dense (s)", "sparse (s)", "dense (MB)", "sparse (MB)", "equal"))
+
+    for n_samples, n_features, density in ((10000, 2000, 0.01), (20000, 5000, 0.005), (200000, 50000, 0.0005)):
+
+        X = sp.random(n_samples, n_features, density=density, format='csr', random_state=rng,
+                      data_rvs=lambda size: rng.integers(1, 5, size=size))
+        y = rng.integers(0, 5, size=n_samples)
+
+        sparse_time, sparse_memory, sparse_regular = _measure(X, y)
+
+        if n_samples * n_features <= 10**8:
+            dense_time, dense_memory, dense_regular = _measure(X.toarray(), y)
+            print("%8d %8d %10d %12.3f %12.3f %12.1f %12.1f %6s" %
+                  (n_samples, n_features, X.nnz, dense_time, sparse_time, dense_memory, sparse_memory,
+                   np.allclose(dense_regular, sparse_regular)))
+        else:
+            print("%8d %8d %10d %12s %12.3f %12s %12.1f %6s" %
+                  (n_samples, n_features, X.nnz, "-", sparse_time, "-", sparse_memory, "-"))
+
+
+if __name__ == "__main__":
+    main()
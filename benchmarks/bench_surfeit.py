@@ -0,0 +1,51 @@
+"""
+Benchmark of the surfeit of large models
+
+Reports the time and the peak memory used by Surfeit.surfeit_model for
+polynomial SVC models with an increasing number of support vectors,
+together with the size of the serialized model, that is compressed as it
+is generated and never kept in memory.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_surfeit.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from sklearn.svm import SVC
+
+from fastautoml.fastautoml import Surfeit
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+
+    print("%8s %10s %12s %12s" % ("vectors", "time (s)", "memory (MB)", "model (MB)"))
+
+    for n_samples in (2000, 8000, 32000):
+
+        X = rng.normal(size=(n_samples, 20))
+        y = (X[:,0] + rng.normal(size=n_samples) > 0).astype(int)
+
+        model   = SVC(kernel="poly").fit(X, y)
+        surfeit = Surfeit(y_type="categorical").fit(X, y)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        surfeit.surfeit_model(model)
+        total = time.perf_counter() - start
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        length = sum(len(chunk) for chunk in surfeit._SVC(model))
+
+        print("%8d %10.3f %12.1f %12.1f" % (len(model.support_), total, peak / 2**20, length / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of the top-k screening of features for datasets with many more
+features than samples (genotypes of a few hundred individuals)
+
+Compares the time to fit the miscoding of all the features with the time to
+fit only the top_k most relevant ones, and reports the number of features
+whose miscoding had to be computed.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/bench_top_features.py
+"""
+
+import time
+
+import numpy as np
+
+from fastautoml.fastautoml import Miscoding
+
+
+def main():
+
+    rng = np.random.default_rng(42)
+    n   = 200
+    k   = 10
+
+    print("%10s %10s %10s %10s %6s" % ("features", "all (s)", "top (s)", "computed", "equal"))
+
+    for n_features in (10000, 100000, 500000):
+
+        # Genotypes, k of them related with the phenotype
+        X = rng.integers(0, 3, size=(n, n_features)).astype(float)
+        y = rng.integers(0, 2, size=n)
+        X[:,:k] = np.where(rng.random(size=(n, k)) < 0.95, y[:,np.newaxis], X[:,:k])
+
+        start    = time.perf_counter()
+        full     = Miscoding(y_type="categorical").fit(X, y)
+        all_time = time.perf_counter() - start
+
+        start    = time.perf_counter()
+        top      = Miscoding(y_type="categorical", top_k=k).fit(X, y)
+        top_time = time.perf_counter() - start
+
+        print("%10d %10.3f %10.3f %10d %6s" %
+              (n_features, all_time, top_time, np.sum(top.computed_),
+               np.array_equal(full.top_features(k), top.top_features(k))))
+
+        del X, full, top
+
+
+if __name__ == "__main__":
+    main()
@@ -12,24 +12,31 @@ with the minimum nescience principle
 import pandas as pd
 import numpy  as np
 
-import warnings
 import math
+import copy
+import os
 import re
 
 from sklearn.base import BaseEstimator, ClassifierMixin, RegressorMixin														
 														
 from sklearn.utils            import check_X_y
 from sklearn.utils            import check_array
+from sklearn.utils            import check_random_state
+from sklearn.utils.random     import sample_without_replacement
 from sklearn.utils.validation import check_is_fitted
+from sklearn.utils.validation import check_consistent_length
+from sklearn.utils.validation import column_or_1d
 from sklearn.utils.multiclass import check_classification_targets
-from sklearn.preprocessing    import KBinsDiscretizer
-from sklearn.preprocessing    import LabelEncoder
 from sklearn.preprocessing    import MinMaxScaler
 from sklearn.calibration      import CalibratedClassifierCV
 from sklearn.cluster          import KMeans
 
 from scipy.optimize import differential_evolution
 
+import scipy.sparse as sp
+
+from joblib import Parallel, delayed, effective_n_jobs
+
 # Compressors
 
 import bz2
@@ -81,9 +88,7 @@ def _unique_count(x1, numeric1, x2=None, numeric2=None):
     if not numeric1:
 
         # Econde categorical values as numbers
-        le = LabelEncoder()
-        le.fit(x1)
-        x1 = le.transform(x1)
+        x1, classes = _factorize(x1)
 
     else:
 
@@ -100,62 +105,146 @@ def _unique_count(x1, numeric1, x2=None, numeric2=None):
         if not numeric2:
 
             # Econde categorical values as numbers
-            le = LabelEncoder()
-            le.fit(x2)
-            x2 = le.transform(x2)
+            x2, classes = _factorize(x2)
 
         else:
 
             # Discretize variable
             x2 = _discretize_vector(x2, dim=2)
 
-        x = (x1 + x2) * (x1 + x2 + 1) / 2 + x2
-        x = x.astype(int)
+        count = _joint_count([x1, x2], [np.max(x1) + 1, np.max(x2) + 1])
 
     else:
         
-        x = x1
+        count = _joint_count([x1], [np.max(x1) + 1])
+
+    return count
 
-    # Return count        
+
+"""
+Count the number of occurences of the joint values of a list of integer
+coded variables. If the grid of possible joint values is small, the values
+are counted with a dense table, otherwise only the occupied cells are
+counted (sorting the joint values), so memory is proportional to the number
+of occupied cells and not to the size of the grid.
     
-    y     = np.bincount(x)
-    ii    = np.nonzero(y)[0]
-    count = y[ii]
+Parameters
+----------
+codes  : list of array-like of non-negative integers, shape (n_samples)
+n_codes: list with the number of possible codes of each variable
+       
+Returns
+-------
+A vector with the frequencies of the joint values that do occur.
+"""
+def _joint_count(codes, n_codes):
+
+    length  = len(codes[0])
+    n_codes = [int(n) for n in n_codes]
+    n_cells = math.prod(n_codes)
+
+    if n_cells <= max(length, 2**16):
+
+        # Small grid, count with a dense table
+        if len(codes) == 1:
+            x = codes[0]
+        else:
+            x = np.ravel_multi_index(codes, n_codes)
+
+        count = np.bincount(x, minlength=n_cells)
+        count = count[count != 0]
+
+    elif n_cells < 2**63:
+
+        # Large grid, count the occupied cells
+        x = codes[0].astype(np.int64)
+        for i in np.arange(1, len(codes)):
+            x = x * n_codes[i] + codes[i]
+
+        values, count = np.unique(x, return_counts=True)
+
+    else:
+
+        # Grid too large for a single integer index
+        x = np.column_stack(codes)
+        values, count = np.unique(x, axis=0, return_counts=True)
 
     return count
 
 
 """
-Discretize a continous variable using a "uniform" strategy
+Compute the codes of a vector given the edges of a "uniform" discretization.
+The bin of each value is computed arithmetically, and then corrected against
+the edges, so the codes are identical to a binary search over the edges.
+Values outside the edges are assigned to the first or last bin.
     
 Parameters
 ----------
-x  : array-like, shape (n_samples)
-dim: Number of dimensions of space
+x    : array-like of floats, shape (n_samples)
+edges: the edges of the bins, equally spaced
        
 Returns
 -------
 A new discretized vector of integers.
 """
-def _discretize_vector(x, dim=1):
+def _uniform_codes(x, edges):
+
+    n_bins = len(edges) - 1
+
+    if n_bins == 1:
+        return np.zeros(x.shape[0], dtype=int)
+
+    codes = (x - edges[0]) * (n_bins / (edges[-1] - edges[0]))
+    codes = np.clip(codes, 0, n_bins - 1).astype(int)
+
+    # Correct the rounding errors
+    inner = np.concatenate(([-np.inf], edges[1:-1], [np.inf]))
+    codes = codes - (x < inner[codes])
+    codes = codes + (x >= inner[codes + 1])
+
+    return codes
 
-    length = x.shape[0]
-    new_x  = x.copy().reshape(-1, 1)
+
+"""
+Compute the bins of a "uniform" discretization of a continous variable.
+The number of bins starts at the cube root of the number of samples, and it
+is increased until all the intervals have data, or the number of intervals
+with data does not change anymore.
+
+The edges are computed arithmetically, and every candidate number of bins
+is evaluated with a single histogram pass over the data.
+    
+Parameters
+----------
+x     : array-like, shape (n_samples)
+length: the number of samples, if x only has some of them; since the bins
+        only depend on which values are present, x may hold a single copy
+        of a repeated value (for example, the zeros of a sparse column)
+       
+Returns
+-------
+A new discretized vector of integers, and the edges of the bins.
+"""
+def _uniform_bins(x, length=None):
+
+    x      = np.asarray(x, dtype=float).ravel()
+    length = x.shape[0] if length is None else length
 
     # TODO: Think about this
     # Optimal number of bins
     optimal_bins = int(np.cbrt(length))
 
-    # TODO: Think about this
-    # if dim == 1:
-    #     optimal_bins = int(np.sqrt(length))
-    # else:
-    #     optimal_bins = int(np.sqrt(np.sqrt(length)))
-    
     # Correct the number of bins if it is too small
     if optimal_bins <= 1:
         optimal_bins = 2
-    
+
+    x_min = x.min()
+    x_max = x.max()
+
+    # Constant variables are encoded with a single bin
+    if x_min == x_max:
+        return np.zeros(x.shape[0], dtype=int), np.array([x_min, x_max])
+
     # Repeat the process until we have data in all the intervals
 
     total_bins    = optimal_bins
@@ -164,17 +253,9 @@ def _discretize_vector(x, dim=1):
 
     while stop == False:
 
-        # Avoid those annoying warnings
-        with warnings.catch_warnings():
-            
-            warnings.simplefilter("ignore")
-
-            est = KBinsDiscretizer(n_bins=total_bins, encode='ordinal', strategy="uniform")
-            est.fit(new_x)
-            tmp_x = est.transform(new_x)[:,0].astype(dtype=int)
-
-        y = np.bincount(tmp_x)
-        actual_bins = len(np.nonzero(y)[0])
+        edges       = np.linspace(x_min, x_max, total_bins + 1)
+        codes       = _uniform_codes(x, edges)
+        actual_bins = np.count_nonzero(np.bincount(codes, minlength=total_bins))
 
         if previous_bins == actual_bins:
             # Nothing changed, better stop here
@@ -189,7 +270,139 @@ def _discretize_vector(x, dim=1):
             # All intervals have data
             stop = True
 
-    new_x = est.transform(new_x)[:,0].astype(dtype=int)
+    return codes, edges
+
+
+"""
+Compute the codes of many continous variables given the same number of
+uniform bins for all of them (see _uniform_codes)
+    
+Parameters
+----------
+X         : array-like, shape (n_samples, n_features)
+x_min     : the minimum of each variable
+x_max     : the maximum of each variable
+total_bins: the number of bins
+       
+Returns
+-------
+A matrix with the codes, a matrix with the edges of the bins (one column
+per variable), and the number of bins with data of each variable
+"""
+def _uniform_codes_matrix(X, x_min, x_max, total_bins):
+
+    n_features = X.shape[1]
+
+    edges = np.linspace(x_min, x_max, total_bins + 1)
+
+    # Arithmetic in place, only one float and one integer temporary
+    scaled = np.subtract(X, edges[0])
+    np.multiply(scaled, total_bins / (edges[-1] - edges[0]), out=scaled)
+    np.clip(scaled, 0, total_bins - 1, out=scaled)
+    codes  = scaled.astype(np.intp)
+    del scaled
+
+    # Correct the rounding errors
+    inner  = np.concatenate((np.full((1, n_features), -np.inf), edges[1:-1], np.full((1, n_features), np.inf)))
+    codes -= X < np.take_along_axis(inner, codes, axis=0)
+    codes += X >= np.take_along_axis(inner, codes + 1, axis=0)
+
+    counts      = np.bincount((codes + np.arange(n_features) * total_bins).ravel(), minlength=n_features * total_bins)
+    actual_bins = np.count_nonzero(counts.reshape((n_features, total_bins)), axis=1)
+
+    return codes, edges, actual_bins
+
+
+"""
+Compute the bins of a "uniform" discretization of many continous variables
+at once (see _uniform_bins). On each step, the variables with the same
+candidate number of bins are evaluated together with array operations.
+Constant variables, and variables with non finite values, are discretized
+one by one.
+    
+Parameters
+----------
+X: array-like, shape (n_samples, n_features)
+       
+Returns
+-------
+A list with the discretized vector of integers, and the edges of the bins,
+of each variable
+"""
+def _uniform_bins_matrix(X):
+
+    X = np.asarray(X, dtype=float)
+
+    length, n_features = X.shape
+
+    if length == 0:
+        return [_uniform_bins(X[:,i]) for i in np.arange(n_features)]
+
+    # Optimal number of bins
+    optimal_bins = max(int(np.cbrt(length)), 2)
+
+    bins  = [None] * n_features
+    x_min = X.min(axis=0)
+    x_max = X.max(axis=0)
+
+    active        = np.flatnonzero(np.isfinite(x_min) & np.isfinite(x_max) & (x_min != x_max))
+    total_bins    = np.full(n_features, optimal_bins)
+    previous_bins = np.zeros(n_features, dtype=int)
+
+    # Repeat the process until we have data in all the intervals
+
+    while len(active) != 0:
+
+        remaining = list()
+
+        for bins_group in np.unique(total_bins[active]):
+
+            group = active[total_bins[active] == bins_group]
+            codes, edges, actual_bins = _uniform_codes_matrix(X[:,group], x_min[group], x_max[group], bins_group)
+
+            # Stop if all intervals have data, or nothing changed
+            stop = (actual_bins >= optimal_bins) | (actual_bins == previous_bins[group])
+
+            # Codes are kept in the compact dtype, not as views of the matrix
+            for j in np.flatnonzero(stop):
+                bins[group[j]] = (codes[:,j].astype(_compact_dtype(bins_group)), edges[:,j])
+
+            group = group[~stop]
+            actual_bins = actual_bins[~stop]
+            previous_bins[group] = actual_bins
+            total_bins[group]    = total_bins[group] + np.round( (length * (1 - actual_bins / optimal_bins)) / optimal_bins ).astype(int)
+            remaining.append(group)
+
+        active = np.concatenate(remaining)
+
+    for i in np.arange(n_features):
+        if bins[i] is None:
+            bins[i] = _uniform_bins(X[:,i])
+
+    return bins
+
+
+"""
+Discretize a continous variable using a "uniform" strategy
+    
+Parameters
+----------
+x  : array-like, shape (n_samples)
+dim: Number of dimensions of space
+       
+Returns
+-------
+A new discretized vector of integers.
+"""
+def _discretize_vector(x, dim=1):
+
+    # TODO: Think about this
+    # if dim == 1:
+    #     optimal_bins = int(np.sqrt(length))
+    # else:
+    #     optimal_bins = int(np.sqrt(np.sqrt(length)))
+
+    new_x, edges = _uniform_bins(x)
 
     return new_x
 
@@ -217,389 +430,2321 @@ def _optimal_code_length(x1, numeric1, x2=None, numeric2=None):
     return ldm
 
 
-#
-# Class Miscoding
-# 
-class Miscoding(BaseEstimator):
-    """
-    Given a dataset X = {x1, ..., xp} composed by p features, and a target
-    variable y, the miscoding of the feature xj measures how difficult is to
-    reconstruct y given xj, and the other way around. We are not only
-    interested in to identify how much information xj contains about y, but
-    also if xj contains additional information that is not related
-    to y (which is a bad thing). Miscoding also takes into account that
-    feature xi might be redundant with respect to feature xj.
+"""
+Compute the type of each feature of a dataset
+    
+Parameters
+----------
+X     : array-like, shape (n_samples, n_features)
+X_type: The type of the features, numeric, mixed or categorical
+       
+Returns
+-------
+A list with True if the feature is numeric and False otherwise
+"""
+def _isnumeric_features(X, X_type):
 
-    The fastautoml.Miscoding class allow us to compute the relevance of
-    features, the quality of a dataset, and select the optimal subset of
-    features to include in a study
+    if X_type == "mixed" or X_type == "categorical":
 
-    Example of usage:
-        
-        from fastautoml.fastautoml import Miscoding
-        miscoding = Miscoding()
-        miscoding.fit(X, y)
-        msd = miscoding.miscoding_features()
-    """
+        if isinstance(X, pd.DataFrame):
+            X_isnumeric = [pd.api.types.is_numeric_dtype(my_type) and not pd.api.types.is_bool_dtype(my_type)
+                           for my_type in X.dtypes]
+        else:
+            raise ValueError("Only DataFrame is allowed for X of type 'mixed' and 'categorical."
+                             "Got type {!r} instead."
+                             .format(type(X)))
+            
+    else:
+        X_isnumeric = [True] * X.shape[1]
 
-    def __init__(self, X_type="numeric", y_type="numeric", redundancy=False):
-        """
-        Initialization of the class Miscoding
-        
-        Parameters
-        ----------
-        X_type:     The type of the features, numeric, mixed or categorical
-        y_type:     The type of the target, numeric or categorical
-        redundancy: if "True" takes into account the redundancy between features
-                    to compute the miscoding, if "False" only the miscoding with
-                    respect to the target variable is computed.
-          
-        """        
+    return X_isnumeric
 
-        valid_X_types = ("numeric", "mixed", "categorical")
-        valid_y_types = ("numeric", "categorical")
 
-        if X_type not in valid_X_types:
-            raise ValueError("Valid options for 'X_type' are {}. "
-                             "Got vartype={!r} instead."
-                             .format(valid_X_types, X_type))
+"""
+Validate a DataFrame of mixed or categorical features and its target,
+without converting the frame into a single numpy array. The columns keep
+their own dtypes, so numeric features are not boxed as Python objects.
+    
+Parameters
+----------
+X: DataFrame, shape (n_samples, n_features)
+y: array-like, shape (n_samples)
+       
+Returns
+-------
+The frame X, and y as a numpy array
+"""
+def _check_frame(X, y):
 
-        if y_type not in valid_y_types:
-            raise ValueError("Valid options for 'y_type' are {}. "
-                             "Got vartype={!r} instead."
-                             .format(valid_y_types, y_type))
+    if y is None:
+        raise ValueError("y cannot be None")
 
-        self.X_type     = X_type
-        self.y_type     = y_type
-        self.redundancy = redundancy
-        
-        return None
-    
+    y = column_or_1d(y, warn=True)
+    check_consistent_length(X, y)
+
+    if X.shape[0] == 0 or X.shape[1] == 0:
+        raise ValueError("Found DataFrame with shape {!r}, while a minimum "
+                         "of one sample and one feature is required."
+                         .format(X.shape))
+
+    return X, y
+
+
+"""
+Compute the length of a dataset encoded with an optimal code
+given the frequencies of its values
     
-    def fit(self, X, y):
-        """
-        Learn empirically the miscoding of the features of X
-        as a representation of y.
-        
-        Parameters
-        ----------
-        X : array-like, shape (n_samples, n_features)
-            Sample vectors from which to compute miscoding.
-            array-like, numpy or pandas array in case of numerical types
-            pandas array in case of mixed or caregorical types
-            
-        y : array-like, shape (n_samples)
-            The target values as numbers or strings.
-            
-        Returns
-        -------
-        self
-        """
+Parameters
+----------
+count: array-like, the frequencies of the values
+       
+Returns
+-------
+Return the length of the encoded dataset (float)
+"""
+def _count_length(count):
 
-        if self.X_type == "mixed" or self.X_type == "categorical":
+    count = np.asarray(count)
+    count = count[count != 0]
+    ldm   = np.sum(count * ( - np.log2(count / np.sum(count) )))
 
-            if isinstance(X, pd.DataFrame):
-                self.X_isnumeric = [np.issubdtype(my_type, np.number) for my_type in X.dtypes]
-            else:
-                raise ValueError("Only DataFrame is allowed for X of type 'mixed' and 'categorical."
-                                 "Got type {!r} instead."
-                                 .format(type(X)))
-                
-        else:
-            self.X_isnumeric = [True] * X.shape[1]
+    return ldm
 
-        if self.y_type == "numeric":
-            self.y_isnumeric = True
-        else:
-            self.y_isnumeric = False
-        
-        self.X_, self.y_ = check_X_y(X, y, dtype=None)
 
-        # TODO: Joint miscoding is not supported yet
-        self.regular_ = self._miscoding_features_single()
+"""
+Compute the lengths of many datasets encoded with an optimal code given
+their frequencies, all of them stored one after the other in a single
+array, as array operations over the non empty cells
+    
+Parameters
+----------
+counts: array-like of integers, the frequencies of the values of all the
+        datasets, concatenated
+sizes : array-like, the number of frequencies of each dataset
+       
+Returns
+-------
+Return a numpy array with the length of each encoded dataset
+"""
+def _count_lengths(counts, sizes):
 
-        # TODO: Fix!
-        # if self.redundancy:
-        #     self.regular_ = self._miscoding_features_joint()
-        # else:
-        #     self.regular_ = self._miscoding_features_single()
+    counts  = np.asarray(counts)
+    sizes   = np.asarray(sizes, dtype=np.int64)
+    ends    = np.cumsum(sizes)
+    cumsum  = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+    total   = cumsum[ends] - cumsum[ends - sizes]
 
-        self.adjusted_ = 1 - self.regular_
+    nonzero = counts != 0
+    n_terms = np.concatenate(([0], np.cumsum(nonzero, dtype=np.int64)))[ends]
+    dataset = np.repeat(np.arange(len(sizes)), np.diff(n_terms, prepend=0))
+    count   = counts[nonzero]
 
-        if np.sum(self.adjusted_) != 0:
-            self.adjusted_ = self.adjusted_ / np.sum(self.adjusted_)
+    terms = count * ( - np.log2(count / total[dataset] ))
+    ldm   = np.bincount(dataset, weights=terms, minlength=len(sizes))
 
-        if np.sum(self.regular_) != 0:
-            self.partial_  = self.adjusted_ - self.regular_ / np.sum(self.regular_)
-        else:
-            self.partial_  = self.adjusted_
-        
-        return self
+    return ldm
 
 
-    def miscoding_features(self, mode='adjusted'):
-        """
-        Return the miscoding of the target given the features
+"""
+Count the joint frequencies of each feature and the target variable, for
+all the features at once, with a single bincount over the cells of all the
+contingency tables for each block of columns
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+y_codes  : integer codes of the target, shape (n_samples)
+y_n_codes: the number of codes of the target
+       
+Returns
+-------
+An array with the contingency tables of the features and the target, one
+after the other, being the table of the feature i of shape
+(X_n_codes[i], y_n_codes)
+"""
+def _contingency_tables(X_codes, X_n_codes, y_codes, y_n_codes):
 
-        Parameters
+    n_samples, n_features = X_codes.shape
+
+    n_cells = np.asarray(X_n_codes, dtype=np.int64) * y_n_codes
+    offsets = np.concatenate(([0], np.cumsum(n_cells)))
+    y_codes = np.asarray(y_codes, dtype=np.intp)[:,np.newaxis]
+    counts  = np.zeros(offsets[-1], dtype=np.int64)
+
+    # Bound the size of the index of a block to 2**16 values (bincount
+    # needs them as intp), and the size of its tables to 2**16 cells, so
+    # the index and the counts are kept in cache
+    step = max(1, min(2**16 // max(n_samples, 1), 2**16 // max(np.max(n_cells, initial=1), 1)))
+
+    for start in np.arange(0, n_features, step):
+
+        stop   = min(start + step, n_features)
+        index  = np.asarray(X_codes[:,start:stop], dtype=np.intp) * y_n_codes
+        index += y_codes
+        index += offsets[start:stop] - offsets[start]
+
+        counts[offsets[start]:offsets[stop]] = np.bincount(index.ravel(order='K'), minlength=offsets[stop] - offsets[start])
+
+    return counts
+
+
+"""
+Compute the joint length of each feature and the target variable, for all
+the features of a sparse matrix of codes at once. Only the cells with data
+are counted: the values stored, and the implicit zeros of each feature,
+added to its code 0 as the frequencies of the target minus the frequencies
+of the values stored. Time and memory depend on the number of values
+stored, not on the size of the matrix.
+    
+Parameters
+----------
+X_codes  : sparse matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+y_codes  : integer codes of the target, shape (n_samples)
+y_n_codes: the number of codes of the target
+       
+Returns
+-------
+A numpy array with the joint length of each feature and the target
+"""
+def _sparse_lengths(X_codes, X_n_codes, y_codes, y_n_codes):
+
+    X_codes    = sp.csc_matrix(X_codes)
+    n_features = X_codes.shape[1]
+    max_codes  = int(np.max(X_n_codes, initial=1))
+    y_codes    = np.asarray(y_codes, dtype=np.int64)
+
+    # Feature and class of each value stored
+    feature = np.repeat(np.arange(n_features), np.diff(X_codes.indptr))
+    classes = y_codes[X_codes.indices]
+
+    stored   = np.bincount(feature * y_n_codes + classes, minlength=n_features * y_n_codes)
+    implicit = np.tile(np.bincount(y_codes, minlength=y_n_codes), n_features) - stored
+
+    keys    = np.concatenate(((feature * max_codes + np.asarray(X_codes.data, dtype=np.int64)) * y_n_codes + classes,
+                              np.arange(n_features * y_n_codes) + np.repeat(np.arange(n_features), y_n_codes) * (max_codes - 1) * y_n_codes))
+    weights = np.concatenate((np.ones(len(feature), dtype=np.int64), implicit))
+
+    cells, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, weights=weights).astype(np.int64)
+    sizes  = np.bincount(cells // (max_codes * y_n_codes), minlength=n_features)
+
+    return _count_lengths(counts, sizes)
+
+
+"""
+Compute the length of one or two variables encoded with an optimal code
+given their integer codes
+    
+Parameters
+----------
+x1, x2      : array-like of integers, shape (n_samples)
+n_codes1, n_codes2: the number of possible codes of each variable
+       
+Returns
+-------
+Return the length of the encoded dataset (float)
+"""
+def _codes_length(x1, n_codes1, x2=None, n_codes2=None):
+
+    if x2 is None:
+        count = _joint_count([x1], [n_codes1])
+    else:
+        count = _joint_count([x1, x2], [n_codes1, n_codes2])
+
+    return _count_length(count)
+
+
+"""
+Return the codes of a feature as a numpy array, also from a sparse matrix
+of codes
+"""
+def _column(X_codes, i):
+
+    if sp.issparse(X_codes):
+        return X_codes[:,[i]].toarray().ravel()
+
+    return X_codes[:,i]
+
+
+"""
+Return the smallest unsigned integer type that can hold a number of codes
+"""
+def _compact_dtype(n_codes):
+
+    if n_codes <= 2**8:
+        return np.uint8
+    elif n_codes <= 2**16:
+        return np.uint16
+    elif n_codes <= 2**32:
+        return np.uint32
+
+    return np.uint64
+
+
+"""
+Encode a categorical variable with a hashing sketch, that is, a count-min
+sketch with a single row of sketch_width counters. Memory is bounded by
+the width of the sketch regardless of the number of distinct values.
+
+Merging values into the same counter can only reduce the code length, so
+the code lengths computed over the sketch are lower bounds. For a variable
+with D distinct values, the expected error is at most log2(1 + (D-1) / width)
+bits per sample, and the same bound applies to joint code lengths with
+other variables.
+    
+Parameters
+----------
+x    : array-like, shape (n_samples)
+width: number of counters of the sketch
+       
+Returns
+-------
+A new vector of integers with the counter of each value.
+"""
+def _sketch_codes(x, width):
+
+    x = np.asarray(x)
+    if x.dtype.kind in ("U", "S"):
+        x = x.astype(object)
+
+    hashes = pd.util.hash_array(x, categorize=False)
+    codes  = hashes % np.uint64(width)
+
+    return codes
+
+
+"""
+Encode a categorical variable as integer codes, given by the position of
+each value in the sorted list of its distinct values. Missing values are
+encoded as an additional category at the end.
+    
+Parameters
+----------
+x: array-like, shape (n_samples)
+       
+Returns
+-------
+The codes, and the sorted distinct values
+"""
+def _factorize(x):
+
+    codes, classes = pd.factorize(x, sort=True)
+
+    if np.any(codes < 0):
+        codes[codes < 0] = len(classes)
+        classes = np.append(np.asarray(classes, dtype=object), np.nan)
+
+    return codes, np.asarray(classes)
+
+
+"""
+Discretize a numeric variable, or encode a categorical one, as integer codes
+    
+Parameters
+----------
+x      : array-like, shape (n_samples)
+numeric: if the variable is numeric or not
+sketch_width: if not None, categorical variables are encoded with a
+              hashing sketch of this width (see _sketch_codes)
+       
+Returns
+-------
+The codes (compact unsigned integers), the number of codes, and the edges
+of the bins (numeric variables) or the categories (categorical variables)
+"""
+def _encode_vector(x, numeric, sketch_width=None):
+
+    if numeric:
+        codes, edges = _uniform_bins(x)
+        n_codes      = len(edges) - 1
+    elif sketch_width is not None:
+        codes   = _sketch_codes(x, sketch_width)
+        edges   = None
+        n_codes = sketch_width
+    else:
+        codes, edges = _factorize(x)
+        n_codes      = len(edges)
+
+    codes = codes.astype(_compact_dtype(n_codes))
+
+    return codes, n_codes, edges
+
+
+"""
+Encode a variable as integer codes, given the edges of the bins (numeric)
+or the categories (categorical) computed by _encode_vector for another
+variable, so both are coded in the same way with a single pass over the
+data. Numeric values below or above the edges are assigned to two
+additional codes at the end, and each category not seen before gets its
+own additional code, so the codes of the variable keep its partition even
+if none of its categories were seen (e.g. predictions of class indices).
+    
+Parameters
+----------
+x      : array-like, shape (n_samples)
+numeric: if the variable is numeric or not
+edges  : the edges of the bins, or the categories, as given by _encode_vector
+sketch_width: if not None, categorical variables are encoded with a
+              hashing sketch of this width (see _sketch_codes)
+       
+Returns
+-------
+The codes (compact unsigned integers), the number of codes, and the edges,
+or the categories extended with the new ones, to encode more values of the
+variable in the same way
+"""
+def _encode_with_edges(x, numeric, edges, sketch_width=None):
+
+    if numeric:
+        x       = np.asarray(x, dtype=float).ravel()
+        n_bins  = len(edges) - 1
+        codes   = _uniform_codes(x, edges)
+        codes[x < edges[0]]  = n_bins
+        codes[x > edges[-1]] = n_bins + 1
+        n_codes = n_bins + 2
+    elif sketch_width is not None:
+        codes   = _sketch_codes(x, sketch_width)
+        n_codes = sketch_width
+    else:
+        x       = np.asarray(x).ravel()
+        codes   = pd.Index(edges).get_indexer(x)
+        unseen  = codes < 0
+        if np.any(unseen):
+            new, classes  = _factorize(x[unseen])
+            codes[unseen] = len(edges) + new
+            edges = np.append(np.asarray(edges, dtype=object), np.asarray(classes, dtype=object))
+        n_codes = len(edges)
+
+    codes = codes.astype(_compact_dtype(n_codes))
+
+    return codes, n_codes, edges
+
+
+"""
+Split the features of a dataset in blocks of contiguous columns to be
+processed in parallel, a few blocks per job to balance the load
+    
+Parameters
+----------
+n_features: the number of features
+n_jobs    : the number of jobs, as in joblib
+       
+Returns
+-------
+A list of arrays with the indices of the features of each block
+"""
+def _feature_blocks(n_features, n_jobs):
+
+    n_blocks = min(n_features, 4 * effective_n_jobs(n_jobs))
+
+    return np.array_split(np.arange(n_features), max(n_blocks, 1))
+
+
+"""
+Discretize the numeric columns, and encode the categorical ones, of a
+block of columns (see _encode_vector)
+"""
+def _encode_block(X, X_isnumeric, sketch_width=None):
+
+    encoded = [None] * X.shape[1]
+
+    # Numeric columns are discretized together, in chunks of about 2**14
+    # values, so the temporaries of a chunk are small compared to the codes
+    numeric = np.flatnonzero(np.asarray(X_isnumeric, dtype=bool))
+    step    = max(1, 2**14 // max(X.shape[0], 1))
+
+    for start in np.arange(0, len(numeric), step):
+        chunk = numeric[start:start+step]
+        if isinstance(X, pd.DataFrame):
+            data = X.iloc[:,chunk].to_numpy(dtype=float)
+        else:
+            data = X[:,chunk]
+        for i, (codes, edges) in zip(chunk, _uniform_bins_matrix(data)):
+            n_codes    = len(edges) - 1
+            encoded[i] = (codes.astype(_compact_dtype(n_codes), copy=False), n_codes, edges)
+
+    for i in np.arange(X.shape[1]):
+        if encoded[i] is None:
+            if isinstance(X, pd.DataFrame):
+                # Categorical and string dtypes are factorized natively
+                column = X.iloc[:,i]
+            else:
+                column = X[:,i]
+            encoded[i] = _encode_vector(column, X_isnumeric[i], sketch_width)
+
+    return encoded
+
+
+"""
+Discretize the numeric columns, and encode the categorical ones,
+of a matrix
+    
+Parameters
+----------
+X          : array-like or DataFrame, shape (n_samples, n_features)
+             the columns of a DataFrame are encoded with their own dtype
+X_isnumeric: list with the type of each feature (numeric or not)
+sketch_width: if not None, categorical features are encoded with a
+              hashing sketch of this width (see _sketch_codes)
+n_jobs     : the number of jobs used to encode the columns
+       
+Returns
+-------
+A matrix of compact integer codes (one column per feature), the number of
+codes of each feature, and a list with the edges or categories of each feature
+"""
+def _discretize_matrix(X, X_isnumeric, sketch_width=None, n_jobs=None):
+
+    if effective_n_jobs(n_jobs) == 1:
+        encoded = _encode_block(X, X_isnumeric, sketch_width)
+    else:
+        if isinstance(X, pd.DataFrame):
+            blocks = [(X.iloc[:,block], block) for block in _feature_blocks(X.shape[1], n_jobs)]
+        else:
+            blocks = [(X[:,block], block) for block in _feature_blocks(X.shape[1], n_jobs)]
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_encode_block)(data, [X_isnumeric[i] for i in block], sketch_width) for data, block in blocks)
+        encoded = [item for result in results for item in result]
+
+    columns = list()
+    n_codes = np.zeros(X.shape[1], dtype=int)
+    edges   = list()
+
+    for i in np.arange(X.shape[1]):
+        codes, n_codes[i], edge = encoded[i]
+        encoded[i] = None
+        columns.append(codes)
+        edges.append(edge)
+
+    dtype = _compact_dtype(np.max(n_codes, initial=1))
+    codes = np.empty((X.shape[0], X.shape[1]), dtype=dtype, order='F')
+
+    for i in np.arange(X.shape[1]):
+        codes[:,i] = columns[i]
+        columns[i] = None
+
+    return codes, n_codes, edges
+
+
+"""
+Discretize the columns of a sparse matrix, as if it were dense, using
+only the values stored. The implicit zeros of a column are taken into
+account as a single value when computing the bins (see _uniform_bins).
+The codes of each column are rotated, so the bin of the zero gets the code
+0, and the implicit zeros of the matrix of codes are the codes of the zeros
+of the dataset. This relabeling of the codes does not change any length.
+    
+Parameters
+----------
+X: scipy sparse matrix, shape (n_samples, n_features)
+       
+Returns
+-------
+A sparse CSC matrix of integer codes, the number of codes of each feature,
+and a list with the edges of the bins of each feature
+"""
+def _discretize_sparse(X):
+
+    X = sp.csc_matrix(X)
+    X.sort_indices()
+
+    n_samples, n_features = X.shape
+
+    data    = np.zeros(X.nnz, dtype=np.int64)
+    n_codes = np.zeros(n_features, dtype=int)
+    edges   = list()
+
+    for i in np.arange(n_features):
+
+        start, stop = X.indptr[i], X.indptr[i+1]
+        values      = np.asarray(X.data[start:stop], dtype=float)
+
+        if stop - start < n_samples:
+            codes, edge = _uniform_bins(np.append(values, 0), length=n_samples)
+            zero_code   = codes[-1]
+            codes       = codes[:-1]
+        else:
+            codes, edge = _uniform_bins(values)
+            zero_code   = 0
+
+        n_codes[i] = len(edge) - 1
+        data[start:stop] = (codes - zero_code) % n_codes[i]
+        edges.append(edge)
+
+    data  = data.astype(_compact_dtype(np.max(n_codes, initial=1)))
+    codes = sp.csc_matrix((data, X.indices.copy(), X.indptr.copy()), shape=X.shape)
+
+    return codes, n_codes, edges
+
+
+"""
+Compute the regular miscoding of a block of features
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+y_codes  : integer codes of the target, shape (n_samples)
+y_n_codes: the number of codes of the target
+       
+Returns
+-------
+A numpy array with the regular miscoding of each feature
+"""
+def _miscoding_block(X_codes, X_n_codes, y_codes, y_n_codes):
+
+    n_samples, n_features = X_codes.shape
+
+    miscoding = np.zeros(n_features)
+
+    ldm_y = _count_lengths(np.bincount(y_codes, minlength=y_n_codes), [y_n_codes])[0]
+
+    # Sparse matrices of codes are counted over the values stored
+    if sp.issparse(X_codes):
+        ldm_X  = _feature_lengths(X_codes, X_n_codes)
+        ldm_Xy = _sparse_lengths(X_codes, X_n_codes, y_codes, y_n_codes)
+        return ( ldm_Xy - np.minimum(ldm_X, ldm_y) ) / np.maximum(ldm_X, ldm_y)
+
+    # Features with small contingency tables are counted all together,
+    # in groups of up to 2**23 cells
+    X_n_codes = np.asarray(X_n_codes, dtype=np.int64)
+    dense     = np.flatnonzero(X_n_codes * y_n_codes <= 2**16)
+    sparse    = np.flatnonzero(X_n_codes * y_n_codes >  2**16)
+    groups    = np.cumsum(X_n_codes[dense] * y_n_codes) // 2**23
+
+    for group in np.unique(groups):
+
+        group  = dense[groups == group]
+
+        # Avoid a copy of the codes if all the features are in the group
+        if len(group) == n_features:
+            counts = _contingency_tables(X_codes, X_n_codes, y_codes, y_n_codes)
+        else:
+            counts = _contingency_tables(X_codes[:,group], X_n_codes[group], y_codes, y_n_codes)
+
+        ldm_X  = _count_lengths(np.sum(counts.reshape((-1, y_n_codes)), axis=1), X_n_codes[group])
+        ldm_Xy = _count_lengths(counts, X_n_codes[group] * y_n_codes)
+
+        miscoding[group] = ( ldm_Xy - np.minimum(ldm_X, ldm_y) ) / np.maximum(ldm_X, ldm_y)
+
+    for i in sparse:
+
+        ldm_X  = _codes_length(X_codes[:,i], X_n_codes[i])
+        ldm_Xy = _codes_length(X_codes[:,i], X_n_codes[i], y_codes, y_n_codes)
+
+        miscoding[i] = ( ldm_Xy - min(ldm_X, ldm_y) ) / max(ldm_X, ldm_y)
+
+    return miscoding
+
+
+"""
+Compute the length of every feature, with a single contingency pass
+against a constant
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+       
+Returns
+-------
+A numpy array with the length of each feature
+"""
+def _feature_lengths(X_codes, X_n_codes):
+
+    if sp.issparse(X_codes):
+        return _sparse_lengths(X_codes, X_n_codes, np.zeros(X_codes.shape[0], dtype=np.int64), 1)
+
+    counts = _contingency_tables(X_codes, X_n_codes, np.zeros(X_codes.shape[0], dtype=np.int64), 1)
+
+    return _count_lengths(counts, X_n_codes)
+
+
+"""
+Compute the terms of the optimal code length of a table of frequencies, one
+per cell, with zero for the empty cells
+
+Parameters
+----------
+counts   : array of integers, the frequencies of the values
+n_samples: the total number of values
+
+Returns
+-------
+A numpy array with the length of the values of each cell
+"""
+def _count_terms(counts, n_samples):
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(counts != 0, counts * ( - np.log2(counts / n_samples )), 0)
+
+    return terms
+
+
+"""
+Compute the joint length of the pairs of features (i, j), with i < j,
+of a tile of the matrix of pairs of features.
+
+The joint frequencies are counted over blocks of columns. The codes of a
+block are shifted once, so every feature has its own range of codes, and
+then, for each feature i, a single bincount counts the joint frequencies of
+i with all the features of the block. Pairs with a feature with more than
+2**8 codes are counted one by one, with a sparse count.
+
+If the codes of a target are given, the codes of the feature i are combined
+with the codes of the target, and the same bincount provides the three-way
+joint frequencies of (X_i, y, X_j), and, adding over the target, the joint
+frequencies of (X_i, X_j).
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+rows     : range of the features i of the tile, all of them if None
+cols     : range of the features j of the tile, all of them if None
+y_codes  : the integer codes of the target, or None
+y_n_codes: the number of codes of the target
+       
+Returns
+-------
+A matrix (len(rows) x len(cols)) with the joint length of each pair of
+features with i < j, and zero otherwise, and, if y_codes is given, a second
+matrix with the joint length of each pair of features and the target
+"""
+def _pairwise_lengths(X_codes, X_n_codes, rows=None, cols=None, y_codes=None, y_n_codes=None):
+
+    n_samples, n_features = X_codes.shape
+
+    rows = range(n_features) if rows is None else rows
+    cols = range(n_features) if cols is None else cols
+
+    X_n_codes = np.asarray(X_n_codes, dtype=np.int64)
+    rows_idx  = np.arange(rows.start, rows.stop)
+    cols_idx  = np.arange(cols.start, cols.stop)
+
+    ldm_XX  = np.zeros((len(rows), len(cols)))
+    ldm_XXy = np.zeros((len(rows), len(cols)))
+
+    if y_codes is None:
+        n_y = 1
+        y   = 0
+    else:
+        n_y = int(y_n_codes)
+        y   = np.asarray(y_codes, dtype=np.int64)
+
+    # Features with up to 2**8 codes are counted by blocks
+    narrow_rows = rows_idx[X_n_codes[rows_idx] <= 2**8]
+    narrow_cols = cols_idx[X_n_codes[cols_idx] <= 2**8]
+    wide_cols   = cols_idx[X_n_codes[cols_idx] >  2**8]
+
+    # Small blocks, with tables of about 2**13 cells (times the number of
+    # codes of the target), keep the counts in cache, and the index of a
+    # block is bounded to 2**23 values
+    cells = max(int(np.mean(X_n_codes[narrow_cols]) ** 2), 1) if len(narrow_cols) != 0 else 1
+    step  = max(1, min(2**13 // cells, 2**23 // max(n_samples, 1)))
+    index = np.empty((n_samples, step), dtype=np.int64, order='F')
+
+    # The length of the values of a cell only depends on its frequency
+    table = _count_terms(np.arange(n_samples + 1), n_samples)
+
+    for start in np.arange(0, len(narrow_cols), step):
+
+        chunk   = narrow_cols[start:start+step]
+        n_codes = X_n_codes[chunk]
+        offsets = np.concatenate(([0], np.cumsum(n_codes)))
+        block   = np.asarray(X_codes[:,chunk], dtype=np.int64) + offsets[:-1]
+
+        for i in narrow_rows[narrow_rows < chunk[-1]]:
+
+            # Joint frequencies of i and the features of the block after i
+            first  = np.searchsorted(chunk, i, side='right')
+            size   = offsets[-1] - offsets[first]
+            shift  = (np.asarray(X_codes[:,i], dtype=np.int64) * n_y + y) * size - offsets[first]
+            out    = index[:,:len(chunk)-first]
+            np.add(block[:,first:], shift[:,np.newaxis], out=out)
+            counts = np.bincount(out.ravel(order='K'), minlength=X_n_codes[i] * n_y * size)
+            starts = offsets[first:-1] - offsets[first]
+
+            if y_codes is not None:
+                terms = table[counts]
+                terms = np.sum(terms.reshape((X_n_codes[i] * n_y, size)), axis=0)
+                ldm_XXy[i - rows.start, chunk[first:] - cols.start] = np.add.reduceat(terms, starts)
+                counts = np.sum(counts.reshape((X_n_codes[i], n_y, size)), axis=1)
+
+            terms = table[counts]
+            terms = np.sum(terms.reshape((X_n_codes[i], size)), axis=0)
+            ldm_XX[i - rows.start, chunk[first:] - cols.start] = np.add.reduceat(terms, starts)
+
+    # Pairs with a wide feature are counted one by one
+    for i in rows_idx:
+
+        if X_n_codes[i] > 2**8:
+            others = cols_idx[cols_idx > i]
+        else:
+            others = wide_cols[wide_cols > i]
+
+        for j in others:
+            ldm_XX[i - rows.start, j - cols.start] = _codes_length(X_codes[:,i], X_n_codes[i], X_codes[:,j], X_n_codes[j])
+            if y_codes is not None:
+                count = _joint_count([X_codes[:,i], X_codes[:,j], y], [X_n_codes[i], X_n_codes[j], n_y])
+                ldm_XXy[i - rows.start, j - cols.start] = _count_length(count)
+
+    if y_codes is None:
+        return ldm_XX
+
+    return ldm_XX, ldm_XXy
+
+
+"""
+Compute the regular miscoding of the pairs of features of a tile of the
+matrix of pairs of features (see _pairwise_lengths). In a diagonal tile
+(rows equal to cols) the lower triangle is filled by symmetry.
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+ldm_X    : the length of each feature
+rows     : range of the features i of the tile
+cols     : range of the features j of the tile
+       
+Returns
+-------
+A matrix (len(rows) x len(cols)) with the regular miscodings
+"""
+def _miscoding_tile(X_codes, X_n_codes, ldm_X, rows, cols):
+
+    ldm_XX = _pairwise_lengths(X_codes, X_n_codes, rows, cols)
+
+    ldm_X1 = ldm_X[rows.start:rows.stop, np.newaxis]
+    ldm_X2 = ldm_X[np.newaxis, cols.start:cols.stop]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        miscoding = ( ldm_XX - np.minimum(ldm_X1, ldm_X2) ) / np.maximum(ldm_X1, ldm_X2)
+
+    upper     = np.arange(rows.start, rows.stop)[:,np.newaxis] < np.arange(cols.start, cols.stop)[np.newaxis,:]
+    miscoding = np.where(upper, miscoding, 0)
+
+    if rows == cols:
+        miscoding = miscoding + miscoding.T
+
+    return miscoding
+
+
+"""
+Compute the joint regular miscoding of the target given the pairs of
+features of a tile of the matrix of pairs of features (see
+_pairwise_lengths). In a diagonal tile (rows equal to cols) the lower
+triangle is filled by symmetry, and the main diagonal is one.
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+y_codes  : the integer codes of the target
+y_n_codes: the number of codes of the target
+ldm_y    : the length of the target
+rows     : range of the features i of the tile
+cols     : range of the features j of the tile
+       
+Returns
+-------
+A matrix (len(rows) x len(cols)) with the joint regular miscodings
+"""
+def _redundancy_tile(X_codes, X_n_codes, y_codes, y_n_codes, ldm_y, rows, cols):
+
+    ldm_XX, ldm_XXy = _pairwise_lengths(X_codes, X_n_codes, rows, cols, y_codes, y_n_codes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        miscoding = ( ldm_XXy - np.minimum(ldm_XX, ldm_y) ) / np.maximum(ldm_XX, ldm_y)
+
+    upper     = np.arange(rows.start, rows.stop)[:,np.newaxis] < np.arange(cols.start, cols.stop)[np.newaxis,:]
+    miscoding = np.where(upper, miscoding, 0)
+
+    if rows == cols:
+        miscoding = miscoding + miscoding.T + np.eye(len(rows))
+
+    return miscoding
+
+
+"""
+Compute a tile of the matrix of pairs of features of a sparse matrix of
+codes (see _miscoding_tile and _redundancy_tile). Only the columns of the
+tile are converted into a dense matrix, and the codes of the implicit zeros
+are zero, so the lengths are the same than with the dense codes.
+    
+Parameters
+----------
+function : the function that computes the tile with dense codes
+X_codes  : sparse matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+ldm_X    : the length of each feature, or None if not required by function
+args     : the remaining arguments of function, before rows and cols
+rows     : range of the features i of the tile
+cols     : range of the features j of the tile
+       
+Returns
+-------
+A matrix (len(rows) x len(cols)) computed by function
+"""
+def _sparse_tile(function, X_codes, X_n_codes, ldm_X, args, rows, cols):
+
+    # The rows of the tile are never after its columns
+    if rows == cols:
+        columns = np.arange(rows.start, rows.stop)
+        rows    = cols = range(len(columns))
+    else:
+        columns = np.concatenate((np.arange(rows.start, rows.stop), np.arange(cols.start, cols.stop)))
+        rows    = range(len(rows))
+        cols    = range(len(rows), len(columns))
+
+    dense     = X_codes[:,columns].toarray()
+    X_n_codes = np.asarray(X_n_codes)[columns]
+
+    if ldm_X is not None:
+        args = (ldm_X[columns],) + tuple(args)
+
+    return function(dense, X_n_codes, *args, rows, cols)
+
+
+"""
+Compute min-hash keys of the partitions of the rows defined by the codes of
+each feature, for locality sensitive hashing. For each band, the rows get
+random priorities, and each row is represented by the row of its class with
+the smallest priority. Two features agree in a row with a probability equal
+to the Jaccard similarity of the classes of the row, so features with almost
+the same partition, regardless of the labels of the codes, get the same key
+in many bands. The key of a band combines band_size random rows.
+    
+Parameters
+----------
+X_codes  : matrix of integer codes, shape (n_samples, n_features)
+X_n_codes: the number of codes of each feature
+n_bands  : the number of bands
+band_size: the number of rows combined in the key of a band
+sample   : the number of rows used to compute the keys
+rng      : a numpy RandomState
+       
+Returns
+-------
+A matrix of keys (n_bands x n_features)
+"""
+def _minhash_keys(X_codes, X_n_codes, n_bands, band_size, sample, rng):
+
+    n_samples, n_features = X_codes.shape
+
+    X_n_codes = np.asarray(X_n_codes, dtype=np.int64)
+    rows      = np.sort(sample_without_replacement(n_samples, min(sample, n_samples), random_state=rng))
+    sample    = len(rows)
+
+    priorities = [rng.permutation(sample) for band in np.arange(n_bands)]
+    positions  = [rng.randint(0, sample, size=band_size) for band in np.arange(n_bands)]
+    multiplier = np.uint64(0x9E3779B97F4A7C15)
+
+    keys = np.zeros((n_bands, n_features), dtype=np.uint64)
+
+    # Blocks of features of up to 2**23 codes
+    step = max(1, 2**23 // sample)
+
+    for start in np.arange(0, n_features, step):
+
+        stop    = min(start + step, n_features)
+        offsets = np.concatenate(([0], np.cumsum(X_n_codes[start:stop])))
+        codes   = X_codes[rows, start:stop]
+        if sp.issparse(codes):
+            codes = codes.toarray()
+        codes   = np.asarray(codes, dtype=np.int64) + offsets[:-1]
+        flat    = codes.ravel()
+
+        for band in np.arange(n_bands):
+
+            smallest = np.full(offsets[-1], sample, dtype=np.int64)
+            np.minimum.at(smallest, flat, np.repeat(priorities[band], stop - start))
+
+            for position in positions[band]:
+                keys[band, start:stop] = keys[band, start:stop] * multiplier + smallest[codes[position]].astype(np.uint64)
+
+    return keys
+
+
+"""
+Compute the miscoding of y[t+lag] given x[t] for a list of lags, with the
+codes of the variables computed only once. The frequencies of x[:n-lag] are
+the frequencies of x minus the ones of the removed values, and the joint
+frequencies are counted with a bincount over the shifted views of the codes.
+    
+Parameters
+----------
+x_codes  : integer codes of the attribute, shape (n_samples)
+x_n_codes: the number of codes of the attribute
+y_codes  : integer codes of the target, shape (n_samples)
+y_n_codes: the number of codes of the target
+lags     : the list of lags
+ldm_y    : the length of y[lag:] for each lag
+       
+Returns
+-------
+A numpy array with the regular miscoding of each lag
+"""
+def _lagged_miscoding(x_codes, x_n_codes, y_codes, y_n_codes, lags, ldm_y):
+
+    n_samples = len(x_codes)
+
+    x_count = np.bincount(x_codes, minlength=x_n_codes)
+    dense   = x_n_codes * y_n_codes <= max(n_samples, 2**16)
+
+    miscoding = np.zeros(len(lags))
+
+    for k, lag in enumerate(lags):
+
+        new_x = x_codes[:n_samples-lag]
+        new_y = y_codes[lag:]
+
+        ldm_X = _count_length(x_count - np.bincount(x_codes[n_samples-lag:], minlength=x_n_codes))
+
+        if dense:
+            index  = np.asarray(new_x, dtype=np.int64) * y_n_codes
+            index += new_y
+            ldm_Xy = _count_length(np.bincount(index, minlength=x_n_codes * y_n_codes))
+        else:
+            ldm_Xy = _codes_length(new_x, x_n_codes, new_y, y_n_codes)
+
+        miscoding[k] = ( ldm_Xy - min(ldm_X, ldm_y[k]) ) / max(ldm_X, ldm_y[k])
+
+    return miscoding
+
+
+"""
+Compute the adjusted and partial miscodings given the regular miscoding
+    
+Parameters
+----------
+regular: numpy array with the regular miscoding of each feature
+       
+Returns
+-------
+The adjusted and the partial miscodings, as numpy arrays
+"""
+def _adjusted_partial(regular):
+
+    adjusted = 1 - regular
+
+    if np.sum(adjusted) != 0:
+        adjusted = adjusted / np.sum(adjusted)
+
+    if np.sum(regular) != 0:
+        partial = adjusted - regular / np.sum(regular)
+    else:
+        partial = adjusted
+
+    return adjusted, partial
+
+
+"""
+Compute basic bootstrap confidence intervals. The intervals are extended,
+if needed, so they always contain the point estimate.
+    
+Parameters
+----------
+point: numpy array with the estimate of each variable
+boot : numpy array with the bootstrap estimates, shape (n_bootstrap, n_variables)
+alpha: the confidence level is 1 - alpha
+       
+Returns
+-------
+A numpy array with the lower and upper limits, shape (n_variables, 2)
+"""
+def _bootstrap_intervals(point, boot, alpha):
+
+    quantiles = np.percentile(boot, [100 * (1 - alpha / 2), 100 * alpha / 2], axis=0).T
+    intervals = 2 * point[:,np.newaxis] - quantiles
+
+    intervals[:,0] = np.minimum(intervals[:,0], point)
+    intervals[:,1] = np.maximum(intervals[:,1], point)
+
+    return intervals
+
+
+#
+# Class _CodeStore
+#
+class _CodeStore():
+    """
+    Every column of a dataset, and its target variable, discretized
+    (numeric) or encoded (categorical) only once, and kept as compact
+    integer codes together with the edges of the bins. The store is
+    computed during fit, and shared by the Miscoding, Inaccuracy and
+    Surfeit classes, so code lengths never re-discretize the data.
+    The codes of a sparse dataset are kept as a sparse matrix (see
+    _discretize_sparse).
+    """
+
+    def __init__(self, X, X_isnumeric, y, y_isnumeric, sketch_width=None, n_jobs=None):
+        """
+        Initialization of the class _CodeStore
+        
+        Parameters
+        ----------
+        X          : array-like, shape (n_samples, n_features)
+        X_isnumeric: list with the type of each feature (numeric or not)
+        y          : array-like, shape (n_samples)
+        y_isnumeric: if the target is numeric or not
+        sketch_width: if not None, categorical variables are encoded with
+                      a hashing sketch of this width (see _sketch_codes)
+        n_jobs     : the number of jobs used to encode the features
+        """
+
+        self.X_isnumeric  = X_isnumeric
+        self.y_isnumeric  = y_isnumeric
+        self.sketch_width = sketch_width
+
+        if sp.issparse(X):
+            self.X_codes, self.X_n_codes, self.X_edges = _discretize_sparse(X)
+        else:
+            self.X_codes, self.X_n_codes, self.X_edges = _discretize_matrix(X, X_isnumeric, sketch_width, n_jobs)
+        self.y_codes, self.y_n_codes, self.y_edges = _encode_vector(y, y_isnumeric, sketch_width)
+
+        return None
+
+
+    def take(self, index):
+        """
+        A new store with the codes of the given rows, using the same bins
+        """
+
+        store = copy.copy(self)
+        if sp.issparse(self.X_codes):
+            store.X_codes = sp.csc_matrix(self.X_codes[index])
+        else:
+            store.X_codes = np.asfortranarray(self.X_codes[index])
+        store.y_codes = self.y_codes[index]
+
+        return store
+
+
+    def length_X(self, i, j=None):
+        """
+        Length of the feature i, or the joint length of the features i and j
+        """
+
+        if j is None:
+            return _codes_length(_column(self.X_codes, i), self.X_n_codes[i])
+
+        return _codes_length(_column(self.X_codes, i), self.X_n_codes[i], _column(self.X_codes, j), self.X_n_codes[j])
+
+
+    def length_y(self):
+        """
+        Length of the target variable
+        """
+
+        return _codes_length(self.y_codes, self.y_n_codes)
+
+
+    def length_Xy(self, i):
+        """
+        Joint length of the feature i and the target variable
+        """
+
+        return _codes_length(_column(self.X_codes, i), self.X_n_codes[i], self.y_codes, self.y_n_codes)
+
+
+#
+# Class _Dataset
+#
+class _Dataset():
+    """
+    A training dataset validated only once, together with its code store.
+    The context is created by the Nescience and Auto* classes, and all the
+    components keep a reference to the same arrays instead of their own
+    copies. The arrays are read-only views of the validated ones (frames of
+    mixed features are kept as given), and the attributes cannot be
+    reassigned.
+    """
+
+    def __init__(self, X, y, X_type="numeric", y_type="numeric", n_jobs=None, accept_sparse=False):
+        """
+        Initialization of the class _Dataset
+
+        Parameters
+        ----------
+        X     : array-like, shape (n_samples, n_features)
+        y     : array-like, shape (n_samples)
+        X_type: the type of the features ("numeric", "mixed" or "categorical")
+        y_type: the type of the target ("numeric" or "categorical")
+        n_jobs: the number of jobs used to encode the features
+        accept_sparse: if True, a scipy sparse X is kept as a CSC matrix,
+                       otherwise it is rejected, since the models trained
+                       by the Auto* classes require dense data
+        """
+
+        X_isnumeric = _isnumeric_features(X, X_type)
+        y_isnumeric = (y_type == "numeric")
+
+        # Categorical columns are factorized from the original frame
+        data = X
+
+        # Numpy arrays, including memory mapped and read-only arrays,
+        # are not copied by the validation, and mixed frames are kept
+        # column-wise, not as an object array
+        if isinstance(X, pd.DataFrame) and X_type != "numeric":
+            X, y = _check_frame(X, y)
+        else:
+            X, y = check_X_y(X, y, dtype=None, accept_sparse="csc" if accept_sparse else False)
+
+        if not isinstance(data, pd.DataFrame):
+            data = X
+
+        codes = _CodeStore(data, X_isnumeric, y, y_isnumeric, n_jobs=n_jobs)
+
+        if isinstance(X, np.ndarray):
+            X = X.view()
+            X.flags.writeable = False
+
+        y = y.view()
+        y.flags.writeable = False
+
+        object.__setattr__(self, "X", X)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "X_isnumeric", X_isnumeric)
+        object.__setattr__(self, "y_isnumeric", y_isnumeric)
+        object.__setattr__(self, "codes", codes)
+
+        return None
+
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError("_Dataset is immutable, cannot set {!r}".format(name))
+
+
+#
+# Class Miscoding
+# 
+class Miscoding(BaseEstimator):
+    """
+    Given a dataset X = {x1, ..., xp} composed by p features, and a target
+    variable y, the miscoding of the feature xj measures how difficult is to
+    reconstruct y given xj, and the other way around. We are not only
+    interested in to identify how much information xj contains about y, but
+    also if xj contains additional information that is not related
+    to y (which is a bad thing). Miscoding also takes into account that
+    feature xi might be redundant with respect to feature xj.
+
+    The fastautoml.Miscoding class allow us to compute the relevance of
+    features, the quality of a dataset, and select the optimal subset of
+    features to include in a study
+
+    Example of usage:
+        
+        from fastautoml.fastautoml import Miscoding
+        miscoding = Miscoding()
+        miscoding.fit(X, y)
+        msd = miscoding.miscoding_features()
+    """
+
+    def __init__(self, X_type="numeric", y_type="numeric", redundancy=False, approx=None, sketch_width=2**20,
+                 sample=None, tolerance=0.01, random_state=None, n_jobs=None, top_k=None):
+        """
+        Initialization of the class Miscoding
+        
+        Parameters
+        ----------
+        X_type:     The type of the features, numeric, mixed or categorical
+        y_type:     The type of the target, numeric or categorical
+        redundancy: if "True" takes into account the redundancy between features
+                    to compute the miscoding, if "False" only the miscoding with
+                    respect to the target variable is computed.
+        approx:     if "sketch", the code lengths of categorical variables are
+                    approximated with a hashing sketch, with memory bounded by
+                    sketch_width regardless of the number of distinct values.
+                    The error is at most log2(1 + (D-1) / sketch_width) bits
+                    per sample, being D the number of distinct values.
+                    If None, code lengths are exact.
+        sketch_width: number of counters of the sketch
+        sample:     if not None, the miscoding is estimated from random
+                    samples of rows, starting with this number of rows and
+                    doubling the size until the confidence intervals are
+                    tighter than tolerance, or they fix the ranking of the
+                    features. If None, all the rows are used. The intervals
+                    of the regular, adjusted and partial miscodings are kept
+                    in intervals_, intervals_adjusted_ and intervals_partial_.
+        tolerance:  maximum half-width of the confidence intervals of the
+                    sampled miscodings
+        random_state: seed of the sampling of rows
+        n_jobs:     the number of jobs used to discretize the features and
+                    compute their miscodings, as in joblib (None means 1
+                    unless in a joblib.parallel_backend context, and -1
+                    means all the processors)
+        top_k:      if not None, only the miscodings needed to find the top_k
+                    features with the smallest miscoding are computed, and
+                    the rest of the features get a regular miscoding of 1.
+                    More features can be requested later with top_features.
+                    With sample, redundancy or partial_fit the miscodings
+                    of all the features are computed anyway.
+          
+        """        
+
+        valid_X_types = ("numeric", "mixed", "categorical")
+        valid_y_types = ("numeric", "categorical")
+        valid_approx  = (None, "sketch")
+
+        if X_type not in valid_X_types:
+            raise ValueError("Valid options for 'X_type' are {}. "
+                             "Got vartype={!r} instead."
+                             .format(valid_X_types, X_type))
+
+        if y_type not in valid_y_types:
+            raise ValueError("Valid options for 'y_type' are {}. "
+                             "Got vartype={!r} instead."
+                             .format(valid_y_types, y_type))
+
+        if approx not in valid_approx:
+            raise ValueError("Valid options for 'approx' are {}. "
+                             "Got approx={!r} instead."
+                             .format(valid_approx, approx))
+
+        self.X_type       = X_type
+        self.y_type       = y_type
+        self.redundancy   = redundancy
+        self.approx       = approx
+        self.sketch_width = sketch_width
+        self.sample       = sample
+        self.tolerance    = tolerance
+        self.random_state = random_state
+        self.n_jobs       = n_jobs
+        self.top_k        = top_k
+        
+        return None
+    
+    
+    def fit(self, X, y, codes=None, check_input=True):
+        """
+        Learn empirically the miscoding of the features of X
+        as a representation of y.
+        
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_features)
+            Sample vectors from which to compute miscoding.
+            array-like, numpy or pandas array in case of numerical types
+            pandas array in case of mixed or caregorical types,
+            kept column by column, with the dtype of each column
+            scipy sparse matrix in case of numerical types, the
+            implicit zeros are never materialized
+            
+        y : array-like, shape (n_samples)
+            The target values as numbers or strings.
+
+        codes : _CodeStore, optional
+            The discretized version of X and y shared with other
+            components. If None, it is computed from X and y.
+
+        check_input : boolean, default True
+            Allow to bypass the validation of X and y, when they have
+            been already validated as numpy arrays. X and y are kept
+            without copying them.
+            
+        Returns
+        -------
+        self
+        """
+
+        if codes is None:
+            self.X_isnumeric = _isnumeric_features(X, self.X_type)
+            self.y_isnumeric = (self.y_type == "numeric")
+        else:
+            self.X_isnumeric = codes.X_isnumeric
+            self.y_isnumeric = codes.y_isnumeric
+
+        data = X
+        
+        if check_input and isinstance(X, pd.DataFrame) and self.X_type != "numeric":
+            # Mixed frames are kept column-wise, not as an object array
+            self.X_, self.y_ = _check_frame(X, y)
+        elif check_input:
+            self.X_, self.y_ = check_X_y(X, y, dtype=None, accept_sparse="csc")
+        else:
+            self.X_, self.y_ = X, y
+
+        self.n_features_ = self.X_.shape[1]
+
+        sampled = codes is None and self.sample is not None and self.sample < self.X_.shape[0]
+
+        if sampled and self._fit_sample():
+            if self.top_k is not None:
+                self._init_features_computed()
+            return self
+
+        if codes is None:
+            # Categorical columns are factorized from the original frame
+            if not isinstance(data, pd.DataFrame):
+                data = self.X_
+            sketch_width = self.sketch_width if self.approx == "sketch" else None
+            codes = _CodeStore(data, self.X_isnumeric, self.y_, self.y_isnumeric, sketch_width, self.n_jobs)
+
+        self.codes_ = codes
+
+        if self.redundancy:
+            self.regular_ = self._miscoding_features_joint()
+            if self.top_k is not None:
+                self._init_features_computed()
+        elif self.top_k is not None:
+            self._init_features_top()
+            self.regular_ = self._miscoding_features_top(self.top_k)
+        else:
+            self.regular_ = self._miscoding_features_single()
+
+        self._adjust_miscoding()
+
+        # All the rows were needed, the miscoding is exact
+        if sampled:
+            self.intervals_          = np.column_stack((self.regular_, self.regular_))
+            self.intervals_adjusted_ = np.column_stack((self.adjusted_, self.adjusted_))
+            self.intervals_partial_  = np.column_stack((self.partial_, self.partial_))
+            self.n_samples_used_     = self.X_.shape[0]
+        
+        return self
+
+
+    def partial_fit(self, X, y, classes=None, X_edges=None, y_edges=None):
+        """
+        Learn incrementally the miscoding of the features of X as a
+        representation of y, from a chunk of the dataset.
+
+        The edges of the bins are fixed in the first call, from the first
+        chunk or from X_edges and y_edges. Then, the frequencies of the
+        values of each feature and the target are accumulated chunk by
+        chunk, so memory depends on the number of bins and features, not
+        on the number of samples. Values outside the edges are assigned
+        to the first or last bin.
+
+        Only numeric features are supported.
+        
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_features)
+            A chunk of sample vectors from which to compute miscoding.
+            
+        y : array-like, shape (n_samples)
+            The target values of the chunk as numbers or strings.
+
+        classes : array-like, shape (n_classes)
+            List of all the classes of a categorical target. Required in
+            the first call if y is categorical.
+
+        X_edges : list of arrays, optional
+            The edges of the bins of each feature. Only used in the first
+            call. If None, they are computed from the first chunk.
+
+        y_edges : array, optional
+            The edges of the bins of a numeric target. Only used in the
+            first call. If None, they are computed from the first chunk.
+            
+        Returns
+        -------
+        self
+        """
+
+        if self.X_type != "numeric":
+            raise ValueError("Only X of type 'numeric' is supported by partial_fit. "
+                             "Got X_type={!r} instead."
+                             .format(self.X_type))
+
+        X, y = check_X_y(X, y, dtype=None)
+        X    = X.astype(float)
+
+        first_call = not hasattr(self, "Xy_count_")
+
+        if first_call:
+
+            self.X_isnumeric = [True] * X.shape[1]
+            self.y_isnumeric = (self.y_type == "numeric")
+            self.n_features_ = X.shape[1]
+
+            if X_edges is None:
+                X_edges = [_uniform_bins(X[:,i])[1] for i in np.arange(X.shape[1])]
+
+            if self.y_isnumeric:
+                if y_edges is None:
+                    y_edges = _uniform_bins(y)[1]
+                y_n_codes = len(y_edges) - 1
+            else:
+                if classes is None:
+                    raise ValueError("classes must be passed on the first call "
+                                     "to partial_fit with a categorical y.")
+                y_edges   = np.unique(classes)
+                y_n_codes = len(y_edges)
+
+            self.X_edges_   = [np.asarray(edges, dtype=float) for edges in X_edges]
+            self.X_n_codes_ = np.array([len(edges) - 1 for edges in self.X_edges_])
+            self.y_edges_   = y_edges
+            self.y_n_codes_ = y_n_codes
+
+            self.Xy_count_       = np.zeros((X.shape[1], np.max(self.X_n_codes_), y_n_codes), dtype=np.int64)
+            self.n_samples_seen_ = 0
+
+        elif X.shape[1] != self.Xy_count_.shape[0]:
+            raise ValueError("Number of features {} does not match previous "
+                             "data {}.".format(X.shape[1], self.Xy_count_.shape[0]))
+
+        # Encode the target
+
+        if self.y_isnumeric:
+            y_codes = _uniform_codes(y.astype(float), self.y_edges_)
+        else:
+            y_codes = np.searchsorted(self.y_edges_, y)
+            y_codes = np.minimum(y_codes, self.y_n_codes_ - 1)
+            if not np.all(self.y_edges_[y_codes] == y):
+                raise ValueError("y contains classes not included in classes.")
+
+        # Accumulate the joint frequencies of each feature and the target
+
+        X_codes = np.empty(X.shape, dtype=_compact_dtype(self.Xy_count_.shape[1]), order='F')
+
+        for i in np.arange(X.shape[1]):
+            X_codes[:,i] = _uniform_codes(X[:,i], self.X_edges_[i])
+
+        n_features, n_bins, n_classes = self.Xy_count_.shape
+
+        counts = _contingency_tables(X_codes, [n_bins] * n_features, y_codes, n_classes)
+        self.Xy_count_ += counts.reshape(self.Xy_count_.shape)
+
+        self.n_samples_seen_ = self.n_samples_seen_ + X.shape[0]
+
+        # Compute the miscoding given the accumulated frequencies
+
+        ldm_y  = _count_lengths(np.sum(self.Xy_count_[0], axis=0), [n_classes])[0]
+        ldm_X  = _count_lengths(np.sum(self.Xy_count_, axis=2).ravel(), [n_bins] * n_features)
+        ldm_Xy = _count_lengths(self.Xy_count_.ravel(), [n_bins * n_classes] * n_features)
+
+        self.regular_ = ( ldm_Xy - np.minimum(ldm_X, ldm_y) ) / np.maximum(ldm_X, ldm_y)
+
+        if self.top_k is not None:
+            self._init_features_computed()
+
+        self._adjust_miscoding()
+
+        return self
+
+
+    def miscoding_features(self, mode='adjusted'):
+        """
+        Return the miscoding of the target given the features
+
+        Parameters
+        ----------
+        mode  : the mode of miscoding, possible values are 'regular' for
+                the true miscoding, 'adjusted' for the normalized inverted
+                values, and 'partial' with positive and negative
+                contributions to dataset miscoding.
+            
+        Returns
+        -------
+        Return a numpy array with the miscodings
+        """
+        
+        check_is_fitted(self)
+        
+        if mode == 'regular':
+            return self.regular_
+        elif mode == 'adjusted':
+            return self.adjusted_
+        elif mode == 'partial':
+            return self.partial_
+        else:
+            valid_modes = ('regular', 'adjusted', 'partial')
+            raise ValueError("Valid options for 'mode' are {}. "
+                             "Got mode={!r} instead."
+                            .format(valid_modes, mode))
+
+        return None 
+
+    
+    def cross_miscoding(self, attribute, min_lag=0, max_lag=None, mode='adjusted'):
+        """
+        Return the miscoding of the target given lagged versions of an
+        attribute, that is, of y[t+lag] given x[t], for each lag
+
+        Parameters
+        ----------
+        attribute: the index of the attribute, or None for all of them
+        min_lag  : the first lag
+        max_lag  : the last lag (not included), by default the square root
+                   of the number of samples
+        mode     : the mode of miscoding, possible values are 'regular' for
+                   the true miscoding, 'adjusted' for the normalized inverted
+                   values, and 'partial' with positive and negative
+                   contributions
+            
+        Returns
+        -------
+        Return a numpy array with the miscoding of each lag, or a matrix
+        (n_features x n_lags) if attribute is None
+        """
+
+        self._check_codes()
+
+        valid_modes = ('regular', 'adjusted', 'partial')
+
+        if mode not in valid_modes:
+            raise ValueError("Valid options for 'mode' are {}. "
+                             "Got mode={!r} instead."
+                            .format(valid_modes, mode))
+
+        codes     = self.codes_
+        n_samples = codes.X_codes.shape[0]
+
+        # Use a default value for those lazy programmers
+        if max_lag == None:
+            max_lag = int(np.sqrt(n_samples))
+
+        lags = np.arange(start=min_lag, stop=max_lag)
+
+        # The lengths of y[lag:] are shared by all the attributes
+        y_count = np.bincount(codes.y_codes, minlength=codes.y_n_codes)
+        ldm_y   = np.array([_count_length(y_count - np.bincount(codes.y_codes[:lag], minlength=codes.y_n_codes))
+                            for lag in lags])
+
+        if attribute is None:
+            attributes = np.arange(codes.X_codes.shape[1])
+        else:
+            attributes = [attribute]
+
+        regular = np.zeros((len(attributes), len(lags)))
+
+        for k, attr in enumerate(attributes):
+            regular[k] = _lagged_miscoding(_column(codes.X_codes, attr), codes.X_n_codes[attr],
+                                           codes.y_codes, codes.y_n_codes, lags, ldm_y)
+
+        adjusted = 1 - regular
+        partial  = np.zeros(regular.shape)
+
+        for k in np.arange(len(attributes)):
+
+            if np.sum(adjusted[k]) != 0:
+                adjusted[k] = adjusted[k] / np.sum(adjusted[k])
+
+            if np.sum(regular[k]) != 0:
+                partial[k] = adjusted[k] - regular[k] / np.sum(regular[k])
+            else:
+                partial[k] = adjusted[k]
+
+        if mode == 'regular':
+            result = regular
+        elif mode == 'adjusted':
+            result = adjusted
+        else:
+            result = partial
+
+        if attribute is None:
+            return result
+
+        return result[0]
+
+
+    def miscoding_model(self, model):
+        """
+        Compute the partial joint miscoding of the dataset used by a model
+        
+        Parameters
         ----------
-        mode  : the mode of miscoding, possible values are 'regular' for
-                the true miscoding, 'adjusted' for the normalized inverted
-                values, and 'partial' with positive and negative
-                contributions to dataset miscoding.
-            
+        model : a model of one of the supported classes
+                    
         Returns
         -------
-        Return a numpy array with the miscodings
+        Return the miscoding (float)
+        """
+
+        check_is_fitted(self)
+
+        if isinstance(model, MultinomialNB):
+            subset = self._MultinomialNB(model)
+        elif isinstance(model, DecisionTreeClassifier):
+            subset = self._DecisionTreeClassifier(model)
+        elif isinstance(model, SVC) and model.get_params()['kernel']=='linear':
+            subset = self._LinearSVC(model)
+        elif isinstance(model, SVC) and model.get_params()['kernel']=='poly':
+            subset = self._SVC(model)
+        elif isinstance(model, MLPClassifier):
+            subset = self._MLPClassifier(model)
+        elif isinstance(model, LinearRegression):
+            subset = self._LinearRegression(model)
+        elif isinstance(model, DecisionTreeRegressor):
+            subset = self._DecisionTreeRegressor(model)
+        elif isinstance(model, LinearSVR):
+            subset = self._LinearSVR(model)
+        elif isinstance(model, MLPRegressor):
+            subset = self._MLPRegressor(model)            
+        else:
+            # Rise exception
+            raise NotImplementedError('Model {!r} not supported'
+                                     .format(type(model)))
+
+        return self.miscoding_subset(subset)
+        
+
+    def top_features(self, k):
         """
+        Return the k features with the smallest regular miscoding, that is,
+        the most relevant ones. If the miscoding was fitted with top_k, the
+        miscodings of the features needed are computed now, and kept for
+        later calls.
         
+        Parameters
+        ----------
+        k : the number of features
+        
+        Returns
+        -------
+        Return a numpy array with the indices of the features, sorted by
+        their regular miscoding
+        """
+
         check_is_fitted(self)
+
+        if self.top_k is not None:
+            self.regular_ = self._miscoding_features_top(k)
+            self._adjust_miscoding()
+
+        return np.argsort(self.regular_, kind='stable')[:k]
+
+
+    def miscoding_subset(self, subset):
+        """
+        Compute the partial joint miscoding of a subset of the features
         
-        if mode == 'regular':
-            return self.regular_
-        elif mode == 'adjusted':
-            return self.adjusted_
-        elif mode == 'partial':
-            return self.partial_
-        else:
-            valid_modes = ('regular', 'adjusted', 'partial')
-            raise ValueError("Valid options for 'mode' are {}. "
-                             "Got mode={!r} instead."
-                            .format(valid_modes, mode))
+        Parameters
+        ----------
+        subset : array-like, shape (n_features)
+                 1 if the attribute is in use, 0 otherwise
+        
+        Returns
+        -------
+        Return the miscoding (float)
+        """
 
-        return None 
+        check_is_fitted(self)
 
-    
-    def cross_miscoding(self, attribute, min_lag=0, max_lag=None, mode='adjusted'):
+        return self.miscoding_subsets(np.asarray(subset)[np.newaxis,:])[0]
+
+
+    def miscoding_subsets(self, subsets):
+        """
+        Compute the partial joint miscoding of many subsets of the features
+        at once, with a single matrix-vector product
+        
+        Parameters
+        ----------
+        subsets : array-like, shape (n_subsets, n_features)
+                  1 if the attribute is in use in a subset, 0 otherwise
+        
+        Returns
+        -------
+        Return a numpy array with the miscoding of each subset
+        """
 
         check_is_fitted(self)
 
-        valid_modes = ('regular', 'adjusted', 'partial')
+        # Avoid miscoding greater than 1
+        top_mscd = 1 + np.sum(self.partial_[self.partial_ < 0])
+        miscoding = top_mscd - np.dot(subsets, self.partial_)
+                
+        # Avoid miscoding smaller than zero
+        miscoding = np.maximum(miscoding, 0)
+
+        return miscoding
+
+
+    def features_matrix(self, mode="adjusted", filename=None, tile_size=1024):
+        """
+        Compute a matrix of adjusted miscodings for the features
+
+        The matrix is computed by square tiles of the upper triangle,
+        distributed over n_jobs processes. If a filename is given, the
+        matrix is written into a memory mapped .npy file, and the tiles
+        already computed are recorded in a file with the same name and the
+        extension ".tiles", so a calculation that was interrupted can be
+        resumed by calling again the method with the same filename, mode
+        and tile_size. In the 'adjusted' mode the regular matrix is kept in
+        a file with the extension ".regular", and the adjusted rows are
+        written into filename, so the adjustment can be safely repeated.
+
+        Parameters
+        ----------
+        mode  : the mode of miscoding, possible values are 'regular' for the true miscoding
+                and 'adjusted' for the normalized inverted values
+        filename : the .npy file where to store the matrix, if None the
+                   matrix is kept in memory
+        tile_size: the number of features of the side of a tile
+
+        Returns
+        -------
+        Return the matrix (n_features x n_features) with the miscodings (float),
+        a numpy.memmap if filename is not None
+        """
+
+        self._check_codes()
+        
+        valid_modes = ('regular', 'adjusted')
 
         if mode not in valid_modes:
             raise ValueError("Valid options for 'mode' are {}. "
                              "Got mode={!r} instead."
                             .format(valid_modes, mode))
+
+        n_features = self.codes_.X_codes.shape[1]
+        header     = "shape %d %d tile_size %d mode %s" % (n_features, n_features, tile_size, mode)
+
+        finished   = set()
+        normalized = set()
+
+        if filename is None:
+
+            regular = np.zeros([n_features, n_features])
+
+            if mode == "adjusted":
+                miscoding = np.empty([n_features, n_features])
+
+        else:
+
+            progress = filename + ".tiles"
+            names    = [filename] if mode == "regular" else [filename + ".regular", filename]
+
+            if os.path.exists(progress) and all(os.path.exists(name) for name in names):
+
+                with open(progress) as f:
+                    lines = f.read().splitlines()
+
+                if len(lines) == 0 or lines[0] != header:
+                    raise ValueError("The progress in {!r} is for '{}' but '{}' was expected."
+                                     .format(progress, lines[0] if len(lines) != 0 else "", header))
+
+                for line in lines[1:]:
+                    fields = line.split()
+                    if fields[0] == "adjusted":
+                        normalized.add(int(fields[1]))
+                    else:
+                        finished.add((int(fields[0]), int(fields[1])))
+
+                matrices = [np.lib.format.open_memmap(name, mode='r+') for name in names]
+
+                for name, matrix in zip(names, matrices):
+                    if matrix.shape != (n_features, n_features):
+                        raise ValueError("The matrix in {!r} has shape {} but {} was expected."
+                                         .format(name, matrix.shape, (n_features, n_features)))
+
+            else:
+
+                matrices = [np.lib.format.open_memmap(name, mode='w+', dtype=np.float64,
+                                                      shape=(n_features, n_features))
+                            for name in names]
+
+                with open(progress, 'w') as f:
+                    f.write(header + "\n")
+
+            regular   = matrices[0]
+            miscoding = matrices[-1]
+
+        # Compute the regular matrix
+
+        for rows, cols, tile in self._features_tiles(tile_size, finished):
+
+            regular[rows.start:rows.stop, cols.start:cols.stop] = tile
+            regular[cols.start:cols.stop, rows.start:rows.stop] = tile.T
+
+            if filename is not None:
+                regular.flush()
+                with open(progress, 'a') as f:
+                    f.write("%d %d\n" % (rows.start, cols.start))
+
+        if mode == "regular":
+            return regular
+                
+        # Compute the normalized matrix, by blocks of rows, from the
+        # regular matrix, that is never modified
         
-        lag_mscd = list()
+        for start in np.arange(0, n_features, tile_size):
+
+            if start in normalized:
+                continue
+
+            normalized_rows = 1 - regular[start:start+tile_size]
+            normalized_rows = normalized_rows / np.sum(normalized_rows, axis=1)[:,np.newaxis]
+            miscoding[start:start+tile_size] = normalized_rows
+
+            if filename is not None:
+                miscoding.flush()
+                with open(progress, 'a') as f:
+                    f.write("adjusted %d\n" % start)
+
+        return miscoding
+
+
+    def features_pairs(self, threshold, mode="adjusted", tile_size=1024):
+        """
+        Compute the pairs of highly related features, without keeping in
+        memory the full matrix of miscodings (see features_matrix).
+
+        Parameters
+        ----------
+        threshold: in 'adjusted' mode, the pairs with an adjusted miscoding
+                   greater than threshold are returned, and in 'regular' mode
+                   the pairs with a regular miscoding less than threshold
+        mode     : the mode of miscoding, 'regular' or 'adjusted'
+        tile_size: the number of features of the side of a tile
+
+        Returns
+        -------
+        Three numpy arrays with the rows, the columns and the values of the
+        selected entries of the matrix of miscodings, that can be used to
+        build a scipy.sparse.coo_matrix
+        """
+
+        self._check_codes()
         
-        # Use a default value for those lazy programmers
-        if max_lag == None:
-            max_lag = int(np.sqrt(self.X_.shape[0]))
+        valid_modes = ('regular', 'adjusted')
+
+        if mode not in valid_modes:
+            raise ValueError("Valid options for 'mode' are {}. "
+                             "Got mode={!r} instead."
+                            .format(valid_modes, mode))
+
+        n_features = self.codes_.X_codes.shape[1]
+
+        # An adjusted miscoding 1-m_ij / sum_k 1-m_ik is at most 1-m_ij / 2-m_ij,
+        # since the sum includes m_ii = 0, so only the pairs with a regular
+        # miscoding less than (1-2t) / (1-t) are candidates
+        if mode == "regular":
+            bound = threshold
+        else:
+            bound  = (1 - 2 * threshold) / (1 - threshold) if threshold < 1 else -np.inf
+            totals = np.zeros(n_features)
 
-        for i in np.arange(start=min_lag, stop=max_lag):
+        rows   = list()
+        cols   = list()
+        values = list()
 
-            # Compute lagged vectors
-            new_y = self.y_.copy()
-            new_y = np.roll(new_y, -i)
-            new_y = new_y[:-i]
+        for tile_rows, tile_cols, tile in self._features_tiles(tile_size):
 
-            new_x = self.X_[:,attribute].copy()
-            new_x = new_x[:-i]
+            if mode == "adjusted":
+                totals[tile_rows.start:tile_rows.stop] += np.sum(1 - tile, axis=1)
+                if tile_rows != tile_cols:
+                    totals[tile_cols.start:tile_cols.stop] += np.sum(1 - tile, axis=0)
 
-            ldm_y  = _optimal_code_length(x1=new_y, numeric1=self.y_isnumeric)
-            ldm_X  = _optimal_code_length(x1=new_x, numeric1=self.X_isnumeric[attribute])
-            ldm_Xy = _optimal_code_length(x1=new_x, numeric1=self.X_isnumeric[attribute], x2=new_y, numeric2=self.y_isnumeric)
-                       
-            mscd = ( ldm_Xy - min(ldm_X, ldm_y) ) / max(ldm_X, ldm_y)
-                
-            lag_mscd.append(mscd)
-                
-        regular = np.array(lag_mscd)
+            ii, jj = np.nonzero(tile < bound)
+            ii = ii + tile_rows.start
+            jj = jj + tile_cols.start
+            keep = ii != jj
+
+            rows.append(ii[keep])
+            cols.append(jj[keep])
+            values.append(tile[ii[keep] - tile_rows.start, jj[keep] - tile_cols.start])
+
+            # Lower triangle of the off diagonal tiles
+            if tile_rows != tile_cols:
+                rows.append(jj[keep])
+                cols.append(ii[keep])
+                values.append(values[-1])
+
+        rows   = np.concatenate(rows)   if len(rows) != 0 else np.zeros(0, dtype=int)
+        cols   = np.concatenate(cols)   if len(cols) != 0 else np.zeros(0, dtype=int)
+        values = np.concatenate(values) if len(values) != 0 else np.zeros(0)
+
+        if mode == "adjusted":
+            values = (1 - values) / totals[rows]
+            keep   = values > threshold
+            rows, cols, values = rows[keep], cols[keep], values[keep]
+
+        order = np.lexsort((cols, rows))
+
+        return rows[order], cols[order], values[order]
+
+
+    def redundant_pairs(self, threshold, n_bands=48, band_size=3, sample=2048):
+        """
+        Find the pairs of features with a regular miscoding less than
+        threshold, without computing the miscoding of all the pairs.
+
+        Candidate pairs are generated with locality sensitive hashing over
+        min-hash keys of the discretized features (features that define
+        almost the same partition of the samples share a key in some band),
+        and only the candidates are verified with the exact miscoding. The
+        result is approximate: a redundant pair is missed if it does not
+        share any key, and more bands, or smaller bands, increase recall at
+        the cost of more candidates. The keys are computed with random_state.
+
+        Parameters
+        ----------
+        threshold: the maximum regular miscoding of the pairs
+        n_bands  : the number of bands of keys
+        band_size: the number of samples combined in each key
+        sample   : the number of samples used to compute the keys
+
+        Returns
+        -------
+        Three numpy arrays with the rows, the columns and the values of the
+        selected entries of the matrix of regular miscodings (see
+        features_pairs)
+        """
+
+        self._check_codes()
+
+        codes      = self.codes_
+        n_features = codes.X_codes.shape[1]
+        rng        = check_random_state(self.random_state)
+
+        keys = _minhash_keys(codes.X_codes, codes.X_n_codes, n_bands, band_size, sample, rng)
+
+        # Candidates are the pairs of features with the same key in a band
+        candidates = list()
+
+        for band in np.arange(n_bands):
+
+            order  = np.argsort(keys[band], kind='stable')
+            bounds = np.flatnonzero(np.diff(keys[band, order])) + 1
+
+            for group in np.split(order, bounds):
+                if len(group) > 1:
+                    group = np.sort(group)
+                    ii, jj = np.triu_indices(len(group), 1)
+                    candidates.append(group[ii] * n_features + group[jj])
+
+        candidates = np.unique(np.concatenate(candidates)) if len(candidates) != 0 else np.zeros(0, dtype=int)
+
+        # Exact miscoding of the candidates, all the candidates of a
+        # feature i are counted at once
+        X_n_codes = np.asarray(codes.X_n_codes, dtype=np.int64)
+        ldm_X     = _feature_lengths(codes.X_codes, X_n_codes)
+        ldm_X1X2  = np.zeros(len(candidates))
+
+        ii, jj = np.divmod(candidates, n_features)
+        bounds = np.flatnonzero(np.diff(ii)) + 1
+
+        for pairs in np.split(np.arange(len(candidates)), bounds):
+
+            if len(pairs) == 0:
+                continue
+
+            i   = ii[pairs[0]]
+            X_i = codes.X_codes[:,i]
+            X_j = codes.X_codes[:,jj[pairs]]
+
+            # Only the columns of the candidates of i are dense
+            if sp.issparse(codes.X_codes):
+                X_i = X_i.toarray().ravel()
+                X_j = X_j.toarray()
+
+            small  = X_n_codes[jj[pairs]] * X_n_codes[i] <= 2**16
+            dense  = pairs[small]
+            sparse = np.flatnonzero(~small)
+
+            if len(dense) != 0:
+                counts = _contingency_tables(X_j[:,small], X_n_codes[jj[dense]], X_i, X_n_codes[i])
+                ldm_X1X2[dense] = _count_lengths(counts, X_n_codes[jj[dense]] * X_n_codes[i])
+
+            for k in sparse:
+                ldm_X1X2[pairs[k]] = _codes_length(X_i, X_n_codes[i], X_j[:,k], X_n_codes[jj[pairs[k]]])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = ( ldm_X1X2 - np.minimum(ldm_X[ii], ldm_X[jj]) ) / np.maximum(ldm_X[ii], ldm_X[jj])
+
+        keep   = values < threshold
+        ii, jj = ii[keep], jj[keep]
+        values = values[keep]
+
+        rows   = np.concatenate((ii, jj))
+        cols   = np.concatenate((jj, ii))
+        values = np.concatenate((values, values))
+        order  = np.lexsort((cols, rows))
+
+        return rows[order], cols[order], values[order]
+
+
+    """
+    Check that the codes of the samples are available, since they are not
+    kept when the miscoding was fitted only with partial_fit
+    """
+    def _check_codes(self):
+
+        check_is_fitted(self)
+        check_is_fitted(self, "codes_",
+                        msg="This %(name)s instance was fitted with partial_fit, and the samples "
+                            "are not kept. Call 'fit' with the whole dataset before using this method.")
+
+        return None
+
+
+    """
+    Compute the tiles of the upper triangle of the matrix of regular
+    miscodings of the features, in parallel with n_jobs processes
+
+    Parameters
+    ----------
+    tile_size: the number of features of the side of a tile
+    finished : set with the (row, column) of the first feature of the
+               tiles that do not need to be computed
+    target   : if True, compute the joint regular miscodings of the target
+               given the pairs of features instead
+    codes    : the _CodeStore to use, by default the one computed during fit
+
+    Returns
+    -------
+    A generator of the range of rows, the range of columns, and the
+    regular miscodings of each tile
+    """
+    def _features_tiles(self, tile_size, finished=(), target=False, codes=None):
+
+        if codes is None:
+            codes = self.codes_
+
+        n_features = codes.X_codes.shape[1]
+
+        if target:
+            function = _redundancy_tile
+            args     = (codes.X_codes, codes.X_n_codes, codes.y_codes, codes.y_n_codes, codes.length_y())
+        else:
+            # The length of each feature is computed only once
+            function = _miscoding_tile
+            args     = (codes.X_codes, codes.X_n_codes, _feature_lengths(codes.X_codes, codes.X_n_codes))
+
+        # Only the columns of a tile of sparse codes are dense
+        if sp.issparse(codes.X_codes):
+            if target:
+                args = (function, codes.X_codes, codes.X_n_codes, None, args[2:])
+            else:
+                args = (function, codes.X_codes, codes.X_n_codes, args[2], ())
+            function = _sparse_tile
+
+        tiles = [(range(i, min(i + tile_size, n_features)), range(j, min(j + tile_size, n_features)))
+                 for i in np.arange(0, n_features, tile_size)
+                 for j in np.arange(i, n_features, tile_size)
+                 if (i, j) not in finished]
+
+        if effective_n_jobs(self.n_jobs) == 1:
+            results = (function(*args, rows, cols) for rows, cols in tiles)
+        else:
+            results = Parallel(n_jobs=self.n_jobs, return_as="generator")(
+                delayed(function)(*args, rows, cols) for rows, cols in tiles)
+
+        for (rows, cols), tile in zip(tiles, results):
+            yield rows, cols, tile
+
+
+    """
+    Compute the adjusted and partial miscodings given the regular miscoding
+    """
+    def _adjust_miscoding(self):
+
+        self.adjusted_, self.partial_ = _adjusted_partial(self.regular_)
+
+        return None
+
+
+    """
+    Estimate the miscoding from progressively larger samples of rows.
+    Only the rows of the sample are discretized. The confidence intervals
+    of the regular, adjusted and partial miscodings are computed with a
+    basic bootstrap over the codes of the sample, and the size of the
+    sample is doubled until all the intervals of the regular miscoding
+    have a half-width smaller than the tolerance, or they do not overlap
+    (the ranking of the features is fixed).
+
+    Return False, without fitting anything, if all the rows are needed,
+    so the exact miscoding has to be computed instead.
+    """
+    def _fit_sample(self, n_bootstrap=30, alpha=0.05):
 
-        if mode == 'regular':
+        rng          = check_random_state(self.random_state)
+        n_samples    = self.X_.shape[0]
+        sketch_width = self.sketch_width if self.approx == "sketch" else None
 
-            return regular
+        # The joint miscoding if redundancy is taken into account
+        if self.redundancy:
+            miscoding = self._miscoding_features_joint
+        else:
+            miscoding = self._miscoding_features_single
 
-        elif mode == 'adjusted':
+        # Nested samples without replacement, the prefixes of a permutation
+        permutation = rng.permutation(n_samples)
+        size        = self.sample
 
-            adjusted = 1 - regular
-            if np.sum(adjusted) != 0:
-                adjusted = adjusted / np.sum(adjusted)
-            
-            return adjusted
+        while size < n_samples:
 
-        elif mode == 'partial':
+            rows = np.sort(permutation[:size])
 
-            if np.sum(regular) != 0:
-                partial  = adjusted - regular / np.sum(regular)
+            if isinstance(self.X_, pd.DataFrame):
+                X_rows = self.X_.iloc[rows]
             else:
-                partial  = adjusted
+                X_rows = self.X_[rows]
 
-            return partial
+            codes   = _CodeStore(X_rows, self.X_isnumeric, self.y_[rows], self.y_isnumeric, sketch_width,
+                                 self.n_jobs)
+            regular = miscoding(codes)
 
-        else:
+            boot = np.array([miscoding(codes.take(rng.randint(0, size, size=size)))
+                             for b in np.arange(n_bootstrap)])
+            intervals = np.clip(_bootstrap_intervals(regular, boot, alpha), 0, 1)
 
-            raise ValueError("Valid options for 'mode' are {}. "
-                             "Got mode={!r} instead."
-                            .format(valid_modes, mode))
+            # Ranking is fixed if consecutive intervals do not overlap
+            order  = np.argsort(regular)
+            ranked = np.all(intervals[order[:-1], 1] < intervals[order[1:], 0])
+            tight  = np.all((intervals[:,1] - intervals[:,0]) / 2 <= self.tolerance)
 
+            if tight or ranked:
 
-    def miscoding_model(self, model):
-        """
-        Compute the partial joint miscoding of the dataset used by a model
-        
-        Parameters
-        ----------
-        model : a model of one of the supported classes
-                    
-        Returns
-        -------
-        Return the miscoding (float)
-        """
+                self.codes_          = codes
+                self.regular_        = regular
+                self.intervals_      = intervals
+                self.n_samples_used_ = size
 
-        check_is_fitted(self)
+                self._adjust_miscoding()
 
-        if isinstance(model, MultinomialNB):
-            subset = self._MultinomialNB(model)
-        elif isinstance(model, DecisionTreeClassifier):
-            subset = self._DecisionTreeClassifier(model)
-        elif isinstance(model, SVC) and model.get_params()['kernel']=='linear':
-            subset = self._LinearSVC(model)
-        elif isinstance(model, SVC) and model.get_params()['kernel']=='poly':
-            subset = self._SVC(model)
-        elif isinstance(model, MLPClassifier):
-            subset = self._MLPClassifier(model)
-        elif isinstance(model, LinearRegression):
-            subset = self._LinearRegression(model)
-        elif isinstance(model, DecisionTreeRegressor):
-            subset = self._DecisionTreeRegressor(model)
-        elif isinstance(model, LinearSVR):
-            subset = self._LinearSVR(model)
-        elif isinstance(model, MLPRegressor):
-            subset = self._MLPRegressor(model)            
-        else:
-            # Rise exception
-            raise NotImplementedError('Model {!r} not supported'
-                                     .format(type(model)))
+                boot_adjusted, boot_partial = zip(*[_adjusted_partial(regular) for regular in boot])
+                self.intervals_adjusted_ = _bootstrap_intervals(self.adjusted_, np.array(boot_adjusted), alpha)
+                self.intervals_partial_  = _bootstrap_intervals(self.partial_, np.array(boot_partial), alpha)
 
-        return self.miscoding_subset(subset)
-        
+                return True
 
-    def miscoding_subset(self, subset):
-        """
-        Compute the partial joint miscoding of a subset of the features
-        
-        Parameters
-        ----------
-        subset : array-like, shape (n_features)
-                 1 if the attribute is in use, 0 otherwise
-        
-        Returns
-        -------
-        Return the miscoding (float)
-        """
+            size = 2 * size
 
-        check_is_fitted(self)
+        return False
 
-        # Avoid miscoding greater than 1
-        top_mscd = 1 + np.sum(self.partial_[self.partial_ < 0])
-        miscoding = top_mscd - np.dot(subset, self.partial_)
-                
-        # Avoid miscoding smaller than zero
-        if miscoding < 0:
-            miscoding = 0
 
-        return miscoding
+    """
+    Return the regular miscoding of the target given the features
+    
+    Parameters
+    ----------
+    codes: the _CodeStore to use, by default the one computed during fit
+            
+    Returns
+    -------
+    Return a numpy array with the regular miscodings
+    """
+    def _miscoding_features_single(self, codes=None):
 
+        if codes is None:
+            codes = self.codes_
 
-    def features_matrix(self, mode="adjusted"):
-        """
-        Compute a matrix of adjusted miscodings for the features
+        if effective_n_jobs(self.n_jobs) == 1:
+            return _miscoding_block(codes.X_codes, codes.X_n_codes, codes.y_codes, codes.y_n_codes)
 
-        Parameters
-        ----------
-        mode  : the mode of miscoding, possible values are 'regular' for the true miscoding
-                and 'adjusted' for the normalized inverted values
+        # Blocks of features in parallel, results are kept in order
+        blocks    = _feature_blocks(codes.X_codes.shape[1], self.n_jobs)
+        miscoding = Parallel(n_jobs=self.n_jobs)(
+            delayed(_miscoding_block)(codes.X_codes[:,block], codes.X_n_codes[block], codes.y_codes, codes.y_n_codes)
+            for block in blocks)
 
-        Returns
-        -------
-        Return the matrix (n_features x n_features) with the miscodings (float)
-        """
+        return np.concatenate(miscoding)
 
-        check_is_fitted(self)
-        
-        valid_modes = ('regular', 'adjusted')
 
-        if mode not in valid_modes:
-            raise ValueError("Valid options for 'mode' are {}. "
-                             "Got mode={!r} instead."
-                            .format(valid_modes, mode))
+    """
+    Initialize the search of the features with the smallest miscoding:
+    no miscoding is computed yet, and each feature gets a lower bound of its
+    miscoding given by its length and the length of the target alone. Since
+    l(x,y) >= max(l(x), l(y)), the miscoding is at least
+    1 - min(l(x), l(y)) / max(l(x), l(y)).
+    """
+    def _init_features_top(self):
 
-        miscoding = np.zeros([self.X_.shape[1], self.X_.shape[1]])
+        codes = self.codes_
+        ldm_X = _feature_lengths(codes.X_codes, codes.X_n_codes)
+        ldm_y = codes.length_y()
 
-        # Compute the regular matrix
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = 1 - np.minimum(ldm_X, ldm_y) / np.maximum(ldm_X, ldm_y)
 
-        for i in np.arange(self.X_.shape[1]-1):
-            
-            ldm_X1 = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i])
+        self.bounds_   = np.where(np.isnan(bounds), 0, bounds)
+        self.computed_ = np.zeros(len(ldm_X), dtype=bool)
+        self.regular_  = np.ones(len(ldm_X))
 
-            for j in np.arange(i+1, self.X_.shape[1]):
+        return None
 
-                ldm_X2   = _optimal_code_length(x1=self.X_[:,j], numeric1=self.X_isnumeric[j])
-                ldm_X1X2 = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i], x2=self.X_[:,j], numeric2=self.X_isnumeric[j])
-                       
-                mscd = ( ldm_X1X2 - min(ldm_X1, ldm_X2) ) / max(ldm_X1, ldm_X2)
-                
-                miscoding[i, j] = mscd
-                miscoding[j, i] = mscd
 
-        if mode == "regular":
-            return miscoding
-                
-        # Compute the normalized matrix
-        
-        normalized = np.zeros([self.X_.shape[1], self.X_.shape[1]])
-        
-        for i in np.arange(self.X_.shape[1]):
+    """
+    Initialize the search of the features with the smallest miscoding when
+    the miscodings of all the features are already computed (with sample,
+    redundancy or partial_fit), so top_features only sorts them
+    """
+    def _init_features_computed(self):
 
-            normalized[i,:] = 1 - miscoding[i,:]
-            normalized[i,:] = normalized[i,:] / np.sum(normalized[i,:])
+        self.bounds_   = np.zeros(len(self.regular_))
+        self.computed_ = np.ones(len(self.regular_), dtype=bool)
 
-        return normalized
+        return None
 
 
     """
-    Return the regular miscoding of the target given the features
+    Compute the regular miscoding of the features, in batches sorted by the
+    lower bound of their miscoding, until the k smallest miscodings are not
+    greater than the bound of the features not computed yet. The features
+    not computed get a miscoding of 1. The size of the batches grows with
+    the number of features already computed.
+
+    Parameters
+    ----------
+    k         : the number of features with the smallest miscoding
+    batch_size: the minimum number of features of a batch
             
     Returns
     -------
     Return a numpy array with the regular miscodings
     """
-    def _miscoding_features_single(self):
-                 
-        miscoding = list()
-                
-        ldm_y = _optimal_code_length(x1=self.y_, numeric1=self.y_isnumeric)
+    def _miscoding_features_top(self, k, batch_size=256):
 
-        for i in np.arange(self.X_.shape[1]):
-                        
-            ldm_X  = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i])
-            ldm_Xy = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i], x2=self.y_, numeric2=self.y_isnumeric)
-                       
-            mscd = ( ldm_Xy - min(ldm_X, ldm_y) ) / max(ldm_X, ldm_y)
-                
-            miscoding.append(mscd)
-                
-        miscoding = np.array(miscoding)
+        codes   = self.codes_
+        k       = min(k, len(self.regular_))
+        order   = np.argsort(self.bounds_, kind='stable')
+        pending = order[~self.computed_[order]]
 
-        return miscoding
+        while len(pending) != 0:
+
+            computed = self.regular_[self.computed_]
+            if len(computed) >= k and np.partition(computed, k-1)[k-1] <= self.bounds_[pending[0]]:
+                break
+
+            batch   = np.sort(pending[:max(batch_size, k, len(computed))])
+            pending = pending[len(batch):]
+
+            self.regular_[batch]  = _miscoding_block(codes.X_codes[:,batch], codes.X_n_codes[batch],
+                                                     codes.y_codes, codes.y_n_codes)
+            self.computed_[batch] = True
+
+        return self.regular_
 
 
     """
     Return the joint regular miscoding of the target given pairs features
+
+    The features are selected greedily. The first two are the pair with the
+    smallest joint miscoding, and then, at each step, the feature with the
+    smallest average joint miscoding with the features already selected.
+    The sums of the joint miscodings of each candidate with the selected
+    features are updated as features are added.
+
+    Parameters
+    ----------
+    codes    : the _CodeStore to use, by default the one computed during fit
+    tile_size: the number of features of the side of a tile
             
     Returns
     -------
     Return a numpy array with the regular miscodings
     """
-    # TODO: Not supported yet! Review.
-    def _miscoding_features_joint(self):
+    def _miscoding_features_joint(self, codes=None, tile_size=1024):
+
+        if codes is None:
+            codes = self.codes_
 
         # Compute non-redundant miscoding
-        mscd = self._miscoding_features_single()
+        mscd = self._miscoding_features_single(codes)
 
-        if self.X_.shape[1] == 1:
+        n_features = codes.X_codes.shape[1]
+
+        if n_features == 1:
             # With one single attribute we cannot compute the joint miscoding
             return mscd
 
@@ -607,40 +2752,30 @@ class Miscoding(BaseEstimator):
         # Compute the joint miscoding matrix
         #         
                
-        red_matrix = np.ones([self.X_.shape[1], self.X_.shape[1]])
+        red_matrix = np.ones([n_features, n_features])
 
-        ldm_y = _optimal_code_length(x1=self.y_, numeric1=self.y_isnumeric)
+        for rows, cols, tile in self._features_tiles(tile_size, target=True, codes=codes):
+            red_matrix[rows.start:rows.stop, cols.start:cols.stop] = tile
+            if rows != cols:
+                red_matrix[cols.start:cols.stop, rows.start:rows.stop] = tile.T
 
-        for i in np.arange(self.X_.shape[1]-1):
-                        
-            for j in np.arange(i+1, self.X_.shape[1]):
-                
-                ldm_X1X2  = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i], x2=self.X_[:,j], numeric2=self.X_isnumeric[j])
-                ldm_X1X2Y = _optimal_code_length(x1=self.X_[:,i], numeric1=self.X_isnumeric[i], x2=self.y_, numeric2=self.y_isnumeric)
-                
-                tmp = ( ldm_X1X2Y - min(ldm_X1X2, ldm_y) ) / max(ldm_X1X2, ldm_y)
-                                
-                red_matrix[i, j] = tmp
-                red_matrix[j, i] = tmp
-        
         #
         # Compute the joint miscoding 
         #
 
-        viu       = np.zeros(self.X_.shape[1], dtype=np.int8)
-        miscoding = np.zeros(self.X_.shape[1])
+        viu       = np.zeros(n_features, dtype=bool)
+        miscoding = np.zeros(n_features)
 
-        # Select the first two variables with smaller joint miscoding
-        
+        # Select the first two variables with smaller joint miscoding,
+        # outside of the main diagonal
+
+        np.fill_diagonal(red_matrix, np.inf)
         loc1, loc2 = np.unravel_index(np.argmin(red_matrix, axis=None), red_matrix.shape)
         jmscd1 = jmscd2 = red_matrix[loc1, loc2]
+        np.fill_diagonal(red_matrix, 1)
 
-        # Avoid the case of selecting a member of the main diagonal
-        if loc1 == loc2:
-            loc2 = loc2 + 1
-        
-        viu[loc1] = 1
-        viu[loc2] = 1
+        viu[loc1] = True
+        viu[loc2] = True
 
         # Scale down one of them
                 
@@ -656,22 +2791,19 @@ class Miscoding(BaseEstimator):
         miscoding[loc2] = jmscd2
  
         # Iterate over the number of features
+
+        sums = red_matrix[loc1] + red_matrix[loc2]
         
-        tmp = np.ones(self.X_.shape[1]) * np.inf
-        
-        for i in np.arange(2, self.X_.shape[1]):
+        for i in np.arange(2, n_features):
 
-            for j in np.arange(self.X_.shape[1]):
-            
-                if viu[j] == 1:
-                    continue
+            tmp = sums / i
+            tmp[viu] = np.inf
 
-                tmp[j] = (1 / np.sum(viu)) * np.sum(red_matrix[np.where(viu == 1), j])
-                            
-            viu[np.argmin(tmp)] = 1
-            miscoding[np.argmin(tmp)] = np.min(tmp)
+            new = np.argmin(tmp)
+            viu[new] = True
+            miscoding[new] = tmp[new]
 
-            tmp = np.ones(self.X_.shape[1]) * np.inf
+            sums += red_matrix[new]
         
         return miscoding
 
@@ -684,7 +2816,7 @@ class Miscoding(BaseEstimator):
     def _MultinomialNB(self, estimator):
 
         # All the attributes are in use
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
     
@@ -696,7 +2828,7 @@ class Miscoding(BaseEstimator):
     """
     def _DecisionTreeClassifier(self, estimator):
 
-        attr_in_use = np.zeros(self.X_.shape[1], dtype=int)
+        attr_in_use = np.zeros(self.n_features_, dtype=int)
         features = set(estimator.tree_.feature[estimator.tree_.feature >= 0])
         for i in features:
             attr_in_use[i] = 1
@@ -712,7 +2844,7 @@ class Miscoding(BaseEstimator):
     def _LinearSVC(self, estimator):
 
         # All the attributes are in use
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -725,7 +2857,7 @@ class Miscoding(BaseEstimator):
     def _SVC(self, estimator):
 
         # All the attributes are in use
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -737,7 +2869,7 @@ class Miscoding(BaseEstimator):
     """
     def _MLPClassifier(self, estimator):
 
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -749,7 +2881,7 @@ class Miscoding(BaseEstimator):
     """
     def _LinearRegression(self, estimator):
         
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -761,7 +2893,7 @@ class Miscoding(BaseEstimator):
     """
     def _DecisionTreeRegressor(self, estimator):
         
-        attr_in_use = np.zeros(self.X_.shape[1], dtype=int)
+        attr_in_use = np.zeros(self.n_features_, dtype=int)
         features = set(estimator.tree_.feature[estimator.tree_.feature >= 0])
         for i in features:
             attr_in_use[i] = 1
@@ -776,7 +2908,7 @@ class Miscoding(BaseEstimator):
     """
     def _LinearSVR(self, estimator):
 
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -787,7 +2919,7 @@ class Miscoding(BaseEstimator):
     """
     def _MLPRegressor(self, estimator):
 
-        attr_in_use = np.ones(self.X_.shape[1], dtype=int)
+        attr_in_use = np.ones(self.n_features_, dtype=int)
             
         return attr_in_use
 
@@ -817,23 +2949,40 @@ class Inaccuracy(BaseEstimator):
 
     """    
 
-    def __init__(self, y_type="numeric"):
+    def __init__(self, y_type="numeric", approx=None, sketch_width=2**20, chunk_size=None):
         """
         Initialization of the class Inaccuracy
         
         Parameters
         ----------
         y_type:     The type of the target, numeric or categorical
+        approx:     if "sketch", the code lengths of a categorical target and
+                    its predictions are approximated with a hashing sketch,
+                    with memory bounded by sketch_width regardless of the
+                    number of classes. If None, code lengths are exact.
+        sketch_width: number of counters of the sketch
+        chunk_size: if not None, models predict the samples in blocks of
+                    this number of rows, and only the frequencies of the
+                    predictions and the target are kept in memory
         """        
 
         valid_y_types = ("numeric", "categorical")
+        valid_approx  = (None, "sketch")
 
         if y_type not in valid_y_types:
             raise ValueError("Valid options for 'y_type' are {}. "
                              "Got vartype={!r} instead."
                              .format(valid_y_types, y_type))
 
-        self.y_type = y_type
+        if approx not in valid_approx:
+            raise ValueError("Valid options for 'approx' are {}. "
+                             "Got approx={!r} instead."
+                             .format(valid_approx, approx))
+
+        self.y_type       = y_type
+        self.approx       = approx
+        self.sketch_width = sketch_width
+        self.chunk_size   = chunk_size
 
         if y_type == "numeric":
             self.y_isnumeric = True
@@ -843,7 +2992,7 @@ class Inaccuracy(BaseEstimator):
         return None
     
     
-    def fit(self, X, y):
+    def fit(self, X, y, codes=None, check_input=True):
         """
         Fit the inaccuracy with a dataset
         
@@ -851,26 +3000,49 @@ class Inaccuracy(BaseEstimator):
         ----------
         X : array-like, shape (n_samples, n_features)
             Sample vectors from which models have been trained.
+            If None, X is not kept, and the samples have to be
+            given to inaccuracy_model.
             
         y : array-like, shape (n_samples)
             Continuous and categorical variables are supported
             if the trained model support them.
+
+        codes : _CodeStore, optional
+            The discretized version of X and y shared with other
+            components. If None, y is discretized here.
+
+        check_input : boolean, default True
+            Allow to bypass the validation of X and y, when they have
+            been already validated as numpy arrays. X and y are kept
+            without copying them.
             
         Returns
         -------
         self
         """
         
-        self.X_, self.y_ = check_X_y(X, y, dtype=None)
+        if check_input and X is None:
+            self.X_, self.y_ = None, column_or_1d(y, warn=True)
+        elif check_input:
+            self.X_, self.y_ = check_X_y(X, y, dtype=None, accept_sparse="csc")
+        else:
+            self.X_, self.y_ = X, y
+
+        self.y_ = np.asarray(self.y_)
 
-        self.y_ = np.array(self.y_)
+        if codes is None:
+            self.sketch_width_ = self.sketch_width if self.approx == "sketch" else None
+            self.y_codes_, self.y_n_codes_, self.y_edges_ = _encode_vector(self.y_, self.y_isnumeric, self.sketch_width_)
+        else:
+            self.sketch_width_ = codes.sketch_width
+            self.y_codes_, self.y_n_codes_, self.y_edges_ = codes.y_codes, codes.y_n_codes, codes.y_edges
                 
-        self.len_y = _optimal_code_length(x1=self.y_, numeric1=self.y_isnumeric)
+        self.len_y = _codes_length(self.y_codes_, self.y_n_codes_)
         
         return self
 
 
-    def inaccuracy_model(self, model):
+    def inaccuracy_model(self, model, X=None):
         """
         Compute the inaccuracy of a model
 
@@ -878,19 +3050,35 @@ class Inaccuracy(BaseEstimator):
         ----------       
         model : a trained model with a predict() method
 
+        X     : array-like, shape (n_samples, n_features), or an
+                iterable of blocks of consecutive rows, optional
+                The samples of y, if they were not kept during fit.
+                Arrays are predicted in blocks of chunk_size rows,
+                if chunk_size is not None.
+
         Returns
         -------         
         Return the inaccuracy (float)
         """        
         
         check_is_fitted(self)
-        
-        Pred      = model.predict(self.X_)
-        len_pred  = _optimal_code_length(x1=Pred, numeric1=self.y_isnumeric)
-        len_joint = _optimal_code_length(x1=Pred, numeric1=self.y_isnumeric, x2=self.y_, numeric2=self.y_isnumeric)
-        inacc     = ( len_joint - min(self.len_y, len_pred) ) / max(self.len_y, len_pred)
 
-        return inacc 
+        if X is None:
+            X = self.X_
+
+        if X is None:
+            raise ValueError("X was not kept during fit, "
+                             "the samples have to be given to inaccuracy_model.")
+
+        if not hasattr(X, "shape"):
+            chunks = (model.predict(block) for block in X)
+        elif self.chunk_size is None:
+            chunks = [model.predict(X)]
+        else:
+            chunks = (model.predict(X[start:start+self.chunk_size])
+                      for start in np.arange(0, X.shape[0], self.chunk_size))
+
+        return self._inaccuracy_chunks(chunks)
 
     
     def inaccuracy_predictions(self, predictions):
@@ -900,7 +3088,8 @@ class Inaccuracy(BaseEstimator):
         Parameters
         ----------       
         pred : array-like, shape (n_samples)
-               The list of predicted values
+               The list of predicted values, coded with the bins
+               of the target computed during fit
 
         Returns
         -------                
@@ -909,13 +3098,151 @@ class Inaccuracy(BaseEstimator):
         
         check_is_fitted(self)
 
-        pred = np.array(predictions)
-        
-        len_pred  = _optimal_code_length(x1=pred, numeric1=self.y_isnumeric)
-        len_joint = _optimal_code_length(x1=pred, numeric1=self.y_isnumeric, x2=self.y_, numeric2=self.y_isnumeric)
+        return self._inaccuracy_chunks([predictions])
+
+
+    def _inaccuracy_chunks(self, chunks):
+        """
+        Compute the inaccuracy of the predictions given as consecutive
+        blocks of rows. The predictions are coded with the bins, or the
+        categories, of the target, extended with the new categories found
+        in each block, and only the frequencies of each pair of codes are
+        kept: a contingency table (confusion matrix) while it is small,
+        or the pairs found otherwise.
+        """
+
+        n_samples = len(self.y_codes_)
+        y_n_codes = self.y_n_codes_
+        y_codes   = np.asarray(self.y_codes_, dtype=np.int64)
+        edges     = self.y_edges_
+
+        table  = np.zeros(0, dtype=np.int64)
+        keys   = None
+        counts = None
+        start  = 0
+
+        for pred in chunks:
+
+            pred_codes, pred_n_codes, edges = _encode_with_edges(np.asarray(pred), self.y_isnumeric, edges, self.sketch_width_)
+
+            stop = start + len(pred_codes)
+            if stop > n_samples:
+                raise ValueError("More predictions than samples, "
+                                 "got at least {} for {} samples.".format(stop, n_samples))
+
+            # The number of codes of the predictions can grow from block
+            # to block, so the predictions are the major index
+            index  = pred_codes.astype(np.int64) * y_n_codes
+            index += y_codes[start:stop]
+
+            if keys is None and y_n_codes * pred_n_codes > max(n_samples, 2**16):
+                keys   = np.flatnonzero(table)
+                counts = table[keys]
+
+            if keys is None:
+                count = np.bincount(index, minlength=y_n_codes * pred_n_codes)
+                table = np.concatenate((table, np.zeros(len(count) - len(table), dtype=np.int64))) + count
+            else:
+                keys, inverse = np.unique(np.concatenate((keys, index)), return_inverse=True)
+                counts = np.bincount(inverse, weights=np.concatenate((counts, np.ones(len(index)))))
+                counts = counts.astype(np.int64)
+
+            start = stop
+
+        if start == 0:
+            raise ValueError("No predictions were given.")
+
+        if start != n_samples:
+            raise ValueError("Number of predictions {} does not match "
+                             "the number of samples {}.".format(start, n_samples))
+
+        # Small tables are the confusion matrix of the codes
+        if keys is None:
+            return self.inaccuracy_confusion(table.reshape((-1, y_n_codes)).T)
+
+        len_pred  = _count_length(np.bincount(keys // y_n_codes, weights=counts))
+        len_joint = _count_length(counts)
+
+        # Constant target and predictions, equal or not
+        if max(self.len_y, len_pred) == 0:
+            return float(keys[0] // y_n_codes != keys[0] % y_n_codes)
+
         inacc     = ( len_joint - min(self.len_y, len_pred) ) / max(self.len_y, len_pred)
 
-        return inacc    
+        return inacc
+
+
+    def inaccuracy_batch(self, predictions):
+        """
+        Compute the inaccuracy of many lists of predicted values at once,
+        for example, of all the candidates of a search. The contingency
+        tables of all the lists and the target are counted together.
+
+        Parameters
+        ----------       
+        predictions : array-like, shape (n_lists, n_samples)
+                      The lists of predicted values, one per row
+
+        Returns
+        -------                
+        Return a numpy array with the inaccuracy of each list
+        """        
+        
+        check_is_fitted(self)
+
+        pred    = check_array(predictions, ensure_2d=True, dtype=None)
+        n_lists = pred.shape[0]
+
+        if pred.shape[1] != len(self.y_codes_):
+            raise ValueError("Number of predictions {} does not match "
+                             "the number of samples {}.".format(pred.shape[1], len(self.y_codes_)))
+
+        # All the predictions are coded with the bins of the target
+        pred_codes, pred_n_codes, edges = _encode_with_edges(pred.ravel(), self.y_isnumeric, self.y_edges_, self.sketch_width_)
+        pred_codes = pred_codes.reshape(pred.shape).T
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inacc = _miscoding_block(pred_codes, np.full(n_lists, pred_n_codes), self.y_codes_, self.y_n_codes_)
+
+        # Constant target and predictions, equal or not
+        if self.len_y == 0:
+            constant = np.flatnonzero(np.all(pred_codes == pred_codes[0], axis=0))
+            inacc[constant] = pred_codes[0, constant] != self.y_codes_[0]
+
+        return inacc
+
+
+    def inaccuracy_confusion(self, confusion):
+        """
+        Compute the inaccuracy of a classifier given its confusion matrix,
+        being the joint length of the predictions and the target the
+        length of the matrix, encoded with an optimal code
+
+        Parameters
+        ----------       
+        confusion : array-like, shape (n_classes, n_predicted_classes)
+                    The number of samples of the class i predicted as
+                    the class j, with the classes in the same order in
+                    both axes (as in sklearn.metrics.confusion_matrix)
+
+        Returns
+        -------                
+        Return the inaccuracy (float)
+        """        
+
+        confusion = np.asarray(confusion)
+
+        len_y     = _count_length(np.sum(confusion, axis=1))
+        len_pred  = _count_length(np.sum(confusion, axis=0))
+        len_joint = _count_length(confusion.ravel())
+
+        # Constant target and predictions, equal or not
+        if max(len_y, len_pred) == 0:
+            return float(np.trace(confusion) == 0)
+
+        inacc     = ( len_joint - min(len_y, len_pred) ) / max(len_y, len_pred)
+
+        return inacc
 
 
 #
@@ -949,7 +3276,7 @@ class Surfeit(BaseEstimator):
         return None
     
 
-    def fit(self, X, y):
+    def fit(self, X, y, codes=None, check_input=True):
         """Initialize the Surfeit class with dataset
         
         Parameters
@@ -959,15 +3286,32 @@ class Surfeit(BaseEstimator):
             
         y : array-like, shape (n_samples)
             The target values (class labels) as integers or strings.
+
+        codes : _CodeStore, optional
+            The discretized version of X and y shared with other
+            components. If None, y is discretized here.
+
+        check_input : boolean, default True
+            Allow to bypass the validation of X and y, when they have
+            been already validated as numpy arrays. X and y are kept
+            without copying them.
             
         Returns
         -------
         self
         """
         
-        self.X_, self.y_ = check_X_y(X, y, dtype=None)
+        if check_input:
+            self.X_, self.y_ = check_X_y(X, y, dtype=None, accept_sparse="csc")
+        else:
+            self.X_, self.y_ = X, y
+
+        if codes is None:
+            y_codes, y_n_codes, y_edges = _encode_vector(self.y_, self.y_isnumeric)
+        else:
+            y_codes, y_n_codes = codes.y_codes, codes.y_n_codes
                 
-        self.len_y_ = _optimal_code_length(x1=self.y_, numeric1=self.y_isnumeric)
+        self.len_y_ = _codes_length(y_codes, y_n_codes)
         
         return self
     
@@ -990,30 +3334,31 @@ class Surfeit(BaseEstimator):
         Redundancy (float) of the model
         """
 
+        # The model is serialized as a sequence of strings
         if isinstance(model, MultinomialNB):
-            model_str = self._MultinomialNB(model)
+            model_chunks = self._MultinomialNB(model)
         elif isinstance(model, DecisionTreeClassifier):
-            model_str = self._DecisionTreeClassifier(model)
+            model_chunks = self._DecisionTreeClassifier(model)
         elif isinstance(model, SVC) and model.get_params()['kernel']=='linear':
-            model_str = self._LinearSVC(model)
+            model_chunks = self._LinearSVC(model)
         elif isinstance(model, SVC) and model.get_params()['kernel']=='poly':
-            model_str = self._SVC(model)
+            model_chunks = self._SVC(model)
         elif isinstance(model, MLPClassifier):
-            model_str = self._MLPClassifier(model)
+            model_chunks = self._MLPClassifier(model)
         elif isinstance(model, LinearRegression):
-            model_str = self._LinearRegression(model)
+            model_chunks = self._LinearRegression(model)
         elif isinstance(model, DecisionTreeRegressor):
-            model_str = self._DecisionTreeRegressor(model)
+            model_chunks = self._DecisionTreeRegressor(model)
         elif isinstance(model, LinearSVR):
-            model_str = self._LinearSVR(model)
+            model_chunks = self._LinearSVR(model)
         elif isinstance(model, MLPRegressor):
-            model_str = self._MLPRegressor(model)
+            model_chunks = self._MLPRegressor(model)
         else:
             # Rise exception
             raise NotImplementedError('Model {!r} not supported'
                                      .format(type(model)))
 
-        return self.surfeit_string(model_str)
+        return self._surfeit_chunks(model_chunks)
         
 
     def surfeit_string(self, model_string):
@@ -1029,18 +3374,45 @@ class Surfeit(BaseEstimator):
         Redundancy (float) of the model
         """
     
-        # Compute the model string and its compressed version
-        emodel = model_string.encode()
-        
+        return self._surfeit_chunks([model_string])
+
+
+    def _surfeit_chunks(self, model_chunks):
+        """
+        Compute the redundancy of a model given as a sequence of strings.
+        The strings are encoded and compressed incrementally, in blocks of
+        about 64KB, and only the number of bytes is kept, so memory does
+        not depend on the size of the model.
+        """
+
         if self.compressor == "lzma":
-            compressed = lzma.compress(emodel, preset=9)
+            compressor = lzma.LZMACompressor(preset=9)
         elif self.compressor == "zlib":
-            compressed = zlib.compress(emodel, level=9)
+            compressor = zlib.compressobj(level=9)
         else: # By default use bz2
-            compressed = bz2.compress(emodel, compresslevel=9)
-        
-        km = len(compressed)
-        lm = len(emodel)
+            compressor = bz2.BZ2Compressor(9)
+
+        km = 0
+        lm = 0
+
+        block = list()
+        size  = 0
+
+        for chunk in model_chunks:
+
+            block.append(chunk)
+            size = size + len(chunk)
+
+            if size >= 2**16:
+                emodel = "".join(block).encode()
+                km     = km + len(compressor.compress(emodel))
+                lm     = lm + len(emodel)
+                block  = list()
+                size   = 0
+
+        emodel = "".join(block).encode()
+        km     = km + len(compressor.compress(emodel)) + len(compressor.flush())
+        lm     = lm + len(emodel)
 
         # Check if the model is too small to compress        
         if km > lm:
@@ -1057,7 +3429,7 @@ class Surfeit(BaseEstimator):
 
 
     """
-    Convert a MultinomialNB classifier into a string
+    Convert a MultinomialNB classifier into a sequence of strings
     """
     def _MultinomialNB(self, estimator):
         #
@@ -1077,36 +3449,34 @@ class Surfeit(BaseEstimator):
         #
 
         # Header
-        string = "def Bayes(X):\n"
+        yield "def Bayes(X):\n"
  
         # Target probabilities
-        string = string + "    Py["
+        yield "    Py["
         for i in np.arange(len(py)):
-            string = string + str(py) + ", "
-        string = string + "]\n"
+            yield str(py) + ", "
+        yield "]\n"
             
         # Conditional probabilities
-        string = string + "    theta["        
+        yield "    theta["
         for i in np.arange(len(theta)):
-            string = string + str(theta[i]) + ", "
-        string = string + "]\n"
-
-        string = string + "    y_hat    = None\n"
-        string = string + "    max_prob = 0\n"
-        string = string + "    for i in range(len(estimator.classes_)):\n"
-        string = string + "        prob = 1\n"
-        string = string + "        for j in range(len(theta[i])):\n"
-        string = string + "            prob = prob * theta[i][j]\n"
-        string = string + "        prob = py[i] *  prob\n"
-        string = string + "        if prob > max_prob:\n"
-        string = string + "            y_hat = estimator.classes_[i]\n"
-        string = string + "    return y_hat\n"
-                
-        return string
+            yield str(theta[i]) + ", "
+        yield "]\n"
+
+        yield "    y_hat    = None\n"
+        yield "    max_prob = 0\n"
+        yield "    for i in range(len(estimator.classes_)):\n"
+        yield "        prob = 1\n"
+        yield "        for j in range(len(theta[i])):\n"
+        yield "            prob = prob * theta[i][j]\n"
+        yield "        prob = py[i] *  prob\n"
+        yield "        if prob > max_prob:\n"
+        yield "            y_hat = estimator.classes_[i]\n"
+        yield "    return y_hat\n"
     
     
     """
-    Convert a LinearSVC classifier into a string
+    Convert a LinearSVC classifier into a sequence of strings
     """
     def _LinearSVC(self, estimator):
   
@@ -1137,33 +3507,33 @@ class Surfeit(BaseEstimator):
             #
 
             # Header
-            string = "def LinearSVC(X):\n"
+            yield "def LinearSVC(X):\n"
                  
             # Similarities
-            string = string + "    M = ["        
+            yield "    M = ["
             for j in np.arange(len(M)-1):
-                string = string + str(M[j]) + ", "
-            string = string + str(M[-1])
-            string = string + "]]\n"
+                yield str(M[j]) + ", "
+            yield str(M[-1])
+            yield "]]\n"
             
-            string = string + "    intercept = ["        
-            string = string + str(intercept)
-            string = string + "]\n"
+            yield "    intercept = ["
+            yield str(intercept)
+            yield "]\n"
             
             # Computation of the decision function
-            string = string + '    y_hat = [None]*len(X)'
-            string = string + '    for i in range(len(X)):\n'
-            string = string + '        prob = 0\n'
-            string = string + '        for k in range(len(M)):\n'
-            string = string + '            prob = prob + X[i][k] * M[k]\n'
-            string = string + '        prob = prob + intercept\n'
+            yield '    y_hat = [None]*len(X)'
+            yield '    for i in range(len(X)):\n'
+            yield '        prob = 0\n'
+            yield '        for k in range(len(M)):\n'
+            yield '            prob = prob + X[i][k] * M[k]\n'
+            yield '        prob = prob + intercept\n'
 			
             #Prediction
-            string = string + '        if prob > 0:\n'
-            string = string + '            y_hat[i] = 0\n'
-            string = string + '        else:\n'
-            string = string + '            y_hat[i] = 1\n'
-            string = string + '    return y_hat\n'
+            yield '        if prob > 0:\n'
+            yield '            y_hat[i] = 0\n'
+            yield '        else:\n'
+            yield '            y_hat[i] = 1\n'
+            yield '    return y_hat\n'
         
         else:
         
@@ -1172,67 +3542,65 @@ class Surfeit(BaseEstimator):
             #
 
             # Header
-            string = "def LinearSVC(X):\n"
+            yield "def LinearSVC(X):\n"
                  
             # Similarities
-            string = string + "    M = ["        
+            yield "    M = ["
             for i in np.arange(len(M)-1):
-                string = string + "["
+                yield "["
                 for j in np.arange(len(M[i])-1):
-                    string = string + str(M[i][j]) + ", "
-                string = string + str(M[i][-1])
-                string = string + "], "
-            string = string + "["
+                    yield str(M[i][j]) + ", "
+                yield str(M[i][-1])
+                yield "], "
+            yield "["
             for j in np.arange(len(M[-1])-1):
-                string = string + str(M[-1][j]) + ", "
-            string = string + str(M[-1][-1])
-            string = string + "]]\n"
+                yield str(M[-1][j]) + ", "
+            yield str(M[-1][-1])
+            yield "]]\n"
             
-            string = string + "    intercept = ["        
+            yield "    intercept = ["
             for i in np.arange(len(intercept)-1):
-                string = string + str(intercept[i])
-                string = string + ", "
-            string = string + str(intercept[-1])
-            string = string + "]\n"
+                yield str(intercept[i])
+                yield ", "
+            yield str(intercept[-1])
+            yield "]\n"
             
-            string = string + "    classes = ["        
+            yield "    classes = ["
             for i in np.arange(len(classes-1)):
-                string = string + str(classes[i]) + ", "
-            string = string + str(classes[-1])
-            string = string + "]]\n"
+                yield str(classes[i]) + ", "
+            yield str(classes[-1])
+            yield "]]\n"
            
 		    # Computation of the decision function ('ovo' strategy)
-            string = string + '    y_hat = [None]*len(X)'
-            string = string + '    for i in range(len(X)):\n'
-            string = string + '        votes = [0]*len(classes)\n'
-            string = string + '        idx = 0\n'
-            string = string + '        for j in range(len(classes)):\n'
-            string = string + '            for l in range(len(classes)-j-1):\n'
-            string = string + '                prob = 0\n'
-            string = string + '                for k in range(len(M[idx])):\n'
-            string = string + '                    prob = prob + X[i][k] * M[idx][k]\n'
-            string = string + '                prob = prob + intercept[idx]\n'
-            string = string + '                if prob > 0:\n'
-            string = string + '                    votes[j] = votes[j] + 1\n'
-            string = string + '                else:\n'
-            string = string + '                    votes[l+j+1] = votes[l+j+1] + 1\n'
-            string = string + '                idx = idx + 1\n'
+            yield '    y_hat = [None]*len(X)'
+            yield '    for i in range(len(X)):\n'
+            yield '        votes = [0]*len(classes)\n'
+            yield '        idx = 0\n'
+            yield '        for j in range(len(classes)):\n'
+            yield '            for l in range(len(classes)-j-1):\n'
+            yield '                prob = 0\n'
+            yield '                for k in range(len(M[idx])):\n'
+            yield '                    prob = prob + X[i][k] * M[idx][k]\n'
+            yield '                prob = prob + intercept[idx]\n'
+            yield '                if prob > 0:\n'
+            yield '                    votes[j] = votes[j] + 1\n'
+            yield '                else:\n'
+            yield '                    votes[l+j+1] = votes[l+j+1] + 1\n'
+            yield '                idx = idx + 1\n'
             
             # Prediction
-            string = string + '        max_vote = 0\n'
-            string = string + '        i_max_vote = 0\n'
-            string = string + '        for k in range(len(votes)):\n'
-            string = string + '            if votes[k]>max_vote:\n'
-            string = string + '                max_vote = votes[k]\n'
-            string = string + '                i_max_vote = k\n'
-            string = string + '        y_hat[i] = classes[i_max_vote]\n'
-            string = string + '    return y_hat\n'
-        
-        return string
+            yield '        max_vote = 0\n'
+            yield '        i_max_vote = 0\n'
+            yield '        for k in range(len(votes)):\n'
+            yield '            if votes[k]>max_vote:\n'
+            yield '                max_vote = votes[k]\n'
+            yield '                i_max_vote = k\n'
+            yield '        y_hat[i] = classes[i_max_vote]\n'
+            yield '    return y_hat\n'
 
 
     """
-	Convert a SVC classifier into a string
+	Convert a SVC classifier into a sequence of strings
 	"""
     string = ""
     affiche = 1
@@ -1263,88 +3631,88 @@ class Surfeit(BaseEstimator):
             # Create the model
 
             # Header
-            string = "def SVC(X):\n"
+            yield "def SVC(X):\n"
                  
             # Similarities
-            string = string + "    dual_coef = ["        
+            yield "    dual_coef = ["
             for i in np.arange(len(M)-1):
-                string = string + "["
+                yield "["
                 for j in np.arange(len(M[i])-1):
-                    string = string + str(M[i][j]) + ", "
-                string = string + str(M[i][-1])
-                string = string + "], "
-            string = string + "["
+                    yield str(M[i][j]) + ", "
+                yield str(M[i][-1])
+                yield "], "
+            yield "["
             for j in np.arange(len(M[-1])-1):
-                string = string + str(M[-1][j]) + ", "
-            string = string + str(M[-1][-1])
-            string = string + "]]\n"
+                yield str(M[-1][j]) + ", "
+            yield str(M[-1][-1])
+            yield "]]\n"
             
-            string = string + "    intercept = ["        
-            string = string + str(estimator.intercept_)
-            string = string + "]\n"
+            yield "    intercept = ["
+            yield str(estimator.intercept_)
+            yield "]\n"
             
-            string = string + "    classes = ["        
+            yield "    classes = ["
             for i in np.arange(len(estimator.classes_)-1):
-                string = string + str(estimator.classes_[i]) + ", "
-            string = string + str(estimator.classes_[-1])
-            string = string + "]\n"
+                yield str(estimator.classes_[i]) + ", "
+            yield str(estimator.classes_[-1])
+            yield "]\n"
             
-            string = string + "    support_vectors = ["        
+            yield "    support_vectors = ["
             for i in np.arange(len(support_vectors)-1):
-                string = string + "["
+                yield "["
                 for j in np.arange(len(support_vectors[i])-1):
-                    string = string + str(support_vectors[i][j]) + ", "
-                string = string + str(support_vectors[i][-1])
-                string = string + "], "
-            string = string + "["
+                    yield str(support_vectors[i][j]) + ", "
+                yield str(support_vectors[i][-1])
+                yield "], "
+            yield "["
             for j in np.arange(len(support_vectors[-1])-1):
-                string = string + str(support_vectors[-1][j]) + ", "
-            string = string + str(support_vectors[-1][-1])
-            string = string + "]]\n"
+                yield str(support_vectors[-1][j]) + ", "
+            yield str(support_vectors[-1][-1])
+            yield "]]\n"
             
-            string = string + "    n_support = ["        
+            yield "    n_support = ["
             for i in np.arange(len(estimator.n_support_)-1):
-                string = string + str(estimator.n_support_[i]) + ", "
-            string = string + str(estimator.n_support_[-1])
-            string = string + "]\n"
+                yield str(estimator.n_support_[i]) + ", "
+            yield str(estimator.n_support_[-1])
+            yield "]\n"
             
-            string = string + "    degree = "
-            string = string + str(estimator.degree)
-            string = string + "    \n"
+            yield "    degree = "
+            yield str(estimator.degree)
+            yield "    \n"
             
-            string = string + "    gamma = "
+            yield "    gamma = "
             if estimator.gamma == 'scale':
-                string = string + str(1/(len(support_vectors[0])*np.var(self.X_)))
+                yield str(1/(len(support_vectors[0])*np.var(self.X_)))
             elif estimator.gamma == 'auto':
-                string = string + str(1/len(support_vectors[0]))
+                yield str(1/len(support_vectors[0]))
             else:
-                string = string + str(estimator.gamma)
-            string = string + "    \n"
+                yield str(estimator.gamma)
+            yield "    \n"
             
-            string = string + "    r = "
-            string = string + str(estimator.coef0)
-            string = string + "    \n"
+            yield "    r = "
+            yield str(estimator.coef0)
+            yield "    \n"
 
             # Computation of the decision function ('ovo' strategy)
-            string = string + "    y_hat    = [None]*len(X)\n"
-            string = string + "    for i in range(len(X)):\n"
-            string = string + "        prob = 0\n" 
-            string = string + "        for i_sv in range(len(support_vectors)):\n"
-            string = string + "            sum = 0\n" 
-            string = string + "            for k in range(len(X[i])):\n"
-            string = string + "                sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
-            string = string + "            x = 1\n"
-            string = string + "            for k in range(degree):\n"
-            string = string + "                x = x * (gamma * sum + r)\n"
-            string = string + "            prob = prob + x * dual_coef[i_sv]\n"
-            string = string + "        prob = prob + intercept[0]\n"
+            yield "    y_hat    = [None]*len(X)\n"
+            yield "    for i in range(len(X)):\n"
+            yield "        prob = 0\n"
+            yield "        for i_sv in range(len(support_vectors)):\n"
+            yield "            sum = 0\n"
+            yield "            for k in range(len(X[i])):\n"
+            yield "                sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
+            yield "            x = 1\n"
+            yield "            for k in range(degree):\n"
+            yield "                x = x * (gamma * sum + r)\n"
+            yield "            prob = prob + x * dual_coef[i_sv]\n"
+            yield "        prob = prob + intercept[0]\n"
 	
             # Prediction
-            string = string + "        if prob > 0:\n"
-            string = string + "            y_hat[i] = 0\n"
-            string = string + "        else:\n"
-            string = string + "            y_hat[i] = 1\n"
-            string = string + "    return y_hat\n"
+            yield "        if prob > 0:\n"
+            yield "            y_hat[i] = 0\n"
+            yield "        else:\n"
+            yield "            y_hat[i] = 1\n"
+            yield "    return y_hat\n"
 
         else:
         
@@ -1353,117 +3721,115 @@ class Surfeit(BaseEstimator):
             #
 
             # Header
-            string = "def SVC(X):\n"
+            yield "def SVC(X):\n"
                  
             # Similarities
-            string = string + "    dual_coef = ["        
+            yield "    dual_coef = ["
             for i in np.arange(len(M)-1):
-                string = string + "["
+                yield "["
                 for j in np.arange(len(M[i])-1):
-                    string = string + str(M[i][j]) + ", "
-                string = string + str(M[i][-1])
-                string = string + "], "
-            string = string + "["
+                    yield str(M[i][j]) + ", "
+                yield str(M[i][-1])
+                yield "], "
+            yield "["
             for j in np.arange(len(M[-1])-1):
-                string = string + str(M[-1][j]) + ", "
-            string = string + str(M[-1][-1])
-            string = string + "]]\n"
+                yield str(M[-1][j]) + ", "
+            yield str(M[-1][-1])
+            yield "]]\n"
             
-            string = string + "    intercept = ["        
+            yield "    intercept = ["
             for i in np.arange(len(estimator.intercept_)-1):
-                string = string + str(estimator.intercept_[i]) + ", "
-            string = string + str(estimator.intercept_[-1])
-            string = string + "]\n"
+                yield str(estimator.intercept_[i]) + ", "
+            yield str(estimator.intercept_[-1])
+            yield "]\n"
             
-            string = string + "    classes = ["        
+            yield "    classes = ["
             for i in np.arange(len(estimator.classes_)-1):
-                string = string + str(estimator.classes_[i]) + ", "
-            string = string + str(estimator.classes_[-1])
-            string = string + "]\n"
+                yield str(estimator.classes_[i]) + ", "
+            yield str(estimator.classes_[-1])
+            yield "]\n"
             
-            string = string + "    support_vectors = ["        
+            yield "    support_vectors = ["
             for i in np.arange(len(support_vectors)-1):
-                string = string + "["
+                yield "["
                 for j in np.arange(len(support_vectors[i])-1):
-                    string = string + str(support_vectors[i][j]) + ", "
-                string = string + str(support_vectors[i][-1])
-                string = string + "], "
-            string = string + "["
+                    yield str(support_vectors[i][j]) + ", "
+                yield str(support_vectors[i][-1])
+                yield "], "
+            yield "["
             for j in np.arange(len(support_vectors[-1])-1):
-                string = string + str(support_vectors[-1][j]) + ", "
-            string = string + str(support_vectors[-1][-1])
-            string = string + "]]\n"
+                yield str(support_vectors[-1][j]) + ", "
+            yield str(support_vectors[-1][-1])
+            yield "]]\n"
             
-            string = string + "    n_support = ["        
+            yield "    n_support = ["
             for i in np.arange(len(estimator.n_support_)-1):
-                string = string + str(estimator.n_support_[i]) + ", "
-            string = string + str(estimator.n_support_[-1])
-            string = string + "]\n"
+                yield str(estimator.n_support_[i]) + ", "
+            yield str(estimator.n_support_[-1])
+            yield "]\n"
             
-            string = string + "    idx_support = ["        
+            yield "    idx_support = ["
             for i in np.arange(len(estimator.n_support_)):
-                string = string + str(np.sum(estimator.n_support_[:i])) + ", "
-            string = string + str(np.sum(estimator.n_support_))
-            string = string + "]\n"
+                yield str(np.sum(estimator.n_support_[:i])) + ", "
+            yield str(np.sum(estimator.n_support_))
+            yield "]\n"
             
-            string = string + "    degree = "
-            string = string + str(estimator.degree)
-            string = string + "    \n"
+            yield "    degree = "
+            yield str(estimator.degree)
+            yield "    \n"
             
-            string = string + "    gamma = "
+            yield "    gamma = "
             if estimator.gamma == 'scale':
-                string = string + str(1/(len(support_vectors[0])*np.var(self.X_)))
+                yield str(1/(len(support_vectors[0])*np.var(self.X_)))
             elif estimator.gamma == 'auto':
-                string = string + str(1/len(support_vectors[0]))
+                yield str(1/len(support_vectors[0]))
             else:
-                string = string + str(estimator.gamma)
-            string = string + "    \n"
+                yield str(estimator.gamma)
+            yield "    \n"
             
-            string = string + "    r = "
-            string = string + str(estimator.coef0)
-            string = string + "    \n"
+            yield "    r = "
+            yield str(estimator.coef0)
+            yield "    \n"
 
             # Computation of the decision function ('ovo' strategy)
-            string = string + "    y_hat    = [None]*len(X)\n"
-            string = string + "    for i in range(len(X)):\n"
-            string = string + "        votes = [0]*len(classes)\n"
-            string = string + "        idx = 0\n"
-            string = string + "        for j in range(len(classes)):\n"
-            string = string + "            for l in range(len(classes)-j-1):\n"
-            string = string + "                prob = 0\n" 
-            string = string + "                sum = 0\n" 
-            string = string + "                for i_sv in range(idx_support[j],idx_support[j+1]):\n"
-            string = string + "                    for k in range(len(X[i])):\n"
-            string = string + "                        sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
-            string = string + "                    x = 1\n"
-            string = string + "                    for k in range(degree):\n"
-            string = string + "                        x = x * (gamma * sum + r)\n"
-            string = string + "                    prob = prob + x * dual_coef[l+j][i_sv]\n"
-            string = string + "                sum = 0\n"
-            string = string + "                for i_sv in range(idx_support[j+l],idx_support[j+l+1]):\n"
-            string = string + "                    for k in range(len(X[i])):\n"
-            string = string + "                        sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
-            string = string + "                    x = 1\n"
-            string = string + "                    for k in range(degree):\n"
-            string = string + "                        x = x * (gamma * sum + r)\n"
-            string = string + "                    prob = prob + x * dual_coef[j][i_sv]\n"
-            string = string + "                prob = prob + intercept[idx]\n"
-            string = string + "                if prob > 0:\n"
-            string = string + "                    votes[j] = votes[j] + 1\n"
-            string = string + "                else:\n"
-            string = string + "                    votes[l+j+1] = votes[l+j+1] + 1\n"
-            string = string + "                idx = idx + 1\n"
+            yield "    y_hat    = [None]*len(X)\n"
+            yield "    for i in range(len(X)):\n"
+            yield "        votes = [0]*len(classes)\n"
+            yield "        idx = 0\n"
+            yield "        for j in range(len(classes)):\n"
+            yield "            for l in range(len(classes)-j-1):\n"
+            yield "                prob = 0\n"
+            yield "                sum = 0\n"
+            yield "                for i_sv in range(idx_support[j],idx_support[j+1]):\n"
+            yield "                    for k in range(len(X[i])):\n"
+            yield "                        sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
+            yield "                    x = 1\n"
+            yield "                    for k in range(degree):\n"
+            yield "                        x = x * (gamma * sum + r)\n"
+            yield "                    prob = prob + x * dual_coef[l+j][i_sv]\n"
+            yield "                sum = 0\n"
+            yield "                for i_sv in range(idx_support[j+l],idx_support[j+l+1]):\n"
+            yield "                    for k in range(len(X[i])):\n"
+            yield "                        sum = sum + support_vectors[i_sv][k] * X[i][k]\n"
+            yield "                    x = 1\n"
+            yield "                    for k in range(degree):\n"
+            yield "                        x = x * (gamma * sum + r)\n"
+            yield "                    prob = prob + x * dual_coef[j][i_sv]\n"
+            yield "                prob = prob + intercept[idx]\n"
+            yield "                if prob > 0:\n"
+            yield "                    votes[j] = votes[j] + 1\n"
+            yield "                else:\n"
+            yield "                    votes[l+j+1] = votes[l+j+1] + 1\n"
+            yield "                idx = idx + 1\n"
 		
             # Prediction
-            string = string + "        max_vote = 0\n"
-            string = string + "        i_max_vote = 0\n"
-            string = string + "        for k in range(len(votes)):\n"
-            string = string + "            if votes[k]>max_vote:\n"
-            string = string + "                max_vote, i_max_vote = votes[k], k\n"
-            string = string + "        y_hat[i] = classes[i_max_vote]\n"
-            string = string + "    return y_hat\n"
-           
-        return string
+            yield "        max_vote = 0\n"
+            yield "        i_max_vote = 0\n"
+            yield "        for k in range(len(votes)):\n"
+            yield "            if votes[k]>max_vote:\n"
+            yield "                max_vote, i_max_vote = votes[k], k\n"
+            yield "        y_hat[i] = classes[i_max_vote]\n"
+            yield "    return y_hat\n"
 
 
     """
@@ -1476,26 +3842,22 @@ class Surfeit(BaseEstimator):
         feature        = estimator.tree_.feature
         threshold      = estimator.tree_.threshold
         
-        my_string = ""
-        
         if children_left[node_id] == children_right[node_id]:
             
             # It is a leaf
-            my_string = my_string + '%sreturn %s\n' % (' '*depth*4, estimator.classes_[np.argmax(estimator.tree_.value[node_id][0])])
+            yield '%sreturn %s\n' % (' '*depth*4, estimator.classes_[np.argmax(estimator.tree_.value[node_id][0])])
 
         else:
 
             # Print the decision to take at this level
-            my_string = my_string + '%sif X%d < %.3f:\n' % (' '*depth*4, (feature[node_id]+1), threshold[node_id])
-            my_string = my_string + self._treebody2str(estimator, children_left[node_id],  depth+1)
-            my_string = my_string + '%selse:\n' % (' '*depth*4)
-            my_string = my_string + self._treebody2str(estimator, children_right[node_id], depth+1)
-                
-        return my_string
+            yield '%sif X%d < %.3f:\n' % (' '*depth*4, (feature[node_id]+1), threshold[node_id])
+            yield from self._treebody2str(estimator, children_left[node_id],  depth+1)
+            yield '%selse:\n' % (' '*depth*4)
+            yield from self._treebody2str(estimator, children_right[node_id], depth+1)
 
 
     """
-    Convert a DecisionTreeClassifier into a string
+    Convert a DecisionTreeClassifier into a sequence of strings
     """
     def _DecisionTreeClassifier(self, estimator):
 
@@ -1506,8 +3868,6 @@ class Surfeit(BaseEstimator):
         children_right = estimator.tree_.children_right
         feature        = estimator.tree_.feature
 
-        tree_string = ""
-        
         # Compute the tree header
         
         features_set = set()
@@ -1518,16 +3878,14 @@ class Surfeit(BaseEstimator):
             if (children_left[node_id] != children_right[node_id]):
                 features_set.add('X%d' % (feature[node_id]+1))
         
-        tree_string = tree_string + "def tree" + str(features_set) + ":\n"
+        yield "def tree" + str(features_set) + ":\n"
 
         # Compute the tree body
-        tree_string = tree_string + self._treebody2str(estimator, 0, 1)
-
-        return tree_string
+        yield from self._treebody2str(estimator, 0, 1)
 
 
     """
-    Convert a MLPClassifier into a string
+    Convert a MLPClassifier into a sequence of strings
     """
     def _MLPClassifier(self, estimator):
         
@@ -1588,66 +3946,64 @@ class Surfeit(BaseEstimator):
         #
 
         # Header
-        string = "def NN(X):\n"
+        yield "def NN(X):\n"
  
         # Weights
-        string = string + "    W["
+        yield "    W["
         for i in np.arange(len(coefs)):
-            string = string + str(coefs[i]) + ", "
-        string = string + "]\n"
+            yield str(coefs[i]) + ", "
+        yield "]\n"
             
         # Bias
-        string = string + "    b["        
+        yield "    b["
         for i in np.arange(len(coefs)):
-            string = string + str(inters[i]) + ", "
-        string = string + "]\n"
+            yield str(inters[i]) + ", "
+        yield "]\n"
        
         # First layer
         
-        string = string + "    Z = [0] * W[0].shape[0]\n"
-        string = string + "    for i in range(W[0].shape[0]):\n"
-        string = string + "        for j in range(W[0].shape[1]):\n"
-        string = string + "            Z[i] = Z[i] + W[0, i, j] * X[j]\n"
-        string = string + "        Z[i] = Z[i] + b[0][i] \n"
+        yield "    Z = [0] * W[0].shape[0]\n"
+        yield "    for i in range(W[0].shape[0]):\n"
+        yield "        for j in range(W[0].shape[1]):\n"
+        yield "            Z[i] = Z[i] + W[0, i, j] * X[j]\n"
+        yield "        Z[i] = Z[i] + b[0][i] \n"
             
-        string = string + "    A = [0] * W[0].shape[0]\n"
-        string = string + "    for i in range(Z.shape[0]):\n"
-        string = string + "        A[i] = max(Z[i], 0)\n"
+        yield "    A = [0] * W[0].shape[0]\n"
+        yield "    for i in range(Z.shape[0]):\n"
+        yield "        A[i] = max(Z[i], 0)\n"
         
         # Hiddent layers
         
-        string = string + "    for i in range(1, " + str(len(estimator.coefs_)) + "):\n"
+        yield "    for i in range(1, " + str(len(estimator.coefs_)) + "):\n"
             
-        string = string + "        Z = [0] * W[i].shape[0]\n"
-        string = string + "        for j in range(W[i].shape[0]):\n"
-        string = string + "            for k in range(W[i].shape[1]):\n"
-        string = string + "                Z[j] = Z[j] + W[i, j, k] * A[k]\n"
-        string = string + "            Z[j] = Z[j] + b[i][j] \n"
+        yield "        Z = [0] * W[i].shape[0]\n"
+        yield "        for j in range(W[i].shape[0]):\n"
+        yield "            for k in range(W[i].shape[1]):\n"
+        yield "                Z[j] = Z[j] + W[i, j, k] * A[k]\n"
+        yield "            Z[j] = Z[j] + b[i][j] \n"
             
-        string = string + "        A = [0] * W[i].shape[0]\n"
-        string = string + "        for j in range(Z.shape[0]):\n"
-        string = string + "            A = max(Z[j], 0)\n"
+        yield "        A = [0] * W[i].shape[0]\n"
+        yield "        for j in range(Z.shape[0]):\n"
+        yield "            A = max(Z[j], 0)\n"
         
         # Predictions
         
-        string = string + "    softmax = 0\n"
-        string = string + "    prediction = 0\n"
-        string = string + "    totalmax = 0\n"
-        string = string + "    for i in range(A.shape[0]):\n"
-        string = string + "        totalmax = totalmax + exp(A[i])\n"
-        string = string + "    for i in range(A.shape[0]):\n"
-        string = string + "        newmax = exp(A[i])\n"        
-        string = string + "        if newmax > softmax:\n"        
-        string = string + "            softmax = newmax \n"
-        string = string + "            prediction = i\n"
-        
-        string = string + "    return prediction\n"
-
-        return string
+        yield "    softmax = 0\n"
+        yield "    prediction = 0\n"
+        yield "    totalmax = 0\n"
+        yield "    for i in range(A.shape[0]):\n"
+        yield "        totalmax = totalmax + exp(A[i])\n"
+        yield "    for i in range(A.shape[0]):\n"
+        yield "        newmax = exp(A[i])\n"
+        yield "        if newmax > softmax:\n"
+        yield "            softmax = newmax \n"
+        yield "            prediction = i\n"
+        
+        yield "    return prediction\n"
     
 
     """
-    Convert a LinearRegression into a string
+    Convert a LinearRegression into a sequence of strings
     """
     def _LinearRegression(self, estimator):
 
@@ -1659,23 +4015,21 @@ class Surfeit(BaseEstimator):
         intercept = estimator.intercept_
         
         # Header
-        string = "def LinearRegression(X):\n"
+        yield "def LinearRegression(X):\n"
              
         # Similarities
-        string = string + "    W = ["        
+        yield "    W = ["
         for i in np.arange(len(coefs)):
-            string = string + str(coefs[i]) + ", "
-        string = string + "]\n"
-        string = string + "    b = "
-        string = string + str(intercept) + "\n"
-            
-        string = string + "    y_hat    = 0\n"
-        string = string + "    for i in range(len(W)):\n"
-        string = string + "        y_hat = W[i] * X[i]\n"
-        string = string + "    y_hat = y_hat + b\n"        
-        string = string + "    return y_hat\n"
-                
-        return string
+            yield str(coefs[i]) + ", "
+        yield "]\n"
+        yield "    b = "
+        yield str(intercept) + "\n"
+            
+        yield "    y_hat    = 0\n"
+        yield "    for i in range(len(W)):\n"
+        yield "        y_hat = W[i] * X[i]\n"
+        yield "    y_hat = y_hat + b\n"
+        yield "    return y_hat\n"
 
 
     """
@@ -1688,26 +4042,22 @@ class Surfeit(BaseEstimator):
         feature        = estimator.tree_.feature
         threshold      = estimator.tree_.threshold
         
-        my_string = ""
-        
         if children_left[node_id] == children_right[node_id]:
             
             # It is a leaf
-            my_string = my_string + '%sreturn %s\n' % (' '*depth*4, np.argmax(estimator.tree_.value[node_id][0]))
+            yield '%sreturn %s\n' % (' '*depth*4, np.argmax(estimator.tree_.value[node_id][0]))
 
         else:
 
             # Print the decision to take at this level
-            my_string = my_string + '%sif X%d < %.3f:\n' % (' '*depth*4, (feature[node_id]+1), threshold[node_id])
-            my_string = my_string + self._treeregressorbody2str(estimator, children_left[node_id],  depth+1)
-            my_string = my_string + '%selse:\n' % (' '*depth*4)
-            my_string = my_string + self._treeregressorbody2str(estimator, children_right[node_id], depth+1)
-            
-        return my_string
+            yield '%sif X%d < %.3f:\n' % (' '*depth*4, (feature[node_id]+1), threshold[node_id])
+            yield from self._treeregressorbody2str(estimator, children_left[node_id],  depth+1)
+            yield '%selse:\n' % (' '*depth*4)
+            yield from self._treeregressorbody2str(estimator, children_right[node_id], depth+1)
 
 
     """
-    Convert a LinearSVR into a string
+    Convert a LinearSVR into a sequence of strings
     """
     def _LinearSVR(self, estimator):
         
@@ -1728,29 +4078,27 @@ class Surfeit(BaseEstimator):
         #
 
         # Header
-        string = "def LinearSVC(X):\n"
+        yield "def LinearSVC(X):\n"
              
         # Similarities
-        string = string + "    M["        
+        yield "    M["
         for i in np.arange(len(M)):
-            string = string + str(M[i]) + ", "
-        string = string + "]\n"
-
-        string = string + "    y_hat    = None\n"
-        string = string + "    max_prob = 0\n"
-        string = string + "    for i in range(len(estimator.classes_)):\n"
-        string = string + "        prob = 1\n"
-        string = string + "        for j in range(len(M[i])):\n"
-        string = string + "            prob = prob * M[i][j]\n"
-        string = string + "        prob = py[i] *  prob\n"
-        string = string + "        if prob > max_prob:\n"
-        string = string + "            y_hat = estimator.classes_[i]\n"
-        string = string + "    return y_hat\n"
-
-        return string
+            yield str(M[i]) + ", "
+        yield "]\n"
+
+        yield "    y_hat    = None\n"
+        yield "    max_prob = 0\n"
+        yield "    for i in range(len(estimator.classes_)):\n"
+        yield "        prob = 1\n"
+        yield "        for j in range(len(M[i])):\n"
+        yield "            prob = prob * M[i][j]\n"
+        yield "        prob = py[i] *  prob\n"
+        yield "        if prob > max_prob:\n"
+        yield "            y_hat = estimator.classes_[i]\n"
+        yield "    return y_hat\n"
 
     """
-    Convert a DecisionTreeRegressor into a string
+    Convert a DecisionTreeRegressor into a sequence of strings
     """
     def _DecisionTreeRegressor(self, estimator):
         
@@ -1761,8 +4109,6 @@ class Surfeit(BaseEstimator):
         children_right = estimator.tree_.children_right
         feature        = estimator.tree_.feature
 
-        tree_string = ""
-        
         #
         # Compute the tree header
         #
@@ -1775,19 +4121,17 @@ class Surfeit(BaseEstimator):
             if (children_left[node_id] != children_right[node_id]):
                 features_set.add('X%d' % (feature[node_id]+1))
         
-        tree_string = tree_string + "def DecisionTreeRegressor" + str(features_set) + ":\n"
+        yield "def DecisionTreeRegressor" + str(features_set) + ":\n"
 
         #
         # Compute the tree body
         # 
         
-        tree_string = tree_string + self._treeregressorbody2str(estimator, 0, 1)
-
-        return tree_string
+        yield from self._treeregressorbody2str(estimator, 0, 1)
 
         
     """
-    Convert a MLPRegressor into a string
+    Convert a MLPRegressor into a sequence of strings
     """
     def _MLPRegressor(self, estimator):
         
@@ -1850,62 +4194,60 @@ class Surfeit(BaseEstimator):
         #
 
         # Header
-        string = "def NN(X):\n"
+        yield "def NN(X):\n"
  
         # Weights
-        string = string + "    W["
+        yield "    W["
         for i in np.arange(len(coefs)):
-            string = string + str(coefs[i]) + ", "
-        string = string + "]\n"
+            yield str(coefs[i]) + ", "
+        yield "]\n"
             
         # Bias
-        string = string + "    b["        
+        yield "    b["
         for i in np.arange(len(coefs)):
-            string = string + str(inters[i]) + ", "
-        string = string + "]\n"
+            yield str(inters[i]) + ", "
+        yield "]\n"
        
         # First layer
         
-        string = string + "    Z = [0] * W[0].shape[0]\n"
-        string = string + "    for i in range(W[0].shape[0]):\n"
-        string = string + "        for j in range(W[0].shape[1]):\n"
-        string = string + "            Z[i] = Z[i] + W[0, i, j] * X[j]\n"
-        string = string + "        Z[i] = Z[i] + b[0][i] \n"
+        yield "    Z = [0] * W[0].shape[0]\n"
+        yield "    for i in range(W[0].shape[0]):\n"
+        yield "        for j in range(W[0].shape[1]):\n"
+        yield "            Z[i] = Z[i] + W[0, i, j] * X[j]\n"
+        yield "        Z[i] = Z[i] + b[0][i] \n"
             
-        string = string + "    A = [0] * W[0].shape[0]\n"
-        string = string + "    for i in range(Z.shape[0]):\n"
-        string = string + "        A[i] = max(Z[i], 0)\n"
+        yield "    A = [0] * W[0].shape[0]\n"
+        yield "    for i in range(Z.shape[0]):\n"
+        yield "        A[i] = max(Z[i], 0)\n"
         
         # Hiddent layers
         
-        string = string + "    for i in range(1, " + str(len(estimator.coefs_)) + "):\n"
+        yield "    for i in range(1, " + str(len(estimator.coefs_)) + "):\n"
             
-        string = string + "        Z = [0] * W[i].shape[0]\n"
-        string = string + "        for j in range(W[i].shape[0]):\n"
-        string = string + "            for k in range(W[i].shape[1]):\n"
-        string = string + "                Z[j] = Z[j] + W[i, j, k] * A[k]\n"
-        string = string + "            Z[j] = Z[j] + b[i][j] \n"
+        yield "        Z = [0] * W[i].shape[0]\n"
+        yield "        for j in range(W[i].shape[0]):\n"
+        yield "            for k in range(W[i].shape[1]):\n"
+        yield "                Z[j] = Z[j] + W[i, j, k] * A[k]\n"
+        yield "            Z[j] = Z[j] + b[i][j] \n"
             
-        string = string + "        A = [0] * W[i].shape[0]\n"
-        string = string + "        for j in range(Z.shape[0]):\n"
-        string = string + "            A = max(Z[j], 0)\n"
+        yield "        A = [0] * W[i].shape[0]\n"
+        yield "        for j in range(Z.shape[0]):\n"
+        yield "            A = max(Z[j], 0)\n"
         
         # Predictions
         
-        string = string + "    softmax = 0\n"
-        string = string + "    prediction = 0\n"
-        string = string + "    totalmax = 0\n"
-        string = string + "    for i in range(A.shape[0]):\n"
-        string = string + "        totalmax = totalmax + exp(A[i])\n"
-        string = string + "    for i in range(A.shape[0]):\n"
-        string = string + "        newmax = exp(A[i])\n"        
-        string = string + "        if newmax > softmax:\n"        
-        string = string + "            softmax = newmax \n"
-        string = string + "            prediction = i\n"
-        
-        string = string + "    return prediction\n"
-
-        return string        
+        yield "    softmax = 0\n"
+        yield "    prediction = 0\n"
+        yield "    totalmax = 0\n"
+        yield "    for i in range(A.shape[0]):\n"
+        yield "        totalmax = totalmax + exp(A[i])\n"
+        yield "    for i in range(A.shape[0]):\n"
+        yield "        newmax = exp(A[i])\n"
+        yield "        if newmax > softmax:\n"
+        yield "            softmax = newmax \n"
+        yield "            prediction = i\n"
+        
+        yield "    return prediction\n"
     
 #
 # Class Nescience
@@ -1913,7 +4255,7 @@ class Surfeit(BaseEstimator):
        
 class Nescience(BaseEstimator):
 
-    def __init__(self, X_type="numeric", y_type="numeric", compressor="bz2", method="Harmonic"):
+    def __init__(self, X_type="numeric", y_type="numeric", compressor="bz2", method="Harmonic", n_jobs=None):
 
         valid_X_types = ("numeric", "mixed", "categorical")
         valid_y_types = ("numeric", "categorical")
@@ -1932,11 +4274,12 @@ class Nescience(BaseEstimator):
         self.y_type     = y_type
         self.compressor = compressor
         self.method     = method
+        self.n_jobs     = n_jobs
 
         return None
 
     
-    def fit(self, X, y):
+    def fit(self, X, y, dataset=None):
         """
         Initialization of the class nescience
         
@@ -1944,6 +4287,9 @@ class Nescience(BaseEstimator):
         ----------
         X : array-like, shape (n_samples, n_features)
             Sample vectors from which to compute miscoding.
+            Memory mapped arrays (for example, from numpy.load with
+            mmap_mode='r') are used without copying them. Sparse
+            matrices are discretized without densifying them.
             
         y : array-like, shape (n_samples)
             The target values (class labels) as numbers or strings.
@@ -1955,19 +4301,33 @@ class Nescience(BaseEstimator):
                              
         compressor (string): compressor used to compute redudancy. Valid
                              values are: "bz2", "lzma" and "zlib".
+
+        n_jobs (int):        number of jobs used to discretize the features
+                             and compute their miscodings, as in joblib.
+
+        dataset (_Dataset):  the dataset X and y already validated and
+                             discretized, shared with the caller. If
+                             given, X and y are not validated again.
           
         """
-		
-        X, y = check_X_y(X, y, dtype=None)
 
-        self.miscoding_  = Miscoding(X_type=self.X_type, y_type=self.y_type, redundancy=False)
-        self.miscoding_.fit(X, y)
+        # Validate and discretize the dataset only once, all the
+        # components keep a reference to the same arrays and codes
+        if dataset is None:
+            dataset = _Dataset(X, y, X_type=self.X_type, y_type=self.y_type, n_jobs=self.n_jobs, accept_sparse=True)
+
+        self.dataset_ = dataset
+
+        X, y, codes = dataset.X, dataset.y, dataset.codes
+
+        self.miscoding_  = Miscoding(X_type=self.X_type, y_type=self.y_type, redundancy=False, n_jobs=self.n_jobs)
+        self.miscoding_.fit(X, y, codes=codes, check_input=False)
 
         self.inaccuracy_ = Inaccuracy(y_type=self.y_type)
-        self.inaccuracy_.fit(X, y)        
+        self.inaccuracy_.fit(X, y, codes=codes, check_input=False)        
 
         self.surfeit_    = Surfeit(y_type=self.y_type, compressor=self.compressor)
-        self.surfeit_.fit(X, y)
+        self.surfeit_.fit(X, y, codes=codes, check_input=False)
         
         return self
 
@@ -2057,10 +4417,11 @@ class AutoClassifier(BaseEstimator, ClassifierMixin):
     
     # TODO: Class documentation
     
-    def __init__(self, auto=True, random_state=None):
+    def __init__(self, auto=True, random_state=None, n_jobs=None):
         
         self.random_state = random_state
         self.auto = auto
+        self.n_jobs = n_jobs
         
         return None
 
@@ -2094,11 +4455,13 @@ class AutoClassifier(BaseEstimator, ClassifierMixin):
             self.MLPClassifier
         ]
 
-        self.X_, self.y_ = check_X_y(X, y, dtype=None)
+        # The training data is validated and kept only once
+        self.dataset_ = _Dataset(X, y, X_type="numeric", y_type="categorical", n_jobs=self.n_jobs)
+        self.X_, self.y_ = self.dataset_.X, self.dataset_.y
         # check_classification_targets(self.y_)
 
-        self.nescience_ = Nescience(X_type="numeric", y_type="categorical")
-        self.nescience_.fit(self.X_, self.y_)
+        self.nescience_ = Nescience(X_type="numeric", y_type="categorical", n_jobs=self.n_jobs)
+        self.nescience_.fit(self.X_, self.y_, dataset=self.dataset_)
         
         # new y contains class indexes rather than labels in the range [0, n_classes]
         self.classes_, self.y_ = np.unique(self.y_, return_inverse=True)						  
@@ -2506,10 +4869,11 @@ class AutoRegressor(BaseEstimator, RegressorMixin):
     
     # TODO: Class documentation
 
-    def __init__(self, auto=True, random_state=None):
+    def __init__(self, auto=True, random_state=None, n_jobs=None):
         
         self.random_state = random_state
         self.auto = auto
+        self.n_jobs = n_jobs
         
         return None
 
@@ -2542,10 +4906,12 @@ class AutoRegressor(BaseEstimator, RegressorMixin):
             self.MLPRegressor
         ]
 
-        self.X_, self.y_ = check_X_y(X, y, dtype=None)
+        # The training data is validated and kept only once
+        self.dataset_ = _Dataset(X, y, X_type="numeric", y_type="numeric", n_jobs=self.n_jobs)
+        self.X_, self.y_ = self.dataset_.X, self.dataset_.y
 
-        self.nescience_ = Nescience(X_type="numeric", y_type="numeric")
-        self.nescience_.fit(self.X_, self.y_)
+        self.nescience_ = Nescience(X_type="numeric", y_type="numeric", n_jobs=self.n_jobs)
+        self.nescience_.fit(self.X_, self.y_, dataset=self.dataset_)
         
         nsc = 1
         self.model_ = None
@@ -2998,9 +5364,10 @@ class AutoTimeSeries(BaseEstimator, RegressorMixin):
     
     # TODO: Class documentation
 
-    def __init__(self, auto=True):
+    def __init__(self, auto=True, n_jobs=None):
         
         self.auto = auto
+        self.n_jobs = n_jobs
 		
         return None
 
@@ -3029,10 +5396,11 @@ class AutoTimeSeries(BaseEstimator, RegressorMixin):
             self.ExponentialSmoothing
         ]
 
-        self.X_, self.y_ = self._whereIsTheX(ts)
+        self.dataset_ = _Dataset(*self._whereIsTheX(ts), X_type="numeric", y_type="numeric", n_jobs=self.n_jobs)
+        self.X_, self.y_ = self.dataset_.X, self.dataset_.y
 
-        self.nescience_ = Nescience(X_type="numeric", y_type="numeric")
-        self.nescience_.fit(self.X_, self.y_)
+        self.nescience_ = Nescience(X_type="numeric", y_type="numeric", n_jobs=self.n_jobs)
+        self.nescience_.fit(self.X_, self.y_, dataset=self.dataset_)
         
         nsc = 1
         self.model_ = None
@@ -3416,11 +5784,12 @@ class IncompressibleClassifier():
 
             mscd = Miscoding()
             mscd.fit(self.X_, self.y_)
-            matrix = mscd.features_matrix()
+            rows, cols, values = mscd.features_pairs(filter_miscoding)
+            related = set(zip(rows, cols))
 
             for index, row in df.iterrows():
 
-                if matrix[row["Attribute 1"], row["Attribute 2"]] > filter_miscoding:
+                if (row["Attribute 1"], row["Attribute 2"]) in related:
                     continue
 
                 tmp_df      = pd.DataFrame([{"Attribute 1": row["Attribute 1"], "Attribute 2": row["Attribute 2"], "Cluster": row["Cluster"], "Inertia": row["Inertia"]}])
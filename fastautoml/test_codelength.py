@@ -0,0 +1,73 @@
+from fastautoml.fastautoml import _discretize_vector, _uniform_bins, _uniform_bins_matrix, _joint_count
+from fastautoml.fastautoml import _contingency_tables, _count_lengths, _count_length
+
+import warnings
+
+import numpy as np
+from scipy.stats import norm, expon
+from sklearn.preprocessing import KBinsDiscretizer
+
+# Codes computed with a KBinsDiscretizer for a given number of bins
+def _kbins_codes(x, n_bins):
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        est = KBinsDiscretizer(n_bins=n_bins, encode='ordinal', strategy="uniform")
+        return est.fit_transform(x.reshape(-1, 1))[:,0].astype(dtype=int)
+
+def test_discretize_kbins():
+
+    # Codes should be the same than the ones from KBinsDiscretizer
+    for x in (norm.rvs(size=1000), expon.rvs(size=5000), np.arange(100) ** 2, np.array([1, 2, 10] * 100)):
+        codes, edges = _uniform_bins(x)
+        assert np.array_equal(codes, _kbins_codes(x.astype(float), len(edges) - 1))
+        assert np.array_equal(_discretize_vector(x), codes)
+
+def test_discretize_matrix():
+
+    # Bins computed all together are the same than one by one
+    X = np.column_stack((norm.rvs(size=(1000, 5)), expon.rvs(size=1000) ** 4, np.random.randint(0, 3, size=(1000, 5)),
+                         np.zeros(1000), np.arange(1000) ** 2))
+    for i, (codes, edges) in enumerate(_uniform_bins_matrix(X)):
+        expected_codes, expected_edges = _uniform_bins(X[:,i])
+        assert np.array_equal(codes, expected_codes)
+        assert np.array_equal(edges, expected_edges)
+
+def test_discretize_extreme():
+
+    # Lists are supported
+    new_x = _discretize_vector([0, 1, 2, 3] * 25)
+    assert len(np.unique(new_x)) == 4
+
+    # Constant variables use a single bin
+    new_x = _discretize_vector(np.zeros(100))
+    assert len(np.unique(new_x)) == 1
+
+def test_joint_count():
+
+    # Counts of the pairs that do occur
+    x1 = np.array([0, 1, 2, 3] * 25)
+    x2 = np.array([0, 0, 1, 1] * 25)
+    assert sorted(_joint_count([x1, x2], [4, 2])) == [25, 25, 25, 25]
+
+    # Dense and sparse counts agree, even when the grid overflows
+    x1 = np.arange(100000) % 5000
+    x2 = np.arange(100000) % 30
+    pairs = np.sort(np.unique(np.column_stack((x1, x2)), axis=0, return_counts=True)[1])
+    assert np.array_equal(np.sort(_joint_count([x1, x2], [5000, 30])), pairs)
+    assert np.array_equal(np.sort(_joint_count([x1, x2], [2**20, 2**20])), pairs)
+    assert np.array_equal(np.sort(_joint_count([x1, x2], [2**40, 2**40])), pairs)
+
+def test_contingency_tables():
+
+    # One table per feature, equal to the joint counts of each feature
+    X = np.column_stack((np.arange(100) % 3, np.arange(100) % 5, np.zeros(100, dtype=int)))
+    y = np.arange(100) % 2
+    counts = _contingency_tables(X, [3, 5, 1], y, 2)
+    assert len(counts) == (3 + 5 + 1) * 2
+    assert np.array_equal(counts[:6].reshape((3, 2)), np.histogram2d(X[:,0], y, bins=(3, 2))[0])
+    assert np.array_equal(counts[-2:], [50, 50])
+
+    # Lengths of many datasets at once, empty ones included
+    lengths = _count_lengths(counts, [6, 10, 0, 2])
+    assert np.allclose(lengths, [_count_length(counts[:6]), _count_length(counts[6:16]), 0, 100])
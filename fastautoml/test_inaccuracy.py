@@ -1,4 +1,5 @@
 from fastautoml.fastautoml import Inaccuracy
+import numpy as np
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.datasets import load_breast_cancer
 
@@ -87,4 +88,143 @@ def test_all_errors_model():
     inacc.fit(X, y)
     inaccuracy = inacc.inaccuracy_model(tree)
 
-    assert inaccuracy == 1
\ No newline at end of file
+    assert inaccuracy == 1
+
+# No error with sketched targets
+def test_no_error_sketch():
+
+    y = [str(i) for i in range(1000)] * 10
+    X = [[0, 1]] * 10000
+
+    inacc = Inaccuracy(approx="sketch", sketch_width=2**12)
+    inacc.fit(X, y)
+    inaccuracy = inacc.inaccuracy_predictions(list(y))
+
+    assert inaccuracy == 0
+
+# Predictions coded with the bins of the target
+def test_fitted_edges():
+
+    y = np.random.rand(1000)
+    X = [[0, 1]] * 1000
+
+    inacc = Inaccuracy()
+    inacc.fit(X, y)
+    edges = inacc.y_edges_
+
+    assert inacc.inaccuracy_predictions(y) == 0
+    assert np.isclose(inacc.inaccuracy_predictions(y + 10), 1)
+    assert 0 < inacc.inaccuracy_predictions(y + np.random.rand(1000) / 10) < 1
+    assert inacc.y_edges_ is edges
+
+    # Unseen classes are errors
+    y = ["a", "b", "c", "d"] * 25
+    inacc = Inaccuracy(y_type="categorical")
+    inacc.fit([[0, 1]] * 100, y)
+    y_hat = list(y)
+    y_hat[0] = "e"
+    assert inacc.inaccuracy_predictions(y) == 0
+    assert inacc.inaccuracy_predictions(y_hat) > 0
+
+# Categorical inaccuracy from the confusion matrix
+def test_confusion():
+
+    from sklearn.metrics import confusion_matrix
+
+    y     = np.random.randint(0, 5, size=1000)
+    y_hat = np.where(np.random.rand(1000) < 0.8, y, np.random.randint(0, 5, size=1000))
+
+    inacc = Inaccuracy(y_type="categorical")
+    inacc.fit([[0, 1]] * 1000, y)
+    inaccuracy = inacc.inaccuracy_predictions(y_hat)
+
+    assert 0 < inaccuracy < 1
+    assert np.isclose(inaccuracy, inacc.inaccuracy_confusion(confusion_matrix(y, y_hat)))
+    assert inacc.inaccuracy_confusion(np.diag([10, 20, 30])) == 0
+
+# Many lists of predictions at once
+def test_batch():
+
+    y = np.random.rand(1000)
+    P = np.vstack([y, y + 10, y + np.random.rand(1000) / 10, np.random.rand(1000)])
+
+    inacc = Inaccuracy()
+    inacc.fit([[0, 1]] * 1000, y)
+    batch = inacc.inaccuracy_batch(P)
+
+    assert batch.shape == (4,)
+    assert np.allclose(batch, [inacc.inaccuracy_predictions(pred) for pred in P])
+
+    y = np.random.randint(0, 5, size=1000).astype(str)
+    P = np.vstack([y, np.roll(y, 1), ["9"] * 1000])
+    inacc = Inaccuracy(y_type="categorical")
+    inacc.fit([[0, 1]] * 1000, y)
+    assert np.allclose(inacc.inaccuracy_batch(P), [inacc.inaccuracy_predictions(pred) for pred in P])
+
+    # Lists of a wrong length, or a single list, are rejected
+    for wrong in (P[:,:999], P[0]):
+        try:
+            inacc.inaccuracy_batch(wrong)
+            assert False
+        except ValueError:
+            pass
+
+# Predictions in blocks of rows give the same inaccuracy
+def test_chunks():
+
+    from sklearn.linear_model import LinearRegression
+
+    X = np.random.rand(5000, 3)
+    y = X[:,0] + np.random.rand(5000) / 10
+    model = LinearRegression().fit(X, y)
+
+    inacc = Inaccuracy()
+    inacc.fit(X, y)
+    chunked = Inaccuracy(chunk_size=700)
+    chunked.fit(X, y)
+    assert chunked.inaccuracy_model(model) == inacc.inaccuracy_model(model)
+
+    # X is not kept, and it is given as blocks of rows
+    stream = Inaccuracy()
+    stream.fit(None, y)
+    assert stream.X_ is None
+    blocks = (X[i:i+1000] for i in range(0, 5000, 1000))
+    assert stream.inaccuracy_model(model, blocks) == inacc.inaccuracy_model(model)
+
+    # Categorical targets with many classes
+    y = np.random.randint(0, 3000, size=5000)
+    inacc = Inaccuracy(y_type="categorical", chunk_size=1000)
+    inacc.fit(X, y)
+    y_hat = np.where(np.random.rand(5000) < 0.5, y, 0)
+    chunks = [y_hat[i:i+1000] for i in range(0, 5000, 1000)]
+    assert inacc._inaccuracy_chunks(chunks) == inacc.inaccuracy_predictions(y_hat)
+
+    # No blocks of rows at all
+    try:
+        inacc.inaccuracy_model(model, iter([]))
+        assert False
+    except ValueError:
+        pass
+
+# Models trained with the indices of string classes
+def test_string_classes():
+
+    from sklearn.datasets import load_iris
+
+    X, y    = load_iris(return_X_y=True)
+    names   = load_iris().target_names[y]
+    classes, indices = np.unique(names, return_inverse=True)
+    tree    = DecisionTreeClassifier(max_depth=2).fit(X, indices)
+
+    inacc   = Inaccuracy(y_type="categorical")
+    inacc.fit(X, names)
+    labeled = inacc.inaccuracy_predictions(classes[tree.predict(X)])
+
+    assert 0 < labeled < 0.5
+    assert np.isclose(inacc.inaccuracy_model(tree), labeled)
+    assert np.isclose(inacc.inaccuracy_batch([tree.predict(X)])[0], labeled)
+
+    # The indices are factorized consistently across blocks of rows
+    chunked = Inaccuracy(y_type="categorical", chunk_size=40)
+    chunked.fit(X, names)
+    assert np.isclose(chunked.inaccuracy_model(tree), labeled)
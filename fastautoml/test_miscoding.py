@@ -1,7 +1,8 @@
-from fastautoml.fastautoml import Miscoding
+from fastautoml.fastautoml import Miscoding, _joint_count, _count_length
 
 import numpy as np
 from scipy.stats import norm, expon
+import scipy.sparse as sp
 
 # Regular miscoding, redundancy allowed
 def test_redundancy_regular():
@@ -206,4 +207,394 @@ def test_MLPRegressor():
 def test_subset():
 
     # TODO: Think a test for this
-    assert True == True
\ No newline at end of file
+    assert True == True
+
+def test_codes():
+
+    # Features are discretized once into compact codes
+    y  = norm.rvs(loc=3, size=1000)
+    x1 = y + np.random.randn()
+    x2 = expon.rvs(size=1000)
+    X = np.column_stack((x1, x2))
+    miscoding = Miscoding(X_type="numeric", y_type="numeric", redundancy=False)
+    miscoding.fit(X, y)
+    assert miscoding.codes_.X_codes.dtype == np.uint8
+    assert miscoding.codes_.X_codes.shape == X.shape
+
+    # A shared code store gives the same miscoding
+    shared = Miscoding(X_type="numeric", y_type="numeric", redundancy=False)
+    shared.fit(X, y, codes=miscoding.codes_)
+    assert np.array_equal(shared.miscoding_features(mode='regular'), miscoding.miscoding_features(mode='regular'))
+
+def test_partial_fit():
+
+    # Chunks with the same edges give the same miscoding than the whole dataset
+    y  = norm.rvs(loc=3, size=10000)
+    x1 = y + np.random.randn()
+    x2 = expon.rvs(size=10000)
+    X = np.column_stack((x1, x2))
+    miscoding = Miscoding(X_type="numeric", y_type="numeric", redundancy=False)
+    miscoding.fit(X, y)
+
+    chunked = Miscoding(X_type="numeric", y_type="numeric", redundancy=False)
+    for i in np.arange(0, 10000, 3000):
+        chunked.partial_fit(X[i:i+3000], y[i:i+3000], X_edges=miscoding.codes_.X_edges, y_edges=miscoding.codes_.y_edges)
+    assert chunked.n_samples_seen_ == 10000
+    assert np.allclose(chunked.miscoding_features(mode='regular'), miscoding.miscoding_features(mode='regular'))
+
+    # Categorical targets require the list of classes
+    y = np.array(["a", "b"] * 500)
+    chunked = Miscoding(X_type="numeric", y_type="categorical", redundancy=False)
+    chunked.partial_fit(X[:500], y[:500], classes=["a", "b"])
+    chunked.partial_fit(X[500:1000], y[500:])
+    assert chunked.miscoding_features(mode='regular').shape == (2,)
+
+    # Models only need the number of features, the matrix needs the samples
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.exceptions import NotFittedError
+    tree = DecisionTreeClassifier().fit(X[:1000], y)
+    assert chunked.n_features_ == 2
+    assert np.isclose(chunked.miscoding_model(tree), chunked.miscoding_subset(chunked._DecisionTreeClassifier(tree)))
+    try:
+        chunked.features_matrix()
+        assert False
+    except NotFittedError as error:
+        assert "partial_fit" in str(error)
+
+def test_sketch():
+
+    import pandas as pd
+
+    # High cardinality categorical feature approximated with a sketch
+    n, D = 100000, 50000
+    X = pd.DataFrame({"x1": np.random.randint(0, D, size=n).astype(str),
+                      "x2": np.array(["u", "v"] * (n // 2))})
+    y = np.array(["a", "b"] * (n // 2))
+    exact = Miscoding(X_type="categorical", y_type="categorical")
+    exact.fit(X, y)
+    approx = Miscoding(X_type="categorical", y_type="categorical", approx="sketch", sketch_width=2**16)
+    approx.fit(X, y)
+
+    # Sketched code lengths are lower bounds within the documented error
+    bound = n * np.log2(1 + (D - 1) / 2**16)
+    assert approx.codes_.length_X(0) <= exact.codes_.length_X(0)
+    assert exact.codes_.length_X(0) - approx.codes_.length_X(0) <= bound
+    assert np.allclose(approx.miscoding_features(mode='regular'), exact.miscoding_features(mode='regular'), atol=0.1)
+
+def test_sample():
+
+    # Sampled miscoding close to the exact one, with valid intervals
+    n = 200000
+    X = np.column_stack((np.random.rand(n), np.random.rand(n), np.random.rand(n)))
+    y = X[:,0] + 0.5 * X[:,1]
+    exact = Miscoding(X_type="numeric", y_type="numeric")
+    exact.fit(X, y)
+    sampled = Miscoding(X_type="numeric", y_type="numeric", sample=5000, tolerance=0.01, random_state=0)
+    sampled.fit(X, y)
+    assert sampled.intervals_.shape == (3, 2)
+    assert np.all(sampled.intervals_[:,0] <= sampled.intervals_[:,1])
+    assert sampled.n_samples_used_ < n
+    assert np.array_equal(np.argsort(sampled.miscoding_features(mode='regular')),
+                          np.argsort(exact.miscoding_features(mode='regular')))
+    for mode, intervals in (('regular', sampled.intervals_), ('adjusted', sampled.intervals_adjusted_),
+                            ('partial', sampled.intervals_partial_)):
+        point = sampled.miscoding_features(mode=mode)
+        assert np.all((intervals[:,0] <= point) & (point <= intervals[:,1]))
+
+    # Sampled joint miscoding close to the exact one with redundancy
+    joint = Miscoding(X_type="numeric", y_type="numeric", redundancy=True)
+    joint.fit(X, y)
+    redundant = Miscoding(X_type="numeric", y_type="numeric", redundancy=True, sample=5000, tolerance=0.01,
+                          random_state=0)
+    redundant.fit(X, y)
+    assert np.allclose(redundant.miscoding_features(mode='regular'), joint.miscoding_features(mode='regular'), atol=0.1)
+    assert not np.allclose(redundant.miscoding_features(mode='regular'), sampled.miscoding_features(mode='regular'), atol=0.1)
+
+    # The exact miscoding if all the rows are needed
+    X = np.column_stack((X[:2000,0], X[:2000,0]))
+    exact.fit(X, y[:2000])
+    sampled = Miscoding(X_type="numeric", y_type="numeric", sample=100, tolerance=0, random_state=0)
+    sampled.fit(X, y[:2000])
+    assert sampled.n_samples_used_ == 2000
+    assert np.array_equal(sampled.miscoding_features(mode='regular'), exact.miscoding_features(mode='regular'))
+    assert np.array_equal(sampled.intervals_[:,0], sampled.intervals_[:,1])
+
+def test_categorical_dtype():
+
+    import pandas as pd
+
+    # Categorical columns are factorized once, whatever their dtype
+    X = pd.DataFrame({"x1": ["a", "b", "c", "d"] * 25, "x2": np.arange(100)})
+    y = np.array(["u", "v", "w", "z"] * 25)
+    miscoding = Miscoding(X_type="mixed", y_type="categorical")
+    miscoding.fit(X, y)
+    X["x1"] = X["x1"].astype("category")
+    category = Miscoding(X_type="mixed", y_type="categorical")
+    category.fit(X, y)
+    assert np.allclose(miscoding.miscoding_features(), category.miscoding_features())
+    assert list(category.codes_.X_edges[0]) == ["a", "b", "c", "d"]
+    assert category.miscoding_features(mode='regular')[0] == 0
+
+def test_mixed_frame():
+
+    import pandas as pd
+
+    # Mixed frames are not converted to object arrays
+    X = pd.DataFrame({"x1": np.random.rand(1000),
+                      "x2": np.random.randint(0, 5, size=1000).astype(str),
+                      "x3": np.random.randint(0, 10, size=1000)})
+    X["x4"] = X["x2"].astype("category")
+    y = X["x1"].to_numpy() + np.random.rand(1000)
+    miscoding = Miscoding(X_type="mixed", y_type="numeric")
+    miscoding.fit(X, y)
+    assert miscoding.X_ is X
+    obj = Miscoding(X_type="mixed", y_type="numeric")
+    obj.fit(X.astype({"x4": object}), y)
+    assert np.allclose(miscoding.miscoding_features(), obj.miscoding_features())
+    sample = Miscoding(X_type="mixed", y_type="numeric", sample=500, random_state=0)
+    sample.fit(X, y)
+    assert sample.miscoding_features().shape == (4,)
+
+def test_n_jobs():
+
+    # Parallel miscoding is equal to the serial one, in the same order
+    X = np.random.rand(1000, 10)
+    y = X[:,3] + X[:,7]
+    serial = Miscoding(X_type="numeric", y_type="numeric")
+    serial.fit(X, y)
+    parallel = Miscoding(X_type="numeric", y_type="numeric", n_jobs=2)
+    parallel.fit(X, y)
+    assert np.array_equal(serial.miscoding_features(), parallel.miscoding_features())
+
+def test_featuresmatrix_pairs():
+
+    import pandas as pd
+    from fastautoml.fastautoml import _codes_length
+
+    # Matrix equal to the miscoding of each pair, with narrow and wide features
+    X = pd.DataFrame({"x1": np.random.rand(2000),
+                      "x2": np.random.randint(0, 3, size=2000),
+                      "x3": np.random.randint(0, 500, size=2000).astype(str),
+                      "x4": np.random.rand(2000)})
+    y = np.random.rand(2000)
+    miscoding = Miscoding(X_type="mixed", y_type="numeric")
+    miscoding.fit(X, y)
+    matrix = miscoding.features_matrix(mode="regular")
+    codes  = miscoding.codes_
+    for i in range(4):
+        for j in range(4):
+            if i != j:
+                ldm_X1   = _codes_length(codes.X_codes[:,i], codes.X_n_codes[i])
+                ldm_X2   = _codes_length(codes.X_codes[:,j], codes.X_n_codes[j])
+                ldm_X1X2 = _codes_length(codes.X_codes[:,i], codes.X_n_codes[i], codes.X_codes[:,j], codes.X_n_codes[j])
+                assert np.isclose(matrix[i, j], (ldm_X1X2 - min(ldm_X1, ldm_X2)) / max(ldm_X1, ldm_X2))
+    assert np.all(np.diag(matrix) == 0)
+
+def test_featuresmatrix_tiles(tmp_path):
+
+    X = np.random.rand(500, 7)
+    X[:,3] = X[:,0]
+    X[:,5] = X[:,1] + 0.01 * np.random.rand(500)
+    y = X[:,0]
+    miscoding = Miscoding(X_type="numeric", y_type="numeric")
+    miscoding.fit(X, y)
+    regular  = miscoding.features_matrix(mode="regular")
+    adjusted = miscoding.features_matrix(mode="adjusted")
+
+    # Tiles of any size give the same matrix
+    assert np.allclose(miscoding.features_matrix(mode="regular", tile_size=2), regular)
+    assert np.allclose(miscoding.features_matrix(mode="adjusted", tile_size=3), adjusted)
+
+    # An interrupted calculation is resumed from the file
+    filename = str(tmp_path / "matrix.npy")
+    tiles    = miscoding._features_tiles
+    def crash(tile_size, finished=()):
+        for k, tile in enumerate(tiles(tile_size, finished)):
+            if k == 4:
+                raise KeyboardInterrupt
+            yield tile
+    miscoding._features_tiles = crash
+    try:
+        miscoding.features_matrix(mode="adjusted", filename=filename, tile_size=2)
+    except KeyboardInterrupt:
+        pass
+    del miscoding._features_tiles
+    matrix = miscoding.features_matrix(mode="adjusted", filename=filename, tile_size=2)
+    assert isinstance(matrix, np.memmap)
+    assert np.allclose(matrix, adjusted)
+    assert np.allclose(np.load(filename), adjusted)
+
+    # An adjustment interrupted after writing the rows is safely repeated
+    with open(filename + ".tiles") as f:
+        lines = [line for line in f if not line.startswith("adjusted")]
+    with open(filename + ".tiles", "w") as f:
+        f.writelines(lines)
+    matrix = miscoding.features_matrix(mode="adjusted", filename=filename, tile_size=2)
+    assert np.allclose(matrix, adjusted)
+
+    # A resume with a different tile size or mode is rejected
+    for mode, tile_size in (("adjusted", 3), ("regular", 2)):
+        try:
+            miscoding.features_matrix(mode=mode, filename=filename, tile_size=tile_size)
+            assert False
+        except ValueError:
+            pass
+
+    # Sparse pairs are the entries of the matrix beyond the threshold
+    for mode, matrix, selected in (("regular", regular, regular < 0.5), ("adjusted", adjusted, adjusted > 0.2)):
+        np.fill_diagonal(selected, False)
+        rows, cols, values = miscoding.features_pairs(0.5 if mode == "regular" else 0.2, mode=mode, tile_size=3)
+        assert np.array_equal(np.column_stack((rows, cols)), np.argwhere(selected))
+        assert np.allclose(values, matrix[selected])
+
+def test_redundant_pairs():
+
+    # Redundant pairs found without computing all the pairs
+    base = np.random.rand(2000, 5)
+    X = np.column_stack((base, base + 0.001 * np.random.rand(2000, 5), np.random.rand(2000, 10)))
+    y = X[:,0]
+    miscoding = Miscoding(X_type="numeric", y_type="numeric", random_state=0)
+    miscoding.fit(X, y)
+    rows, cols, values = miscoding.redundant_pairs(0.2)
+    exact = miscoding.features_pairs(0.2, mode="regular")
+    assert set(zip(rows, cols)) == set(zip(exact[0], exact[1]))
+    assert np.allclose(values, exact[2])
+    assert (0, 5) in set(zip(rows, cols))
+
+def test_cross_miscoding():
+
+    # The target is the attribute delayed three samples
+    x = np.random.rand(5000)
+    y = np.concatenate((np.random.rand(3), x[:-3]))
+    X = np.column_stack((x, np.random.rand(5000)))
+    miscoding = Miscoding(X_type="numeric", y_type="numeric")
+    miscoding.fit(X, y)
+    regular = miscoding.cross_miscoding(0, min_lag=0, max_lag=10, mode='regular')
+    assert len(regular) == 10
+    assert np.argmin(regular) == 3
+    assert regular[3] == 0
+
+    # Lag zero uses all the samples
+    assert regular[0] == miscoding.cross_miscoding(0, min_lag=0, max_lag=1, mode='regular')[0]
+    assert np.isclose(regular[0], miscoding.miscoding_features(mode='regular')[0])
+
+    # Matrix of attributes and lags
+    matrix = miscoding.cross_miscoding(None, min_lag=0, max_lag=10, mode='partial')
+    assert matrix.shape == (2, 10)
+    assert np.allclose(matrix[0], miscoding.cross_miscoding(0, min_lag=0, max_lag=10, mode='partial'))
+
+def test_joint_miscoding():
+
+    # Joint miscodings agree with the pairwise computation, and with the
+    # greedy selection over the averages of the selected features
+    X = np.random.randint(0, 4, size=(500, 6))
+    X = np.column_stack((X, X[:,0], np.random.randint(0, 400, size=500)))
+    y = X[:,0] + np.random.randint(0, 2, size=500)
+    miscoding = Miscoding(X_type="numeric", y_type="numeric", redundancy=True)
+    miscoding.fit(X, y)
+    codes = miscoding.codes_
+    ldm_y = codes.length_y()
+    red_matrix = np.ones((8, 8))
+    for i in range(8):
+        for j in range(8):
+            if i != j:
+                ldm_XX  = codes.length_X(i, j)
+                ldm_XXy = _count_length(_joint_count([codes.X_codes[:,i], codes.X_codes[:,j], codes.y_codes],
+                                                     [codes.X_n_codes[i], codes.X_n_codes[j], codes.y_n_codes]))
+                red_matrix[i, j] = (ldm_XXy - min(ldm_XX, ldm_y)) / max(ldm_XX, ldm_y)
+    mscd = miscoding.miscoding_features(mode='regular')
+    np.fill_diagonal(red_matrix, np.inf)
+    viu  = list(np.unravel_index(np.argmin(red_matrix), red_matrix.shape))
+    np.fill_diagonal(red_matrix, 1)
+    assert np.isclose(np.max(mscd[viu]), red_matrix[viu[0], viu[1]])
+    for k in range(2, 8):
+        tmp = [np.mean(red_matrix[viu, j]) if j not in viu else np.inf for j in range(8)]
+        viu.append(np.argmin(tmp))
+        assert np.isclose(mscd[viu[-1]], np.min(tmp))
+
+    # Parallel and tiled computations agree
+    parallel = Miscoding(X_type="numeric", y_type="numeric", redundancy=True, n_jobs=2)
+    parallel.fit(X, y)
+    assert np.allclose(parallel.regular_, miscoding._miscoding_features_joint(tile_size=3))
+    assert np.allclose(parallel.regular_, mscd)
+
+def test_miscoding_subsets():
+
+    # Scores of many subsets at once are equal to the scores one by one
+    rng = np.random.default_rng(42)
+    X = rng.random((1000, 6))
+    y = X[:,0] + X[:,1]
+    miscoding = Miscoding(X_type="numeric", y_type="numeric")
+    miscoding.fit(X, y)
+    subsets = rng.integers(0, 2, size=(50, 6))
+    subsets[0] = 1
+    scores = miscoding.miscoding_subsets(subsets)
+    assert scores.shape == (50,)
+    partial = miscoding.miscoding_features(mode='partial')
+    top = 1 + np.sum(partial[partial < 0])
+    assert np.allclose(scores, [max(top - np.dot(subset, partial), 0) for subset in subsets])
+    assert np.isclose(scores[1], miscoding.miscoding_subset(subsets[1]))
+    assert np.all(scores >= 0) and np.all(scores <= 1)
+
+def test_top_features():
+
+    # The top features are the same than with all the miscodings, and
+    # irrelevant features with long codes are skipped
+    X = np.random.rand(1000, 2000)
+    y = np.random.randint(0, 2, size=1000)
+    X[:,7] = y
+    X[:,3] = y + np.random.randint(0, 2, size=1000)
+    exact = Miscoding(X_type="numeric", y_type="categorical")
+    exact.fit(X, y)
+    miscoding = Miscoding(X_type="numeric", y_type="categorical", top_k=2)
+    miscoding.fit(X, y)
+    assert np.sum(miscoding.computed_) < 2000
+    assert np.array_equal(miscoding.top_features(2), exact.top_features(2))
+    assert np.array_equal(miscoding.top_features(2), [7, 3])
+    assert np.array_equal(miscoding.regular_[[7, 3]], exact.regular_[[7, 3]])
+    assert np.argmax(miscoding.miscoding_features()) == 7
+
+    # More features are computed on demand
+    assert np.array_equal(miscoding.top_features(300), exact.top_features(300))
+    assert np.sum(miscoding.computed_) >= 300
+
+    # With sample or redundancy all the miscodings are computed
+    X = X[:,:20]
+    sampled = Miscoding(X_type="numeric", y_type="categorical", top_k=2, sample=200, random_state=0)
+    sampled.fit(X, y)
+    assert np.array_equal(sampled.top_features(2), np.argsort(sampled.regular_, kind='stable')[:2])
+    redundant = Miscoding(X_type="numeric", y_type="categorical", top_k=2, redundancy=True)
+    redundant.fit(X, y)
+    joint = Miscoding(X_type="numeric", y_type="categorical", redundancy=True)
+    joint.fit(X, y)
+    assert np.array_equal(redundant.top_features(2), joint.top_features(2))
+
+def test_sparse():
+
+    # Sparse matrices give the same miscodings than dense ones
+    X = sp.random(2000, 50, density=0.05, format='csr', random_state=0)
+    X.data = np.round(X.data * 5)
+    y = (X[:,0].toarray().ravel() > 0) + np.random.randint(0, 2, size=2000)
+    sparse = Miscoding(X_type="numeric", y_type="categorical")
+    sparse.fit(X, y)
+    dense = Miscoding(X_type="numeric", y_type="categorical")
+    dense.fit(X.toarray(), y)
+    assert sp.issparse(sparse.codes_.X_codes)
+    assert np.allclose(sparse.miscoding_features(mode='regular'), dense.miscoding_features(mode='regular'))
+    assert np.allclose(sparse.cross_miscoding(0, max_lag=5), dense.cross_miscoding(0, max_lag=5))
+
+    # Pairs of features are computed with dense tiles, the last feature
+    # is redundant with the first one
+    X = sp.hstack((X, 2 * X[:,:1]), format='csr')
+    sparse.fit(X, y)
+    dense.fit(X.toarray(), y)
+    assert np.allclose(sparse.features_matrix(tile_size=7), dense.features_matrix(tile_size=7))
+    rows, cols, values = sparse.features_pairs(0.5, mode="regular")
+    assert np.array_equal(rows, [0, 50]) and np.array_equal(cols, [50, 0])
+    for pairs, expected in zip(sparse.redundant_pairs(0.5), (rows, cols, values)):
+        assert np.allclose(pairs, expected)
+    sparse = Miscoding(X_type="numeric", y_type="categorical", redundancy=True)
+    sparse.fit(X, y)
+    dense = Miscoding(X_type="numeric", y_type="categorical", redundancy=True)
+    dense.fit(X.toarray(), y)
+    assert np.allclose(sparse.miscoding_features(mode='regular'), dense.miscoding_features(mode='regular'))
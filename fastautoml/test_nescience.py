@@ -0,0 +1,92 @@
+from fastautoml.fastautoml import Nescience, AutoClassifier, AutoRegressor
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm, expon
+import scipy.sparse as sp
+from sklearn.linear_model import LinearRegression
+
+# Memory mapped datasets are shared without copies
+def test_memmap(tmp_path):
+
+    y  = norm.rvs(loc=3, size=1000)
+    x1 = y + np.random.randn()
+    x2 = expon.rvs(size=1000)
+    np.save(tmp_path / "X.npy", np.column_stack((x1, x2)))
+    np.save(tmp_path / "y.npy", y)
+
+    X = np.load(tmp_path / "X.npy", mmap_mode='r')
+    y = np.load(tmp_path / "y.npy", mmap_mode='r')
+
+    nescience = Nescience(X_type="numeric", y_type="numeric")
+    nescience.fit(X, y)
+
+    assert np.shares_memory(nescience.miscoding_.X_, X)
+    assert np.shares_memory(nescience.inaccuracy_.X_, X)
+    assert np.shares_memory(nescience.surfeit_.X_, X)
+    assert np.shares_memory(nescience.inaccuracy_.y_, y)
+    assert nescience.miscoding_.miscoding_features().shape == (2,)
+
+# Sparse datasets give the same nescience than dense ones
+def test_sparse():
+
+    X = sp.random(1000, 20, density=0.1, format='csr', random_state=0)
+    y = X[:,0].toarray().ravel() + norm.rvs(scale=0.1, size=1000)
+    model  = LinearRegression().fit(X, y)
+    sparse = Nescience().fit(X, y)
+    dense  = Nescience().fit(X.toarray(), y)
+    assert np.isclose(sparse.nescience(model), dense.nescience(model))
+
+    # The models of the automatic classes require dense data
+    for auto, target in ((AutoClassifier(), y > 0), (AutoRegressor(), y)):
+        try:
+            auto.fit(X, target)
+            assert False
+        except TypeError:
+            pass
+
+# A single read-only copy of the dataset is shared by all the components
+def test_shared_dataset():
+
+    X = np.random.rand(20000, 50)
+    y = X[:,0] + norm.rvs(scale=0.1, size=20000)
+
+    tracemalloc.start()
+    nescience = Nescience(X_type="numeric", y_type="numeric").fit(X, y)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # X is never copied: the codes take one byte per value (an eighth of X)
+    # and they are held twice while stacked, plus the small temporaries of
+    # the discretization and of the contingency tables
+    assert peak < X.nbytes / 2
+
+    dataset = nescience.dataset_
+    assert np.shares_memory(dataset.X, X)
+    assert nescience.miscoding_.X_ is dataset.X
+    assert nescience.inaccuracy_.X_ is dataset.X
+    assert nescience.surfeit_.X_ is dataset.X
+    assert nescience.miscoding_.codes_ is dataset.codes
+    assert not dataset.X.flags.writeable
+    assert X.flags.writeable
+
+    # Mixed frames are kept column by column, not as an object array
+    columns = dict()
+    for i in np.arange(50):
+        if i % 2 == 0:
+            columns["x%d" % i] = np.random.rand(20000)
+        else:
+            columns["x%d" % i] = np.random.randint(0, 20, size=20000).astype(str)
+    X = pd.DataFrame(columns)
+    y = X["x0"].to_numpy() + norm.rvs(scale=0.1, size=20000)
+
+    tracemalloc.start()
+    nescience = Nescience(X_type="mixed", y_type="numeric").fit(X, y)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < X.memory_usage().sum() / 2
+    assert nescience.dataset_.X is X
+    assert nescience.miscoding_.X_ is X
@@ -0,0 +1,48 @@
+from fastautoml.fastautoml import Surfeit
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.datasets import load_breast_cancer
+
+# Streamed models have the same surfeit than the full string
+def test_stream():
+
+    X, y = load_breast_cancer(return_X_y=True)
+
+    tree = DecisionTreeClassifier(random_state=42)
+    tree.fit(X, y)
+
+    for compressor in ("bz2", "lzma", "zlib"):
+
+        surfeit = Surfeit(y_type="categorical", compressor=compressor)
+        surfeit.fit(X, y)
+        model_string = "".join(surfeit._DecisionTreeClassifier(tree))
+
+        assert model_string.startswith("def tree")
+        assert surfeit.surfeit_model(tree) == surfeit.surfeit_string(model_string)
+
+    # Same serialization and surfeit than before the streaming, the order
+    # of the set of variables in the header depends on the string hashes
+    tree = DecisionTreeClassifier(max_depth=2, random_state=42)
+    tree.fit(X, y)
+
+    surfeit = Surfeit(y_type="categorical")
+    surfeit.fit(X, y)
+    header, body = "".join(surfeit._DecisionTreeClassifier(tree)).split(":\n", 1)
+
+    assert header.startswith("def tree{") and header.endswith("}")
+    assert set(header[9:-1].split(", ")) == {"'X2'", "'X21'", "'X28'"}
+    assert body == ("    if X21 < 16.795:\n"
+                    "        if X28 < 0.136:\n"
+                    "            return 1\n"
+                    "        else:\n"
+                    "            return 0\n"
+                    "    else:\n"
+                    "        if X2 < 16.110:\n"
+                    "            return 1\n"
+                    "        else:\n"
+                    "            return 0\n")
+
+    for compressor, expected in (("bz2", 0.4253), ("lzma", 0.31221719457013575), ("zlib", 0.5791855203619909)):
+        surfeit = Surfeit(y_type="categorical", compressor=compressor)
+        surfeit.fit(X, y)
+        assert np.isclose(surfeit.surfeit_model(tree), expected, atol=0.01 if compressor == "bz2" else 0)